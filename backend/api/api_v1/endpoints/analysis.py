@@ -1,79 +1,249 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from sqlalchemy.orm import Session
-from typing import List
-import shutil
-import os
-from backend.database.session import get_db, get_predatory_db
-from backend.database.models import User, Analysis
-from backend.schemas.api import AnalysisResponse
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import String, select, tuple_, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Optional, Tuple
+import asyncio
+import base64
+import json
+import zipfile
+from backend.database.session import get_async_db, get_db, get_predatory_db, AsyncSessionLocal
+from backend.database.models import Analysis, AnalysisJob
+from backend.core.user_cache import AuthenticatedUser
+from backend.schemas.api import AnalysisResponse, AnalysisSummary, HistoryPage, JobResponse
 from backend.api import deps
 from backend.core.config import settings
-from backend.engine.pdf_processor import extract_text_from_pdf
-from backend.engine.scorer import COIScorer
-from backend.engine.llm_wrapper import LLMWrapper
+from backend.engine.job_queue import analysis_jobs, ACTIVE_STATUSES, FINAL_STATUSES
+from backend.engine.batch import BatchAnalyzer, BatchTooLarge, stage_upload, remove_staged
+from backend.engine.uploads import UploadTooLarge, stage_stream
 
 router = APIRouter()
 
-@router.post("/analyze/pdf", response_model=AnalysisResponse)
+def _reject_oversized_request(request: Request) -> None:
+    # Cheap early check; the streamed byte count is what is actually enforced
+    content_length = request.headers.get("content-length")
+    if settings.UPLOAD_MAX_BYTES and content_length and content_length.isdigit():
+        if int(content_length) > settings.UPLOAD_MAX_BYTES + 64 * 1024:
+            raise HTTPException(status_code=413, detail=f"Upload exceeds the {settings.UPLOAD_MAX_BYTES} byte limit")
+
+@router.post("/analyze/pdf", response_model=JobResponse, status_code=202)
 async def analyze_pdf(
+    request: Request,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
-    predatory_db: Session = Depends(get_predatory_db),
-    current_user: User = Depends(deps.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(deps.aget_current_user)
+):
+    _reject_oversized_request(request)
+    # Hash while copying out of the request; small uploads stay in memory
+    try:
+        upload = await run_in_threadpool(stage_stream, file.file, file.filename or "upload.pdf")
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    # The background worker owns the upload from here on
+    try:
+        job = await analysis_jobs.asubmit(db, current_user.id, upload)
+    except Exception:
+        upload.cleanup()
+        raise
+    return job
+
+@router.post("/analyze/batch")
+async def analyze_batch(
+    files: List[UploadFile] = File(...),
+    current_user: AuthenticatedUser = Depends(deps.aget_current_user)
+):
+    """
+    Analyzes several PDFs (or the PDFs inside ZIP archives) in one request and streams
+    the outcome as NDJSON, one event per line, as files finish. See BatchAnalyzer for
+    the event types; the last line is a summary with throughput and failure counts.
+    """
+    staged = []
+    try:
+        for upload in files:
+            await run_in_threadpool(stage_upload, upload.filename or "upload.pdf", upload.file, staged)
+    except (BatchTooLarge, UploadTooLarge) as e:
+        remove_staged(staged)
+        raise HTTPException(status_code=413, detail=str(e))
+    except zipfile.BadZipFile:
+        remove_staged(staged)
+        raise HTTPException(status_code=400, detail="Invalid ZIP archive")
+    except Exception:
+        remove_staged(staged)
+        raise
+
+    if not staged:
+        raise HTTPException(status_code=400, detail="No PDF files in the upload")
+
+    batch = BatchAnalyzer(current_user.id)
+
+    def ndjson_stream():
+        events = batch.run(staged)
+        try:
+            for event in events:
+                yield json.dumps(event, default=str) + "\n"
+        finally:
+            # Closing the batch first waits for running analyses, which read the staged files
+            events.close()
+            remove_staged(staged)
+
+    return StreamingResponse(ndjson_stream(), media_type="application/x-ndjson")
+
+def _job_response(job: AnalysisJob) -> JobResponse:
+    response = JobResponse.model_validate(job)
+    preview = analysis_jobs.preview(job.id) if job.status in ACTIVE_STATUSES else None
+    return response.model_copy(update=preview) if preview else response
+
+def _jobs():
+    # JobResponse includes the finished report, loaded up front (async sessions can't lazy load)
+    return select(AnalysisJob).options(selectinload(AnalysisJob.analysis))
+
+async def _find_user_job(db: AsyncSession, job_id: str, user_id: int) -> Optional[AnalysisJob]:
+    result = await db.execute(_jobs().where(AnalysisJob.id == job_id, AnalysisJob.user_id == user_id))
+    return result.scalars().first()
+
+@router.get("/jobs", response_model=List[JobResponse])
+async def get_active_jobs(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(deps.aget_current_user)
+):
+    # Jobs still queued or running, newest first (finished ones show up in /history)
+    result = await db.execute(
+        _jobs()
+        .where(AnalysisJob.user_id == current_user.id, AnalysisJob.status.in_(ACTIVE_STATUSES))
+        .order_by(AnalysisJob.created_at.desc())
+    )
+    return result.scalars().all()
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(deps.aget_current_user)
 ):
-    # Save temp file
-    temp_path = f"temp_{file.filename}"
-    with open(temp_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    
+    job = await _find_user_job(db, job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_response(job)
+
+async def _job_snapshot(job_id: str, user_id: int) -> Optional[str]:
+    # Short-lived session per poll so the stream holds no connection between events
+    async with AsyncSessionLocal() as db:
+        job = await _find_user_job(db, job_id, user_id)
+        if not job:
+            return None
+        return _job_response(job).model_dump_json()
+
+@router.get("/jobs/{job_id}/events")
+async def job_events(
+    job_id: str,
+    request: Request,
+    current_user: AuthenticatedUser = Depends(deps.aget_current_user)
+):
+    """
+    Server-Sent Events stream of the job's progress: a "progress" event per change
+    (stage, then the score as soon as it is known, then the summary as it streams in)
+    and a final event when the job completes or fails, after which the stream closes.
+    """
+    user_id = current_user.id
+    if await _job_snapshot(job_id, user_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def event_stream():
+        last = None
+        while True:
+            snapshot = await _job_snapshot(job_id, user_id)
+            if snapshot is None:
+                return
+            if snapshot != last:
+                yield f"event: progress\ndata: {snapshot}\n\n"
+                last = snapshot
+            if json.loads(snapshot)["status"] in FINAL_STATUSES:
+                return
+            if await request.is_disconnected():
+                return
+            await asyncio.sleep(settings.JOB_EVENTS_POLL_SECONDS)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _encode_cursor(upload_date_key: str, analysis_id: int) -> str:
+    raw = json.dumps([upload_date_key, analysis_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+def _decode_cursor(cursor: str) -> Tuple[str, int]:
     try:
-        # Process
-        text, file_hash = extract_text_from_pdf(temp_path)
-        
-        # Score
-        scorer = COIScorer(text, db=db, predatory_db=predatory_db)
-        result = scorer.compute_score()
-        
-        # Summarize
-        llm = LLMWrapper(api_key=settings.OPENAI_API_KEY)
-        summary = llm.summarize_risk(result, result["score"])
-        
-        # Save to DB
-        db_analysis = Analysis(
-            user_id=current_user.id,
-            filename=file.filename,
-            overall_risk=result["overall_risk"],
-            score=result["score"],
-            summary=summary,
-            full_result=result
+        upload_date_key, analysis_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(upload_date_key), int(analysis_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+@router.get("/history", response_model=HistoryPage)
+async def get_history(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(deps.aget_current_user)
+):
+    """
+    The user's analyses, newest first, without full_result. Keyset-paginated on
+    (upload_date, id) via ix_analyses_user_id_upload_date: pass next_cursor back as
+    ?cursor= to get the next page.
+    """
+    # Compare upload_date as the stored text: SQLite keeps server-default timestamps as
+    # "YYYY-MM-DD HH:MM:SS", which a bound datetime (with microseconds) would not equal
+    upload_date_key = type_coerce(Analysis.upload_date, String)
+
+    query = (
+        select(
+            Analysis.id,
+            Analysis.filename,
+            Analysis.upload_date,
+            Analysis.overall_risk,
+            Analysis.score,
+            Analysis.summary,
+            upload_date_key.label("upload_date_key")
         )
-        db.add(db_analysis)
-        db.commit()
-        db.refresh(db_analysis)
-        
-        return db_analysis
-        
-    finally:
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
-
-@router.get("/history", response_model=List[AnalysisResponse])
-def get_history(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user)
+        .where(Analysis.user_id == current_user.id)
+    )
+    if cursor:
+        after_date, after_id = _decode_cursor(cursor)
+        query = query.where(tuple_(upload_date_key, Analysis.id) < tuple_(after_date, after_id))
+
+    rows = (await db.execute(query.order_by(Analysis.upload_date.desc(), Analysis.id.desc()).limit(limit + 1))).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1].upload_date_key, rows[-1].id)
+    return HistoryPage(items=[AnalysisSummary.model_validate(row) for row in rows], next_cursor=next_cursor)
+
+@router.get("/history/{analysis_id}", response_model=AnalysisResponse)
+async def get_history_item(
+    analysis_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(deps.aget_current_user)
 ):
-    analyses = db.query(Analysis).filter(Analysis.user_id == current_user.id).offset(skip).limit(limit).all()
-    return analyses
+    result = await db.execute(select(Analysis).where(Analysis.id == analysis_id, Analysis.user_id == current_user.id))
+    analysis = result.scalars().first()
+    if not analysis:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    return analysis
 
 from backend.engine.predatory_updater import PredatoryJournalUpdater
 
+# Stays on the sync sessions: the updater downloads and rewrites the list in one long
+# blocking call, which belongs on a worker thread anyway
 @router.post("/admin/update-predatory-list")
 def update_predatory_list(
     db: Session = Depends(get_db),
     predatory_db: Session = Depends(get_predatory_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: AuthenticatedUser = Depends(deps.get_current_user)
 ):
     # In a real app, check for admin role
     updater = PredatoryJournalUpdater(predatory_db)
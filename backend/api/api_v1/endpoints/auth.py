@@ -1,6 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from backend.database.session import get_db
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from backend.database.session import get_async_db
 from backend.database.models import User
 from backend.schemas.api import UserCreate, Token, UserLogin
 from backend.core import security
@@ -8,34 +11,66 @@ from fastapi.security import OAuth2PasswordRequestForm
 
 router = APIRouter()
 
+async def _find_user(db: AsyncSession, email: str) -> Optional[User]:
+    return (await db.execute(select(User).where(User.email == email))).scalars().first()
+
+async def _add_user(db: AsyncSession, user: User) -> User:
+    db.add(user)
+    await db.commit()
+    await db.refresh(user)
+    return user
+
+def _email_taken() -> HTTPException:
+    return HTTPException(
+        status_code=400,
+        detail="The user with this email already exists in the system.",
+    )
+
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many sign-in requests, please retry shortly.",
+        headers={"Retry-After": "1"},
+    )
+
+# register/login run on the event loop: queries go through the async session and bcrypt
+# runs on the password hasher's own pool, so a waiting request holds no worker thread
 @router.post("/register", response_model=Token)
-def register(user_in: UserCreate, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == user_in.email).first()
+async def register(user_in: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    user = await _find_user(db, user_in.email)
+    # Hand the connection back to the pool while bcrypt runs
+    await db.close()
     if user:
-        raise HTTPException(
-            status_code=400,
-            detail="The user with this email already exists in the system.",
-        )
-    user = User(
-        email=user_in.email,
-        hashed_password=security.get_password_hash(user_in.password),
-    )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    access_token = security.create_access_token(data={"sub": user.email})
+        raise _email_taken()
+    try:
+        hashed_password = await security.password_hasher.ahash(user_in.password)
+    except security.PasswordHasherBusy:
+        raise _hashing_busy()
+    try:
+        user = await _add_user(db, User(email=user_in.email, hashed_password=hashed_password))
+    except IntegrityError:
+        # A concurrent registration took the email while bcrypt ran: the unique index decides
+        await db.rollback()
+        raise _email_taken()
+    access_token = security.create_access_token(data=security.user_token_data(user))
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not security.verify_password(form_data.password, user.hashed_password):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    user = await _find_user(db, form_data.username)
+    # Hand the connection back to the pool while bcrypt runs; the detached user keeps its loaded columns
+    await db.close()
+    try:
+        verified = user is not None and await security.password_hasher.averify(form_data.password, user.hashed_password)
+    except security.PasswordHasherBusy:
+        raise _hashing_busy()
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token = security.create_access_token(data={"sub": user.email})
+    access_token = security.create_access_token(data=security.user_token_data(user))
     return {"access_token": access_token, "token_type": "bearer"}
 
 from starlette.requests import Request
@@ -47,7 +82,7 @@ async def login_via_provider(provider: str, request: Request):
     return await oauth.create_client(provider).authorize_redirect(request, redirect_uri)
 
 @router.get("/auth/{provider}/callback")
-async def auth_via_provider(provider: str, request: Request, db: Session = Depends(get_db)):
+async def auth_via_provider(provider: str, request: Request, db: AsyncSession = Depends(get_async_db)):
     token = await oauth.create_client(provider).authorize_access_token(request)
     user_info = token.get('userinfo')
     
@@ -66,18 +101,15 @@ async def auth_via_provider(provider: str, request: Request, db: Session = Depen
          raise HTTPException(status_code=400, detail="Could not validate credentials")
 
     # Check if user exists
-    user = db.query(User).filter(User.email == user_info['email']).first()
+    user = await _find_user(db, user_info['email'])
     if not user:
-        # Create new user (password is not usable)
-        user = User(
+        # Create new user (password is not usable, so there is nothing to hash)
+        user = await _add_user(db, User(
             email=user_info['email'],
-            hashed_password=security.get_password_hash(security.create_access_token(data={"sub": user_info['email']})) # Random hash
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+            hashed_password=security.UNUSABLE_PASSWORD
+        ))
 
-    access_token = security.create_access_token(data={"sub": user.email})
+    access_token = security.create_access_token(data=security.user_token_data(user))
     
     # Redirect to dashboard with token (in a real app, use a secure cookie or intermediate page)
     # For simplicity, we'll return a script to set localStorage and redirect
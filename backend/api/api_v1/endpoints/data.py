@@ -1,81 +1,69 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from backend.database.session import get_db
-from backend.database.models import PredatoryJournal
-from fastapi.responses import StreamingResponse
-import csv
-import io
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from email.utils import parsedate_to_datetime
+from backend.database.session import get_async_predatory_read_db
+from backend.engine.journal_search import PredatoryJournalSearch
+from backend.engine.journal_export import (
+    EXPORT_FORMATS, begin_snapshot, export_version, gzip_chunks, http_date, iter_export, make_etag, parquet_available
+)
+from fastapi.responses import Response, StreamingResponse
 
 router = APIRouter()
 
 @router.get("/download/predatory-journals")
-def download_predatory_journals(db: Session = Depends(get_db)):
-    journals = db.query(PredatoryJournal).all()
-    
-    output = io.StringIO()
-    # Use semicolon delimiter which is often safer for Excel in some locales, 
-    # but comma is standard. Let's stick to comma but ensure BOM is handled if we were writing bytes.
-    # Since we are using StreamingResponse with text/csv, we can't easily prepend BOM to StringIO.
-    # We need to yield bytes.
-    
-    def iter_csv():
-        # Yield BOM for Excel
-        yield u'\ufeff'.encode('utf-8')
-        
-        csv_file = io.StringIO()
-        writer = csv.writer(csv_file)
-        
-        # Header
-        writer.writerow(['Name', 'ISSN', 'Publisher', 'Source', 'URL', 'Last Updated'])
-        yield csv_file.getvalue().encode('utf-8')
-        csv_file.seek(0)
-        csv_file.truncate(0)
-        
-        # Data
-        for j in journals:
-            writer.writerow([
-                j.name,
-                j.issn,
-                j.publisher,
-                j.source,
-                j.url,
-                str(j.last_updated)
-            ])
-            yield csv_file.getvalue().encode('utf-8')
-            csv_file.seek(0)
-            csv_file.truncate(0)
+async def download_predatory_journals(
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|jsonl|parquet)$"),
+    db: AsyncSession = Depends(get_async_predatory_read_db)
+):
+    """
+    Streams the predatory journal list as CSV (default), JSONL or Parquet, reading the
+    table in batches. Responses carry an ETag and Last-Modified derived from the table
+    (max last_updated, row count, max id), so unchanged lists are answered with 304.
+    CSV and JSONL are gzip-compressed on the fly when the client accepts it. The
+    version and the rows are read in one transaction on the request's connection (FastAPI
+    closes the session only after the response has streamed).
+    """
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+
+    encoding = "gzip" if format != "parquet" and "gzip" in request.headers.get("accept-encoding", "") else "identity"
+    snapshot = await begin_snapshot(db)
+    last_modified, token = await export_version(snapshot)
+    etag = make_etag(token, format, encoding)
+
+    headers = {"ETag": etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+            return Response(status_code=304, headers=headers)
+    elif last_modified is not None and request.headers.get("if-modified-since"):
+        try:
+            since = parsedate_to_datetime(request.headers["if-modified-since"])
+        except (TypeError, ValueError):
+            since = None
+        if since is not None and last_modified.replace(microsecond=0) <= since:
+            return Response(status_code=304, headers=headers)
+
+    media_type, extension = EXPORT_FORMATS[format]
+    chunks = iter_export(format, snapshot)
+    if encoding == "gzip":
+        chunks = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+    headers["Content-Disposition"] = f"attachment; filename=predatory_journals.{extension}"
 
-    response = StreamingResponse(
-        iter_csv(),
-        media_type="text/csv"
-    )
-    response.headers["Content-Disposition"] = "attachment; filename=predatory_journals.csv"
-    response.headers["Content-Type"] = "text/csv; charset=utf-8"
-    return response
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
 
 @router.get("/predatory-journals")
-def get_predatory_journals(
+async def get_predatory_journals(
     skip: int = 0, 
     limit: int = 50, 
     search: str = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_predatory_read_db)
 ):
-    query = db.query(PredatoryJournal)
-    
-    if search:
-        search_filter = f"%{search}%"
-        query = query.filter(
-            (PredatoryJournal.name.ilike(search_filter)) | 
-            (PredatoryJournal.publisher.ilike(search_filter)) |
-            (PredatoryJournal.issn.ilike(search_filter))
-        )
-    
-    total = query.count()
-    journals = query.offset(skip).limit(limit).all()
-    
-    return {
-        "total": total,
-        "items": journals,
-        "skip": skip,
-        "limit": limit
-    }
+    # Ranked FTS5 prefix search with highlighted names/publishers; totals are cached
+    # per query until the predatory list changes
+    return await PredatoryJournalSearch.asearch(db, search, skip=skip, limit=min(limit, 200))
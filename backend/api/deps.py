@@ -1,28 +1,61 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from typing import Any, Optional
 from backend.core.config import settings
-from backend.database.session import get_db
+from backend.database.session import get_async_db, get_db
 from backend.database.models import User
 from backend.core import security
+from backend.core.user_cache import AuthenticatedUser, TokenSubject, user_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def _token_subject(token: str) -> TokenSubject:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
+        user_id = payload.get("uid")
+        if email is None or (user_id is not None and not isinstance(user_id, int)):
+            raise _credentials_exception()
     except JWTError:
-        raise credentials_exception
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    return user_id, email
+
+def _user_statement(subject: TokenSubject) -> Select:
+    user_id, email = subject
+    if user_id is not None:
+        # Primary-key fetch; _resolve's email check rejects tokens of a deleted user whose id was reused
+        return select(User.id, User.email).where(User.id == user_id)
+    return select(User.id, User.email).where(User.email == email)
+
+def _resolve(subject: TokenSubject, row: Optional[Any]) -> AuthenticatedUser:
+    if row is None or row.email != subject[1]:
+        raise _credentials_exception()
+    user = AuthenticatedUser(id=row.id, email=row.email)
+    user_cache.put(subject, user)
     return user
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> AuthenticatedUser:
+    subject = _token_subject(token)
+    user = user_cache.get(subject)
+    if user is not None:
+        return user
+    return _resolve(subject, db.execute(_user_statement(subject)).first())
+
+async def aget_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> AuthenticatedUser:
+    """get_current_user on the async session, for the async endpoints."""
+    subject = _token_subject(token)
+    user = user_cache.get(subject)
+    if user is not None:
+        return user
+    return _resolve(subject, (await db.execute(_user_statement(subject))).first())
@@ -1,7 +1,7 @@
 import os
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Literal, Optional
 
 load_dotenv()
 
@@ -11,13 +11,90 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "CHANGE_THIS_TO_A_SECURE_SECRET_KEY" # In prod, read from env
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Carry the user id in access tokens ("uid" claim) so authentication is a primary-key fetch
+    ACCESS_TOKEN_INCLUDE_USER_ID: bool = True
+    # Authenticated users cached in-process by token subject (0 disables the cache)
+    USER_CACHE_TTL_SECONDS: float = 30.0
+    USER_CACHE_MAX_ENTRIES: int = 10000
+
+    # Password hashing (bcrypt) on a dedicated pool; requests beyond the pending limit get 429
+    PASSWORD_HASH_ROUNDS: int = 12  # bcrypt cost factor, existing hashes keep their own
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 32  # running + queued
     
     # Database
     SQLALCHEMY_DATABASE_URI: str = "sqlite:///./ria.db"
     PREDATORY_DATABASE_URI: str = "sqlite:///./predatory.db"
 
+    # SQLite connections (backend.database.sqlite.create_sqlite_engine)
+    SQLITE_WAL: bool = True  # readers are not blocked by a committing writer
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024  # page cache per connection
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    # Open predatory.db with immutable=1 for lookups (no locking or change checks). Only
+    # safe when the file is never written in place while the server runs, e.g. when a new
+    # list is built elsewhere and moved over it; connections are recycled every
+    # PREDATORY_INDEX_REFRESH_SECONDS to pick up a replaced file.
+    PREDATORY_DB_IMMUTABLE: bool = False
+
+    # Predatory list index (seconds between watermark checks against predatory.db)
+    PREDATORY_INDEX_REFRESH_SECONDS: int = 60
+    # Minimum trigram (Dice) similarity for a fuzzy journal/publisher name match
+    FUZZY_MATCH_MIN_SIMILARITY: float = 0.85
+
+    # Reuse previous results for identical uploads (same file hash and predatory list version)
+    ANALYSIS_CACHE_ENABLED: bool = True
+
+    # PDF text extraction
+    PDF_PARALLEL_EXTRACTION: bool = True
+    PDF_EXTRACTION_WORKERS: int = 0 # 0 = one process per CPU core
+    PDF_PARALLEL_MIN_PAGES: int = 8 # shorter documents are extracted in-process
+    PDF_PAGE_BUDGET: int = 0 # max pages extracted per document, 0 = no limit
+    PDF_EXTRACTION_TIMEOUT: float = 120.0 # seconds per document, 0 = no limit
+    # Lazy mode for long documents: front matter + back matter first, middle pages only
+    # when a funding/COI declaration is still missing. Off by default: a skipped body
+    # hides promotional wording (D5) and affiliations outside the front matter (D3)
+    PDF_LAZY_EXTRACTION: bool = False
+    PDF_LAZY_MIN_PAGES: int = 12
+    PDF_FRONT_PAGES: int = 2
+    PDF_BACK_PAGES: int = 3
+
+    # Uploads: hashed while streamed; kept in memory up to the spool size, then spilled
+    # to a unique temp file. Larger uploads are rejected with 413.
+    UPLOAD_MAX_BYTES: int = 50 * 1024 * 1024
+    UPLOAD_SPOOL_MAX_BYTES: int = 2 * 1024 * 1024
+
+    # Background analysis jobs
+    ANALYSIS_WORKERS: int = 2
+    JOB_EVENTS_POLL_SECONDS: float = 0.5
+
+    # Batch analysis (POST /api/analyze/batch)
+    BATCH_WORKERS: int = 4
+    BATCH_COMMIT_SIZE: int = 20  # finished analyses written per transaction
+    BATCH_MAX_FILES: int = 200
+
+    # Predatory list export (GET /api/data/download/predatory-journals)
+    EXPORT_BATCH_ROWS: int = 500  # rows fetched and flushed per chunk (CSV/JSONL)
+    EXPORT_PARQUET_ROW_GROUP_ROWS: int = 10000
+
+    # Scorer keyword lists, matched case-insensitively on word boundaries ("inc" does
+    # not match "including"). A trailing "*" matches every word starting with the stem.
+    COMMERCIAL_FUNDING_KEYWORDS: List[str] = ["pharma*", "inc", "ltd", "corp", "corporation", "company", "laboratories"]
+    COMMERCIAL_AFFILIATION_KEYWORDS: List[str] = ["pharma*", "inc", "ltd", "corp", "corporation", "company"]
+    PROMOTIONAL_KEYWORDS: List[str] = ["groundbreaking", "miracle", "unprecedented", "perfect", "amazing"]
+    KNOWN_PUBLISHERS: List[str] = ["Elsevier", "Springer", "Wiley", "Taylor & Francis", "Sage", "MDPI", "Frontiers", "Hindawi", "IEEE", "ACM"]
+
     # External Services
     OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
+    OPENAI_BASE_URL: Optional[str] = os.getenv("OPENAI_BASE_URL")  # any OpenAI-compatible server
+    LLM_MODEL: str = "gpt-4o"
+    LLM_TIMEOUT_SECONDS: float = 20.0  # then the heuristic summary is used
+    LLM_MAX_CONNECTIONS: int = 10
+    LLM_SUMMARY_CACHE_SIZE: int = 1024
 
     # Social Login
     GOOGLE_CLIENT_ID: Optional[str] = os.getenv("GOOGLE_CLIENT_ID")
@@ -0,0 +1,50 @@
+from typing import List, Optional
+import re
+
+# "1234-5678", "1234 567X", "1234567x" (also hyphen/en-dash variants from PDF text)
+ISSN_PATTERN = re.compile(r"(?<![0-9])([0-9]{4})[-\u2010-\u2013 ]?([0-9]{3}[0-9Xx])(?![0-9A-Za-z])")
+
+def issn_check_digit(digits: str) -> str:
+    """Check character for the first 7 ISSN digits (ISO 3297, weights 8..2, mod 11)."""
+    total = sum(int(d) * w for d, w in zip(digits, range(8, 1, -1)))
+    check = (11 - total % 11) % 11
+    return "X" if check == 10 else str(check)
+
+def canonicalize_issn(value: Optional[str]) -> Optional[str]:
+    """
+    Returns the canonical 8-character form ("1234567X") of a single ISSN,
+    or None if it is malformed or fails the check digit.
+    """
+    if not value:
+        return None
+    compact = re.sub(r'[^0-9X]', '', value.upper())
+    if not re.fullmatch(r'[0-9]{7}[0-9X]', compact):
+        return None
+    if issn_check_digit(compact[:7]) != compact[7]:
+        return None
+    return compact
+
+def is_valid_issn(value: Optional[str]) -> bool:
+    return canonicalize_issn(value) is not None
+
+def split_issns(value: Optional[str]) -> List[str]:
+    """
+    All valid ISSNs in a free-form string such as "1234-5678, 2345-678X",
+    in canonical form, de-duplicated and in order of appearance.
+    """
+    if not value:
+        return []
+    found = []
+    for first, second in ISSN_PATTERN.findall(value):
+        canonical = canonicalize_issn(first + second)
+        if canonical and canonical not in found:
+            found.append(canonical)
+    return found
+
+def format_issn(canonical: str) -> str:
+    # "1234567X" -> "1234-567X"
+    return f"{canonical[:4]}-{canonical[4:]}"
+
+def looks_like_year_range(first: str, second: str) -> bool:
+    # "2019-2020", "1998-1999": two plausible years, not an ISSN
+    return all(part[:2] in ("19", "20") and part[3].isdigit() for part in (first, second))
@@ -0,0 +1,69 @@
+from typing import Iterable, Optional, Tuple
+from backend.core.issn import split_issns
+import re
+import unicodedata
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+# Scheme and credentials are optional: list sources give "example.org/journal" as often as full URLs
+URL_HOST_PATTERN = r"^\s*(?:[A-Za-z][A-Za-z0-9+.-]*://)?(?:[^/?#@]*@)?([^/?#:\s]*)"
+_URL_HOST = re.compile(URL_HOST_PATTERN)
+_WWW = re.compile(r"^www\.")
+
+# (normalized name, canonical ISSN or "", site or "")
+JournalKey = Tuple[str, str, str]
+
+def normalize_name(name: Optional[str]) -> str:
+    """
+    Case-, accent- and punctuation-insensitive form of a journal/publisher name
+    ("The Journal of Médical Sciences." -> "the journal of medical sciences").
+    Deliberately conservative (no abbreviation expansion or stopword removal, unlike
+    fuzzy_matcher.expand_name) because it is part of a unique key.
+    """
+    if not name:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", name)
+    ascii_name = decomposed.encode("ascii", "ignore").decode("ascii").lower()
+    return _NON_ALNUM.sub(" ", ascii_name).strip()
+
+def issn_key(issn: Optional[str]) -> str:
+    """Smallest canonical ISSN in a free-form value ("" if none), stable across source ordering."""
+    issns = split_issns(issn)
+    return min(issns) if issns else ""
+
+def url_host(url: Optional[str]) -> str:
+    """Lower-cased host of a URL without "www." ("" if none): "http://www.Example.org/j" -> "example.org"."""
+    match = _URL_HOST.match(url or "")
+    return _WWW.sub("", match.group(1).lower().rstrip(".")) if match else ""
+
+def site_key(url: Optional[str], entity_type: Optional[str]) -> str:
+    """"<entity type>:<host>", e.g. "journal:example.org" or "publisher:" without a URL."""
+    return f"{(entity_type or 'journal').lower()}:{url_host(url)}"
+
+def journal_key(name: Optional[str], issn: Optional[str], url: Optional[str] = None, entity_type: Optional[str] = None) -> JournalKey:
+    """
+    Natural key of a predatory_journals row: (normalized name, canonical ISSN or "",
+    site or ""). Only rows without an ISSN carry a site, so two ISSN-less journals or
+    publishers sharing a name stay apart when their URL host or entity type differs.
+    """
+    issn_value = issn_key(issn)
+    return normalize_name(name), issn_value, "" if issn_value else site_key(url, entity_type)
+
+def fold_target(key: JournalKey, others: Iterable[JournalKey]) -> Optional[JournalKey]:
+    """
+    The key an ISSN-less record merges into among other keys of the same name: the
+    only ISSN variant, or for a record without a URL host the only ISSN-less variant
+    of the same entity type that has one. None if key has an ISSN or there is no
+    single such variant.
+    """
+    if key[1]:
+        return None
+    others = [other for other in others if other != key]
+    keyed = [other for other in others if other[1]]
+    if keyed:
+        return keyed[0] if len(keyed) == 1 else None
+
+    entity_type, _, host = key[2].partition(":")
+    if host:
+        return None
+    sited = [other for other in others if other[2].partition(":")[0] == entity_type and other[2].partition(":")[2]]
+    return sited[0] if len(sited) == 1 else None
@@ -1,14 +1,78 @@
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from typing import Callable, Optional, Union
 from jose import JWTError, jwt
+import asyncio
 import bcrypt
+import threading
 from backend.core.config import settings
 
+# Stored for accounts created through social login: never produced by bcrypt, so no
+# password verifies against it and creating the account costs no hashing
+UNUSABLE_PASSWORD = "!"
+
 def verify_password(plain_password, hashed_password):
+    if not hashed_password or hashed_password.startswith(UNUSABLE_PASSWORD):
+        return False
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
 def get_password_hash(password):
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=settings.PASSWORD_HASH_ROUNDS)).decode('utf-8')
+
+class PasswordHasherBusy(Exception):
+    pass
+
+class PasswordHasher:
+    """
+    Dedicated, bounded thread pool for bcrypt. bcrypt releases the GIL, so `workers`
+    hashes run in parallel without holding the server's request threads while they
+    do. At most `max_pending` hashes are running or queued; beyond that submissions
+    fail fast with PasswordHasherBusy (HTTP 429) instead of piling up behind a login storm.
+    """
+
+    def __init__(self, workers: int = settings.PASSWORD_HASH_WORKERS, max_pending: int = settings.PASSWORD_HASH_MAX_PENDING):
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy()
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+            executor = self._executor
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    async def ahash(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(get_password_hash, password))
+
+    async def averify(self, plain_password: str, hashed_password: str) -> bool:
+        if not hashed_password or hashed_password.startswith(UNUSABLE_PASSWORD):
+            return False
+        return await asyncio.wrap_future(self._submit(verify_password, plain_password, hashed_password))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+password_hasher = PasswordHasher()
+
+def user_token_data(user) -> dict:
+    # "sub" stays the email so tokens remain valid when the user id claim is switched off
+    data = {"sub": user.email}
+    if settings.ACCESS_TOKEN_INCLUDE_USER_ID:
+        data["uid"] = user.id
+    return data
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
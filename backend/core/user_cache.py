@@ -0,0 +1,69 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+import threading
+import time
+from backend.core.config import settings
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """What authenticated endpoints need of the current user, detached from any session."""
+    id: int
+    email: str
+
+# (user id claim or None, subject claim) of an access token
+TokenSubject = Tuple[Optional[int], str]
+
+class UserCache:
+    """
+    Short-TTL cache of token subject -> AuthenticatedUser in front of the users table,
+    so dashboards polling history or jobs do not run a user query per request.
+    Entries of a user are dropped as soon as the row is inserted, updated or deleted
+    (see the User mapper events); the TTL bounds staleness for writes made by other
+    processes. Unknown subjects are never cached.
+    """
+
+    def __init__(self, ttl: float = settings.USER_CACHE_TTL_SECONDS, max_entries: int = settings.USER_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[TokenSubject, Tuple[float, AuthenticatedUser]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, subject: TokenSubject) -> Optional[AuthenticatedUser]:
+        if self.ttl <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None:
+                return None
+            expires, user = entry
+            if expires < time.monotonic():
+                del self._entries[subject]
+                return None
+            self._entries.move_to_end(subject)
+            return user
+
+    def put(self, subject: TokenSubject, user: AuthenticatedUser) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[subject] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: Optional[int] = None, email: Optional[str] = None) -> None:
+        """Drops every entry of the user with this id or email (old and new email on a change)."""
+        with self._lock:
+            stale = [
+                subject for subject, (_, user) in self._entries.items()
+                if user.id == user_id or user.email == email or subject[1] == email
+            ]
+            for subject in stale:
+                del self._entries[subject]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+user_cache = UserCache()
@@ -1,7 +1,10 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Boolean, Column, Integer, String, Text, DateTime, ForeignKey, JSON, Index, event, inspect
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from backend.database.session import Base, PredatoryBase
+from backend.core.user_cache import user_cache
+from backend.core.issn import split_issns
+from backend.core.journal_keys import journal_key
 
 class User(Base):
     __tablename__ = "users"
@@ -29,8 +32,41 @@ class Analysis(Base):
     # Storing the full JSON result
     full_result = Column(JSON)
 
+    # Result cache key: SHA-256 of the uploaded file + predatory list version, scorer
+    # version (rules + keyword lists) and extraction version (page selection settings)
+    file_hash = Column(String(64), index=True, nullable=True)
+    predatory_list_version = Column(String, nullable=True)
+    scorer_version = Column(String, nullable=True)
+    extraction_version = Column(String, nullable=True)
+    # The summary is the heuristic stand-in for a failed LLM call: never a cache hit
+    summary_fallback = Column(Boolean, nullable=True, default=False)
+
     owner = relationship("User", back_populates="analyses")
 
+    # History pages are read newest-first per user with keyset pagination on
+    # (upload_date, id); SQLite index entries end with the rowid (= id), so this index
+    # serves the whole sort key
+    __table_args__ = (
+        Index("ix_analyses_user_id_upload_date", "user_id", "upload_date"),
+    )
+
+class AnalysisJob(Base):
+    """Background analysis of an uploaded PDF (see backend.engine.job_queue)."""
+    __tablename__ = "analysis_jobs"
+
+    id = Column(String(32), primary_key=True) # uuid4 hex
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    filename = Column(String)
+    status = Column(String, default="queued", index=True) # queued, running, completed, failed
+    stage = Column(String, default="queued") # queued, extract, score, summarize, persist, done
+    error = Column(Text, nullable=True)
+    analysis_id = Column(Integer, ForeignKey("analyses.id"), nullable=True)
+    upload_path = Column(String, nullable=True) # staged temp file while the job is active
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    analysis = relationship("Analysis")
+
 class PredatoryJournal(PredatoryBase):
     __tablename__ = "predatory_journals"
 
@@ -42,3 +78,80 @@ class PredatoryJournal(PredatoryBase):
     entity_type = Column(String, default="journal") # journal, publisher
     url = Column(String, nullable=True)
     last_updated = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Natural key used by bulk ingestion (see backend.core.journal_keys): normalized
+    # name + smallest canonical ISSN + "<entity type>:<url host>" for rows without ISSN
+    # ("" rather than NULL so the unique index applies). Rows that duplicated an earlier
+    # row's key when the key was introduced carry "#<id>" in site_key until deduplicated
+    # (see backend/scripts/dedupe_journals.py).
+    name_key = Column(String, nullable=True)
+    issn_key = Column(String(8), nullable=False, default="", server_default="")
+    site_key = Column(String, nullable=False, default="", server_default="")
+    # sha256 of the source row this journal was last synced from (see predatory_sync)
+    source_fingerprint = Column(String(64), nullable=True)
+
+    __table_args__ = (
+        Index("uq_predatory_journals_journal_key", "name_key", "issn_key", "site_key", unique=True),
+    )
+
+class PredatoryListState(PredatoryBase):
+    """Single row (id=1) holding the predatory list version, bumped once per write batch."""
+    __tablename__ = "predatory_list_state"
+
+    id = Column(Integer, primary_key=True)
+    list_version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class JournalISSN(PredatoryBase):
+    """One canonical, check-digit validated ISSN ("1234567X") per row."""
+    __tablename__ = "journal_issns"
+
+    id = Column(Integer, primary_key=True, index=True)
+    journal_id = Column(Integer, ForeignKey("predatory_journals.id", ondelete="CASCADE"), index=True, nullable=False)
+    issn = Column(String(8), index=True, nullable=False)
+
+# Cached authenticated users must not outlive a change to their row
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target):
+    previous = inspect(target).attrs.email.history.deleted
+    user_cache.invalidate(user_id=target.id, email=target.email)
+    for email in previous:
+        user_cache.invalidate(email=email)
+
+# Keep journal_issns in sync with the free-form PredatoryJournal.issn column for ORM writers
+# (bulk ingestion through PredatoryIngestor syncs it itself).
+def _sync_journal_issns(connection, journal_id, issn_value):
+    table = JournalISSN.__table__
+    connection.execute(table.delete().where(table.c.journal_id == journal_id))
+    rows = [{"journal_id": journal_id, "issn": issn} for issn in split_issns(issn_value)]
+    if rows:
+        connection.execute(table.insert(), rows)
+
+_KEY_COLUMNS = ("name", "issn", "url", "entity_type")
+
+@event.listens_for(PredatoryJournal, "before_insert")
+def _set_journal_key(mapper, connection, target):
+    target.name_key, target.issn_key, target.site_key = journal_key(target.name, target.issn, target.url, target.entity_type)
+
+@event.listens_for(PredatoryJournal, "before_update")
+def _update_journal_key(mapper, connection, target):
+    # Only when a key column changes, so a not yet deduplicated "#<id>" key survives other edits
+    state = inspect(target)
+    if any(state.attrs[column].history.has_changes() for column in _KEY_COLUMNS):
+        _set_journal_key(mapper, connection, target)
+
+@event.listens_for(PredatoryJournal, "after_insert")
+def _journal_inserted(mapper, connection, target):
+    if target.issn:
+        _sync_journal_issns(connection, target.id, target.issn)
+
+@event.listens_for(PredatoryJournal, "after_update")
+def _journal_updated(mapper, connection, target):
+    if inspect(target).attrs.issn.history.has_changes():
+        _sync_journal_issns(connection, target.id, target.issn)
+
+@event.listens_for(PredatoryJournal, "after_delete")
+def _journal_deleted(mapper, connection, target):
+    _sync_journal_issns(connection, target.id, None)
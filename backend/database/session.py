@@ -1,21 +1,99 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from typing import Any, Dict, Union
 from backend.core.config import settings
-
-engine = create_engine(
-    settings.SQLALCHEMY_DATABASE_URI, connect_args={"check_same_thread": False}
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+from backend.database.sqlite import create_async_sqlite_engine, create_sqlite_engine
 
 Base = declarative_base()
+PredatoryBase = declarative_base()
+
+class RoutingSession(Session):
+    """
+    Session that sends every statement to the database its models belong to, so a model
+    can't be read from the wrong file: each declarative base in `routes`, and every table
+    of its metadata, is bound to that base's engine. ORM queries, flushes and Core
+    statements on Table objects all resolve through these binds. Raw text() SQL has no
+    tables to route by and uses the default `bind`, unless the caller passes
+    bind_arguments={"mapper": SomeModel}. Tables are collected when the session is
+    created, i.e. after the models are imported.
+    """
+
+    def __init__(self, routes: Dict[Any, Engine], **kwargs):
+        super().__init__(binds=route_binds(routes), **kwargs)
+
+class AsyncRoutingSession(AsyncSession):
+    """RoutingSession for the async engines (routes map declarative bases to AsyncEngines)."""
+
+    def __init__(self, routes: Dict[Any, AsyncEngine], **kwargs):
+        super().__init__(binds=route_binds(routes), **kwargs)
+
+def route_binds(routes: Dict[Any, Union[Engine, AsyncEngine]]) -> Dict[Any, Union[Engine, AsyncEngine]]:
+    binds = {}
+    for base, engine_ in routes.items():
+        binds[base] = engine_
+        binds.update({table: engine_ for table in base.metadata.tables.values()})
+    return binds
+
+engine = create_sqlite_engine(settings.SQLALCHEMY_DATABASE_URI)
 
 # Predatory Database Setup
-predatory_engine = create_engine(
-    settings.PREDATORY_DATABASE_URI, connect_args={"check_same_thread": False}
-)
+predatory_engine = create_sqlite_engine(settings.PREDATORY_DATABASE_URI)
 PredatorySessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=predatory_engine)
 
-PredatoryBase = declarative_base()
+# Read-only connections for the hot path (detection during analysis, search, export);
+# writers (ingestion, sync, the admin update, migrations) use predatory_engine
+predatory_read_engine = create_sqlite_engine(
+    settings.PREDATORY_DATABASE_URI,
+    read_only=True,
+    immutable=settings.PREDATORY_DB_IMMUTABLE,
+    pool_recycle=settings.PREDATORY_INDEX_REFRESH_SECONDS if settings.PREDATORY_DB_IMMUTABLE else -1
+)
+PredatoryReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=predatory_read_engine)
+
+def session_router(default: Engine, predatory: Engine) -> sessionmaker:
+    """Sessions on `default` (ria.db) that read the predatory list models from `predatory`."""
+    return sessionmaker(
+        class_=RoutingSession,
+        routes={Base: default, PredatoryBase: predatory},
+        autocommit=False,
+        autoflush=False,
+        bind=default
+    )
+
+# Application sessions: ria.db, with predatory list lookups on the read-only engine
+SessionLocal = session_router(engine, predatory_read_engine)
+
+def async_session_router(default: AsyncEngine, predatory: AsyncEngine) -> async_sessionmaker:
+    """
+    session_router for the async engines. Objects stay loaded after commit: an expired
+    attribute would need a lazy load, which async sessions can't do implicitly.
+    """
+    return async_sessionmaker(
+        class_=AsyncRoutingSession,
+        routes={Base: default, PredatoryBase: predatory},
+        autoflush=False,
+        expire_on_commit=False,
+        bind=default
+    )
+
+# The same two files on the aiosqlite driver, for the async API endpoints. Background
+# workers, scripts and migrations keep the sync engines above.
+async_engine = create_async_sqlite_engine(settings.SQLALCHEMY_DATABASE_URI)
+async_predatory_read_engine = create_async_sqlite_engine(
+    settings.PREDATORY_DATABASE_URI,
+    read_only=True,
+    immutable=settings.PREDATORY_DB_IMMUTABLE,
+    pool_recycle=settings.PREDATORY_INDEX_REFRESH_SECONDS if settings.PREDATORY_DB_IMMUTABLE else -1
+)
+AsyncSessionLocal = async_session_router(async_engine, async_predatory_read_engine)
+AsyncPredatoryReadSessionLocal = async_sessionmaker(
+    autoflush=False, expire_on_commit=False, bind=async_predatory_read_engine
+)
+
+async def dispose_async_engines() -> None:
+    await async_engine.dispose()
+    await async_predatory_read_engine.dispose()
 
 def get_db():
     db = SessionLocal()
@@ -30,3 +108,18 @@ def get_predatory_db():
         yield db
     finally:
         db.close()
+
+def get_predatory_read_db():
+    db = PredatoryReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_predatory_read_db():
+    async with AsyncPredatoryReadSessionLocal() as db:
+        yield db
@@ -0,0 +1,90 @@
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from typing import Any, Dict, Tuple
+from urllib.parse import quote
+import os
+from backend.core.config import settings
+
+def _is_file_database(database: str) -> bool:
+    return bool(database) and database != ":memory:" and not database.startswith("file:")
+
+def read_only_uri(uri: str, immutable: bool = False) -> str:
+    """
+    sqlite:///file:/abs/path.db?mode=ro&uri=true for a plain file URI. immutable=1 also
+    skips all locking and change detection; SQLite then assumes the file never changes.
+    """
+    url = make_url(uri)
+    path = quote(os.path.abspath(url.database))
+    params = "mode=ro" + ("&immutable=1" if immutable else "")
+    return f"sqlite:///file:{path}?{params}&uri=true"
+
+def _engine_arguments(uri: str, read_only: bool, immutable: bool, kwargs: Dict[str, Any]) -> Tuple[str, bool, Dict[str, Any]]:
+    # (uri to connect to, whether it is a file database, create_engine keyword arguments)
+    url = make_url(uri)
+    file_database = url.get_backend_name() == "sqlite" and _is_file_database(url.database or "")
+    if read_only and file_database:
+        uri = read_only_uri(uri, immutable)
+
+    connect_args = {"check_same_thread": False, "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000}
+    connect_args.update(kwargs.pop("connect_args", {}))
+    if file_database:
+        # In-memory databases use a single-connection pool that takes no sizing
+        kwargs.setdefault("pool_size", settings.DB_POOL_SIZE)
+        kwargs.setdefault("max_overflow", settings.DB_MAX_OVERFLOW)
+        kwargs.setdefault("pool_timeout", settings.DB_POOL_TIMEOUT)
+    return uri, file_database, dict(kwargs, connect_args=connect_args)
+
+def _set_pragmas_on_connect(engine: Engine, read_only: bool, file_database: bool) -> None:
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            if read_only:
+                cursor.execute("PRAGMA query_only=ON")
+            elif file_database and settings.SQLITE_WAL:
+                # Persistent in the file; readers opened read-only inherit it
+                cursor.execute("PRAGMA journal_mode=WAL")
+            if not read_only:
+                cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+            cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+            cursor.execute(f"PRAGMA cache_size={-int(settings.SQLITE_CACHE_SIZE_KB)}")
+            cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+        finally:
+            cursor.close()
+
+def create_sqlite_engine(uri: str, read_only: bool = False, immutable: bool = False, **kwargs) -> Engine:
+    """
+    Engine for a SQLite file with the pragmas from settings applied to every connection:
+    WAL journaling (readers no longer wait for a committing writer), synchronous=NORMAL
+    (no fsync per commit in WAL mode, still durable across application crashes), a busy
+    timeout instead of immediate "database is locked" errors, a larger page cache and
+    memory-mapped reads. The connection pool is sized from settings.
+
+    read_only opens the file through a mode=ro URI (and immutable=1 if asked) and sets
+    query_only, for connections that only serve lookups.
+    """
+    backend = make_url(uri).get_backend_name()
+    uri, file_database, kwargs = _engine_arguments(uri, read_only, immutable, kwargs)
+    engine = create_engine(uri, **kwargs)
+    if backend == "sqlite":
+        _set_pragmas_on_connect(engine, read_only, file_database)
+    return engine
+
+def create_async_sqlite_engine(uri: str, read_only: bool = False, immutable: bool = False, **kwargs) -> AsyncEngine:
+    """
+    create_sqlite_engine for asyncio code: the same file, pragmas and pool sizing, on the
+    aiosqlite driver (each connection runs its sqlite3 calls on a thread of its own, so
+    awaiting a query doesn't block the event loop). A plain sqlite:// URI is switched to
+    sqlite+aiosqlite://.
+    """
+    url = make_url(uri)
+    backend = url.get_backend_name()
+    uri, file_database, kwargs = _engine_arguments(uri, read_only, immutable, kwargs)
+    if backend == "sqlite":
+        uri = make_url(uri).set(drivername="sqlite+aiosqlite")
+    engine = create_async_engine(uri, **kwargs)
+    if backend == "sqlite":
+        _set_pragmas_on_connect(engine.sync_engine, read_only, file_database)
+    return engine
@@ -0,0 +1,56 @@
+from sqlalchemy.orm import Session
+from backend.database.models import Analysis
+from typing import Any, Dict, Optional
+
+class AnalysisCache:
+    """
+    Content-addressed result cache on top of the analyses table.
+    A previous analysis is reused when the uploaded file has the same SHA-256 hash and
+    was scored against the same predatory list version by the same scorer rules and
+    keyword lists (scorer.scorer_version), from text extracted with the same page
+    selection settings (pdf_processor.extraction_version); the lookup uses the
+    ix_analyses_file_hash index, so a hit skips extraction, scoring and the LLM call. Analyses whose summary
+    is the heuristic fallback for a failed LLM call are skipped, so the next upload
+    gets another chance at the real summary.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def lookup(
+        self,
+        file_hash: str,
+        predatory_list_version: Optional[str],
+        scorer_version: str,
+        extraction_version: str
+    ) -> Optional[Analysis]:
+        if not file_hash or predatory_list_version is None:
+            return None
+        return (
+            self.db.query(Analysis)
+            .filter(
+                Analysis.file_hash == file_hash,
+                Analysis.predatory_list_version == predatory_list_version,
+                Analysis.scorer_version == scorer_version,
+                Analysis.extraction_version == extraction_version,
+                Analysis.summary_fallback.isnot(True)
+            )
+            .order_by(Analysis.id.desc())
+            .first()
+        )
+
+    @staticmethod
+    def result_fields(cached: Analysis) -> Dict[str, Any]:
+        """Column values of a cached analysis that a new history row can reuse."""
+        return {
+            "overall_risk": cached.overall_risk,
+            "score": cached.score,
+            "summary": cached.summary,
+            "full_result": cached.full_result,
+            "file_hash": cached.file_hash,
+            "predatory_list_version": cached.predatory_list_version,
+            "scorer_version": cached.scorer_version,
+            "extraction_version": cached.extraction_version,
+            "summary_fallback": cached.summary_fallback
+        }
+
@@ -0,0 +1,152 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from sqlalchemy.orm import sessionmaker
+from typing import Any, BinaryIO, Dict, Iterator, List, Tuple
+from backend.core.config import settings
+from backend.database.session import SessionLocal, PredatoryReadSessionLocal
+from backend.database.models import Analysis
+from backend.engine.pipeline import compute_analysis
+from backend.engine.uploads import StagedUpload, UploadTooLarge, stage_stream
+import os
+import time
+import zipfile
+
+class BatchTooLarge(ValueError):
+    pass
+
+def stage_upload(filename: str, stream: BinaryIO, staged: List[StagedUpload]) -> None:
+    """
+    Stages one uploaded file (see backend.engine.uploads), appending to staged.
+    ZIP archives are expanded to their PDF members (directory structure and non-PDF
+    members are ignored; member names are never used as paths on disk).
+    """
+    if filename.lower().endswith(".zip"):
+        with zipfile.ZipFile(stream) as archive:
+            for member in archive.infolist():
+                name = member.filename
+                if member.is_dir() or not name.lower().endswith(".pdf") or name.startswith("__MACOSX/"):
+                    continue
+                _check_batch_size(staged)
+                if settings.UPLOAD_MAX_BYTES and member.file_size > settings.UPLOAD_MAX_BYTES:
+                    raise UploadTooLarge(f"{name} exceeds the {settings.UPLOAD_MAX_BYTES} byte limit")
+                with archive.open(member) as member_stream:
+                    staged.append(stage_stream(member_stream, os.path.basename(name)))
+    else:
+        _check_batch_size(staged)
+        staged.append(stage_stream(stream, filename))
+
+def _check_batch_size(staged: List[StagedUpload]) -> None:
+    if len(staged) >= settings.BATCH_MAX_FILES:
+        raise BatchTooLarge(f"A batch may contain at most {settings.BATCH_MAX_FILES} PDFs")
+
+def remove_staged(staged: List[StagedUpload]) -> None:
+    for upload in staged:
+        upload.cleanup()
+
+def _analyze_file(upload: StagedUpload) -> Dict[str, Any]:
+    # Sessions are not thread-safe, so every task gets its own pair
+    db = SessionLocal()
+    predatory_db = PredatoryReadSessionLocal()
+    try:
+        return compute_analysis(upload.source, db, predatory_db, file_hash=upload.sha256)
+    finally:
+        db.close()
+        predatory_db.close()
+
+class BatchAnalyzer:
+    """
+    Analyzes many PDFs for one user on a dedicated worker pool.
+
+    run() yields NDJSON-ready events as files finish (in completion order, not upload
+    order): a "result" event per file, a "committed" event each time a group of
+    BATCH_COMMIT_SIZE finished analyses is written in a single transaction (mapping
+    the file's index in the batch to its Analysis id), and a final "summary" event
+    with the throughput and failure counts. If the client goes away mid-batch (the
+    generator is closed), files not started yet are dropped and the analyses already
+    reported are still committed; close() returns once the running analyses are done,
+    so the caller can remove the staged files afterwards.
+    """
+
+    def __init__(
+        self,
+        user_id: int,
+        max_workers: int = settings.BATCH_WORKERS,
+        commit_size: int = settings.BATCH_COMMIT_SIZE,
+        session_factory: sessionmaker = SessionLocal
+    ):
+        self.user_id = user_id
+        self.max_workers = max_workers
+        self.commit_size = max(1, commit_size)
+        self.session_factory = session_factory
+
+    def run(self, files: List[StagedUpload]) -> Iterator[Dict[str, Any]]:
+        started = time.monotonic()
+        pending: List[Tuple[int, Analysis]] = []
+        counts = {"completed": 0, "failed": 0}
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="batch-worker")
+        try:
+            futures = {
+                executor.submit(_analyze_file, upload): (index, upload.filename)
+                for index, upload in enumerate(files)
+            }
+            for future in as_completed(futures):
+                index, filename = futures[future]
+                try:
+                    fields = future.result()
+                except Exception as e:
+                    counts["failed"] += 1
+                    yield {"event": "result", "index": index, "filename": filename, "status": "failed", "error": str(e) or e.__class__.__name__}
+                    continue
+
+                counts["completed"] += 1
+                pending.append((index, Analysis(user_id=self.user_id, filename=filename, **fields)))
+                yield {
+                    "event": "result",
+                    "index": index,
+                    "filename": filename,
+                    "status": "completed",
+                    "overall_risk": fields["overall_risk"],
+                    "score": fields["score"],
+                    "summary": fields["summary"]
+                }
+
+                if len(pending) >= self.commit_size:
+                    committed, pending = self._commit(pending), []
+                    yield committed
+
+            if pending:
+                committed, pending = self._commit(pending), []
+                yield committed
+        except GeneratorExit:
+            # The response stream was closed (client disconnected): running analyses still
+            # read their staged files, so wait for them; keep what was already reported
+            executor.shutdown(wait=True, cancel_futures=True)
+            if pending:
+                self._commit(pending)
+            raise
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        elapsed = time.monotonic() - started
+        summary = {
+            "event": "summary",
+            "files": len(files),
+            "completed": counts["completed"],
+            "failed": counts["failed"],
+            "elapsed_seconds": round(elapsed, 3),
+            "files_per_second": round(len(files) / elapsed, 3) if elapsed > 0 else None
+        }
+        print(f"Batch for user {self.user_id}: {summary['files']} files, {summary['failed']} failed, {summary['files_per_second']} files/s")
+        yield summary
+
+    def _commit(self, pending: List[Tuple[int, Analysis]]) -> Dict[str, Any]:
+        db = self.session_factory()
+        try:
+            db.add_all([analysis for _, analysis in pending])
+            db.flush()
+            # Read the ids before commit expires the instances
+            analysis_ids = {str(index): analysis.id for index, analysis in pending}
+            db.commit()
+            return {"event": "committed", "analysis_ids": analysis_ids}
+        finally:
+            db.close()
@@ -0,0 +1,152 @@
+from typing import Dict, List, Optional, Tuple
+from backend.core.config import settings
+from backend.engine.keyword_matcher import KeywordMatch, is_word_char, on_word_boundaries, trie_pattern
+import re
+
+# Statement patterns: (category, trigger literals, regex applied at the trigger position).
+# The trigger literals are the fixed text every match of the regex starts with.
+STATEMENT_PATTERNS: List[Tuple[str, List[str], str]] = [
+    ("funding", ["funding"], r"funding[:\s]+(.*?)(?:\.|$)"),
+    ("funding", ["supported by"], r"supported by[:\s]+(.*?)(?:\.|$)"),
+    ("funding", ["grant"], r"grant[:\s]+(.*?)(?:\.|$)"),
+    ("funding", ["financial support"], r"financial support[:\s]+(.*?)(?:\.|$)"),
+    ("funding", ["funded by"], r"funded by[:\s]+(.*?)(?:\.|$)"),
+    ("funding", ["funding provided by"], r"funding provided by[:\s]+(.*?)(?:\.|$)"),
+    ("coi_statements", ["conflict of interest"], r"conflict of interest[:\s]+(.*?)(?:\.|$)"),
+    ("coi_statements", ["competing interest"], r"competing interest[:\s]+(.*?)(?:\.|$)"),
+    ("coi_statements", ["disclosure"], r"disclosure[:\s]+(.*?)(?:\.|$)"),
+    ("coi_statements", ["declaration of interest"], r"declaration of interest[:\s]+(.*?)(?:\.|$)"),
+    ("coi_statements", ["authors declare"], r"authors declare[:\s]+(.*?)(?:\.|$)"),
+    ("coi_statements", ["no conflict of interest declared"], r"no conflict of interest declared"),
+    ("coi_statements", ["no competing interests declared"], r"no competing interests declared"),
+    ("affiliations", ["department of ", "institute of ", "university of ", "hospital of "],
+     r"(?:Department|Institute|University|Hospital) of [^\n\.]+"),
+]
+
+# Email addresses are triggered by their "@" and extended backwards to the local part
+EMAIL_PATTERN = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
+_EMAIL_LOCAL_PART = re.compile(r"[a-zA-Z0-9._%+-]+\Z")
+
+# Keyword vocabularies matched case-insensitively on word boundaries ("Sage" is not
+# found in "dosage"); a trailing "*" matches every word starting with the stem
+PROMOTIONAL_KEYWORDS = settings.PROMOTIONAL_KEYWORDS
+KNOWN_PUBLISHERS = settings.KNOWN_PUBLISHERS
+KEYWORD_LISTS: Dict[str, List[str]] = {
+    "promotional": PROMOTIONAL_KEYWORDS,
+    "publishers": KNOWN_PUBLISHERS,
+}
+
+class _Rule:
+    __slots__ = ("category", "regex", "value", "backward", "stem")
+
+    def __init__(self, category: str, regex: Optional[re.Pattern] = None, value: Optional[str] = None,
+                 backward: bool = False, stem: bool = False):
+        self.category = category
+        self.regex = regex
+        self.value = value
+        self.backward = backward
+        self.stem = stem
+
+class EvidenceEngine:
+    """
+    Extracts every evidence category (funding, COI statements, affiliations and keyword
+    vocabularies) in a single pass over the document.
+
+    All trigger literals are compiled into one trie-shaped alternation that is scanned
+    once over the lowercased text. Each hit only runs the (anchored) statement regexes
+    whose trigger starts there, instead of running ~15 IGNORECASE regexes over the
+    whole text. Matches of the same rule never overlap, mirroring re.findall. Keyword
+    hits only count on word boundaries of the original text.
+    """
+
+    def __init__(self, statement_patterns=STATEMENT_PATTERNS, keyword_lists=KEYWORD_LISTS):
+        self.categories: List[str] = []
+        self.keyword_lists = keyword_lists
+        self.vocabulary = {kw for keywords in keyword_lists.values() for kw in keywords}
+        rules_by_trigger: Dict[str, List[_Rule]] = {}
+
+        for category, triggers, pattern in statement_patterns:
+            rule = _Rule(category, regex=re.compile(pattern, re.IGNORECASE | re.MULTILINE))
+            for trigger in triggers:
+                rules_by_trigger.setdefault(trigger.lower(), []).append(rule)
+            self._add_category(category)
+
+        email_rule = _Rule("affiliations", regex=re.compile(EMAIL_PATTERN, re.IGNORECASE), backward=True)
+        rules_by_trigger.setdefault("@", []).append(email_rule)
+
+        for category, keywords in keyword_lists.items():
+            for kw in keywords:
+                value = kw[:-1] if kw.endswith("*") else kw
+                rules_by_trigger.setdefault(value.lower(), []).append(_Rule(category, value=value, stem=value != kw))
+            self._add_category(category)
+
+        # The scan reports the longest trigger at each position; every rule whose trigger
+        # is a prefix of it ("funding" inside "funding provided by") must run too.
+        self._dispatch: Dict[str, List[_Rule]] = {
+            trigger: [rule for other, rules in rules_by_trigger.items() if trigger.startswith(other) for rule in rules]
+            for trigger in rules_by_trigger
+        }
+        # Zero-width scan so that overlapping triggers ("no conflict of interest declared"
+        # and the "conflict of interest" inside it) are all reported
+        alternation = trie_pattern(list(rules_by_trigger))
+        self._scanner = re.compile("(?=(" + alternation + "))")
+        self._scanner_ci = re.compile("(?=(" + alternation + "))", re.IGNORECASE)
+
+    def _add_category(self, category: str) -> None:
+        if category not in self.categories:
+            self.categories.append(category)
+
+    def scan(self, text: str) -> Dict[str, List[str]]:
+        """
+        Returns {category: [evidence, ...]} with duplicates removed, in document order.
+        Keyword categories list the matched vocabulary entries as given.
+        """
+        return self.scan_matches(text)[0]
+
+    def scan_matches(self, text: str) -> Tuple[Dict[str, List[str]], List[KeywordMatch]]:
+        """scan() plus every keyword occurrence with its offsets in `text`, for highlighting."""
+        found: Dict[str, Dict[str, None]] = {category: {} for category in self.categories}
+        matches: List[KeywordMatch] = []
+        rule_end: Dict[int, int] = {}
+
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            hits = self._scanner.finditer(lowered)
+        else:
+            # Some characters change length when lowercased; scan the original text instead
+            # so that positions line up
+            hits = self._scanner_ci.finditer(text)
+
+        for hit in hits:
+            pos = hit.start()
+            trigger = hit.group(1).lower()
+            for rule in self._dispatch.get(trigger, ()):
+                if rule.regex is None:
+                    end = pos + len(rule.value)
+                    if rule.stem:
+                        while end < len(text) and is_word_char(text[end]):
+                            end += 1
+                    if on_word_boundaries(text, pos, end):
+                        found[rule.category][rule.value] = None
+                        matches.append(KeywordMatch(keyword=rule.value, label=rule.category, start=pos, end=end))
+                    continue
+
+                start = pos
+                if rule.backward:
+                    local = _EMAIL_LOCAL_PART.search(text, max(0, pos - 64), pos)
+                    if not local:
+                        continue
+                    start = local.start()
+
+                if start < rule_end.get(id(rule), 0):
+                    continue
+                m = rule.regex.match(text, start)
+                if not m:
+                    continue
+                rule_end[id(rule)] = m.end()
+                value = m.group(1) if m.re.groups else m.group(0)
+                found[rule.category][value] = None
+
+        return {category: list(values) for category, values in found.items()}, matches
+
+evidence_engine = EvidenceEngine()
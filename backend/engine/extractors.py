@@ -1,66 +1,59 @@
 import re
-from typing import List, Dict
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+from backend.core.issn import is_valid_issn, looks_like_year_range
+from backend.engine.evidence_engine import EvidenceEngine, evidence_engine, KNOWN_PUBLISHERS
+from backend.engine.keyword_matcher import KeywordMatch, KeywordMatcher
+
+@lru_cache(maxsize=64)
+def keyword_matcher(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    # Ad-hoc keyword lists are compiled once per process, not once per document
+    return KeywordMatcher(keywords)
 
 class EvidenceExtractor:
-    def __init__(self, text: str):
+    def __init__(self, text: str, engine: EvidenceEngine = evidence_engine):
         self.text = text
-        self.lower_text = text.lower()
+        self._engine = engine
+        self._scan: Optional[Dict[str, List[str]]] = None
+        self._matches: List[KeywordMatch] = []
+
+    @property
+    def scan(self) -> Dict[str, List[str]]:
+        # Every evidence category comes from one pass over the text, run on first use
+        if self._scan is None:
+            self._scan, self._matches = self._engine.scan_matches(self.text)
+        return self._scan
+
+    def keyword_matches(self, category: str) -> List[KeywordMatch]:
+        """Occurrences (with offsets into the text) of a keyword category found by the scan."""
+        self.scan  # runs the scan on first use
+        return [match for match in self._matches if match.label == category]
 
     def extract_funding(self) -> List[str]:
-        patterns = [
-            r"funding[:\s]+(.*?)(?:\.|$)",
-            r"supported by[:\s]+(.*?)(?:\.|$)",
-            r"grant[:\s]+(.*?)(?:\.|$)",
-            r"financial support[:\s]+(.*?)(?:\.|$)",
-            r"funded by[:\s]+(.*?)(?:\.|$)",
-            r"funding provided by[:\s]+(.*?)(?:\.|$)"
-        ]
-        evidence = []
-        for p in patterns:
-            matches = re.findall(p, self.text, re.IGNORECASE | re.MULTILINE)
-            evidence.extend(matches)
-        return list(set(evidence))
+        return list(self.scan["funding"])
 
     def extract_coi_statement(self) -> List[str]:
-        patterns = [
-            r"conflict of interest[:\s]+(.*?)(?:\.|$)",
-            r"competing interest[:\s]+(.*?)(?:\.|$)",
-            r"disclosure[:\s]+(.*?)(?:\.|$)",
-            r"declaration of interest[:\s]+(.*?)(?:\.|$)",
-            r"authors declare[:\s]+(.*?)(?:\.|$)",
-            r"no conflict of interest declared",
-            r"no competing interests declared"
-        ]
-        evidence = []
-        for p in patterns:
-            matches = re.findall(p, self.text, re.IGNORECASE | re.MULTILINE)
-            evidence.extend(matches)
-        return list(set(evidence))
+        return list(self.scan["coi_statements"])
 
     def extract_affiliations(self) -> List[str]:
-        # Heuristic: Look for email addresses or "Department of"
-        # This is a simplified version.
-        patterns = [
-            r"((?:Department|Institute|University|Hospital) of [^\n\.]+)",
-            r"([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})"
-        ]
-        evidence = []
-        for p in patterns:
-            matches = re.findall(p, self.text, re.IGNORECASE)
-            evidence.extend(matches)
-        return list(set(evidence))[:10] # Limit to top 10 to avoid noise
+        # Heuristic: "Department of ..."-style lines and email addresses
+        return self.scan["affiliations"][:10] # Limit to top 10 to avoid noise
 
     def check_keywords(self, keywords: List[str]) -> List[str]:
-        found = []
-        for kw in keywords:
-            if kw.lower() in self.lower_text:
-                found.append(kw)
-        return found
+        # Keywords from the engine's vocabularies were already matched during the scan;
+        # any others are matched together in one pass of a cached matcher
+        found = {kw for category in self._engine.keyword_lists for kw in self.scan[category]}
+        other = tuple(kw for kw in keywords if kw not in self._engine.vocabulary)
+        if other:
+            found.update(keyword_matcher(other).keywords(self.text))
+        return [kw.rstrip("*") for kw in keywords if kw.rstrip("*") in found]
 
 class MetadataExtractor:
-    def __init__(self, text: str):
+    def __init__(self, text: str, evidence: Optional[EvidenceExtractor] = None):
         self.text = text
         self.lines = text.split('\n')
+        # Shares the single evidence scan with the scorer when one is passed in
+        self.evidence = evidence or EvidenceExtractor(text)
 
     def extract_metadata(self) -> Dict[str, str]:
         return {
@@ -101,19 +94,20 @@ class MetadataExtractor:
         return "Unknown Title"
 
     def _extract_issn(self) -> str:
-        # Regex for ISSN (XXXX-XXXX)
-        pattern = r"ISSN[:\s]+([0-9]{4}-[0-9]{3}[0-9X])"
-        match = re.search(pattern, self.text, re.IGNORECASE)
-        if match:
-            return match.group(1)
+        # Regex for ISSN (XXXX-XXXX); candidates must pass the ISSN check digit
+        pattern = r"ISSN[:\s]+([0-9]{4}-[0-9]{3}[0-9Xx])"
+        for m in re.findall(pattern, self.text, re.IGNORECASE):
+            if is_valid_issn(m):
+                return m.upper()
         
         # Fallback: just look for the pattern without "ISSN" prefix
-        pattern_loose = r"([0-9]{4}-[0-9]{3}[0-9X])"
+        pattern_loose = r"(?<![0-9])([0-9]{4})-([0-9]{3}[0-9X])(?![0-9])"
         matches = re.findall(pattern_loose, self.text)
-        # Filter out common false positives like years (2020-2021) or pages
-        for m in matches:
-            if not m.startswith('19') and not m.startswith('20'): # Rough heuristic
-                return m
+        # The check digit rejects ~10 in 11 page ranges (e.g. 1123-1131); year ranges
+        # (2020-2021) that happen to pass it are rejected explicitly
+        for first, second in matches:
+            if is_valid_issn(first + second) and not looks_like_year_range(first, second):
+                return f"{first}-{second}"
         return None
 
     def _extract_doi(self) -> str:
@@ -134,9 +128,6 @@ class MetadataExtractor:
         return None
 
     def _extract_publisher(self) -> str:
-        # Look for known publisher names
-        publishers = ["Elsevier", "Springer", "Wiley", "Taylor & Francis", "Sage", "MDPI", "Frontiers", "Hindawi", "IEEE", "ACM"]
-        for pub in publishers:
-            if pub.lower() in self.text.lower():
-                return pub
-        return None
+        # Look for known publisher names (matched during the evidence scan)
+        found = self.evidence.check_keywords(KNOWN_PUBLISHERS)
+        return found[0] if found else None
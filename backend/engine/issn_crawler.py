@@ -0,0 +1,384 @@
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from lxml import etree, html as lxml_html
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urldefrag, urlparse
+from backend.core.issn import is_valid_issn
+import asyncio
+import hashlib
+import heapq
+import httpx
+import json
+import os
+import re
+import tempfile
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X)"
+ISSN_PATTERN = re.compile(r"([0-9]{4}-[0-9]{3}[0-9x])")
+
+# Path/anchor words of pages that usually state the ISSNs, with their priority
+LINK_HINTS = [
+    ("issn", 6), ("journal-info", 5), ("journal info", 5), ("journalinfo", 5),
+    ("about", 4), ("aims", 3), ("scope", 3), ("submission", 2), ("editorial", 1), ("contact", 1),
+]
+# Pages that are many and rarely carry the ISSN (archives, individual articles, accounts)
+LINK_PENALTIES = ("archive", "article", "issue", "volume", "download", "login", "register", "cart")
+SKIPPED_EXTENSIONS = (".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".zip", ".doc", ".docx", ".xml", ".css", ".js")
+
+def _classify_issns(text: str) -> Tuple[Set[str], Set[str], Set[str]]:
+    """(online, print, unlabelled) check-digit valid ISSNs in page text."""
+    text = text.lower()
+    online, printing, unlabelled = set(), set(), set()
+
+    for match in ISSN_PATTERN.finditer(text):
+        issn = match.group(1)
+        if not is_valid_issn(issn):
+            continue  # phone numbers, year ranges, ...
+        context = text[max(0, match.start() - 40): match.start() + 40]
+
+        if "online" in context or "e-issn" in context:
+            online.add(issn.upper())
+        elif "print" in context or "p-issn" in context:
+            printing.add(issn.upper())
+        else:
+            unlabelled.add(issn.upper())
+
+    return online, printing, unlabelled
+
+def extract_issn(text: str) -> Tuple[List[str], List[str]]:
+    """(online, print) ISSNs in page text, classified by the words around each one."""
+    online, printing, unlabelled = _classify_issns(text)
+    return sorted(online), sorted(printing | unlabelled)
+
+@dataclass
+class ParsedPage:
+    text: str
+    links: List[Tuple[str, str]]  # (absolute URL on the same host, anchor text)
+
+def parse_page(html: str, base_url: str) -> ParsedPage:
+    """Visible text and internal links of a page from a single lxml parse."""
+    try:
+        doc = lxml_html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return ParsedPage(text="", links=[])
+
+    etree.strip_elements(doc, "script", "style", "noscript", with_tail=False)
+    domain = urlparse(base_url).netloc
+    links = {}
+    for a in doc.iter("a"):
+        href = a.get("href")
+        if not href:
+            continue
+        full, _ = urldefrag(urljoin(base_url, href.strip()))
+        parsed = urlparse(full)
+        if parsed.scheme not in ("http", "https") or parsed.netloc != domain:
+            continue
+        if parsed.path.lower().endswith(SKIPPED_EXTENSIONS):
+            continue
+        links.setdefault(full, " ".join(a.text_content().split()))
+
+    text = " ".join(chunk.strip() for chunk in doc.itertext() if chunk.strip())
+    return ParsedPage(text=text, links=list(links.items()))
+
+def score_link(url: str, anchor: str) -> int:
+    """How likely a link leads to the page stating the ISSNs (0 = no hint)."""
+    haystack = f"{urlparse(url).path} {anchor}".lower()
+    score = sum(weight for hint, weight in LINK_HINTS if hint in haystack)
+    if any(word in haystack for word in LINK_PENALTIES):
+        score -= 3
+    return score
+
+class LinkFrontier:
+    """
+    Best-first crawl frontier: links with ISSN-ish words in their path or anchor
+    text come first, then shallower links, then discovery order.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[int, int, int, str]] = []
+        self._seen: Set[str] = set()
+        self._counter = 0
+
+    def push(self, url: str, depth: int, anchor: str = "") -> None:
+        if url in self._seen:
+            return
+        self._seen.add(url)
+        self._counter += 1
+        heapq.heappush(self._heap, (-score_link(url, anchor), depth, self._counter, url))
+
+    def pop(self) -> Tuple[str, int]:
+        _, depth, _, url = heapq.heappop(self._heap)
+        return url, depth
+
+    def best_score(self) -> Optional[int]:
+        return -self._heap[0][0] if self._heap else None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+class HostRateLimiter:
+    """
+    Per-host token bucket: each host gets `rate` requests per second with bursts of up
+    to `burst`. Callers over the budget reserve a future slot and sleep until it, so
+    concurrent crawls of one site are spaced out while other hosts proceed.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    async def acquire(self, host: str) -> None:
+        if self.rate <= 0:
+            return
+        now = asyncio.get_running_loop().time()
+        tokens, last = self._buckets.get(host, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - last) * self.rate) - 1
+        self._buckets[host] = (tokens, now)
+        if tokens < 0:
+            await asyncio.sleep(-tokens / self.rate)
+
+class HTTPCache:
+    """
+    On-disk store of fetched pages with their validators (ETag, Last-Modified), one
+    JSON file per URL. Re-runs send conditional GETs and reuse the body on 304.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest[:2], f"{digest}.json")
+
+    def get(self, url: str) -> Optional[dict]:
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url: str, etag: Optional[str], last_modified: Optional[str], body: str) -> None:
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write-then-rename so a crash never leaves a truncated entry behind
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "etag": etag, "last_modified": last_modified, "body": body}, f)
+        os.replace(tmp_path, path)
+
+@dataclass
+class CrawlResult:
+    key: str
+    name: str
+    url: Optional[str]
+    issn_online: List[str] = field(default_factory=list)
+    issn_print: List[str] = field(default_factory=list)
+    pages: int = 0
+    confirmed: bool = False  # stopped early because the ISSNs were found
+    error: Optional[str] = None  # the crawl raised: the result is empty and not checkpointed
+
+class CrawlCheckpoint:
+    """
+    Append-only JSONL of finished journals. A restarted run loads it and skips every
+    key already present, so a crash only loses the journals that were in flight.
+    Journals whose crawl failed are not recorded, so the next run retries them.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done: Dict[str, CrawlResult] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        result = CrawlResult(**json.loads(line))
+                    except (TypeError, ValueError):
+                        continue  # torn last line from a crash
+                    self.done[result.key] = result
+
+    def record(self, result: CrawlResult) -> None:
+        self.done[result.key] = result
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(asdict(result), ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+@dataclass
+class CrawlStats:
+    fetched: int = 0
+    not_modified: int = 0
+    failed: int = 0    # failed page fetches, plus journals whose crawl raised
+    journals: int = 0  # journals with a site crawled
+    pages: int = 0     # pages requested for them, incl. 304s and failures
+    confirmed: int = 0
+
+    @property
+    def pages_per_journal(self) -> float:
+        return round(self.pages / self.journals, 2) if self.journals else 0.0
+
+class ISSNCrawler:
+    """
+    Concurrent ISSN crawler for journal and publisher sites.
+
+    At most `concurrency` requests are in flight overall and each host is limited
+    to `host_rate` requests per second. Each page is parsed once; its internal links go
+    into a LinkFrontier, so "about"/"journal info"/"ISSN" pages are visited first, up
+    to `max_depth` links deep and `page_budget` pages per journal. With `early_exit`
+    a site is left once both an online and a print ISSN are found, or once any ISSN
+    is found and no hinted links remain. Pages go through
+    the optional HTTPCache, and journals finished in a CrawlCheckpoint are skipped.
+    Journals without a URL are looked up with the optional async `resolve_url(name)`.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 16,
+        host_rate: float = 2.0,
+        page_budget: int = 30,
+        max_depth: int = 3,
+        timeout: float = 10.0,
+        cache: Optional[HTTPCache] = None,
+        verify: bool = False,
+        resolve_url: Optional[Callable[[str], Awaitable[Optional[str]]]] = None,
+        early_exit: bool = True
+    ):
+        self.concurrency = concurrency
+        self.page_budget = page_budget
+        self.max_depth = max_depth
+        self.timeout = timeout
+        self.cache = cache
+        self.verify = verify
+        self.resolve_url = resolve_url
+        self.early_exit = early_exit
+        self.limiter = HostRateLimiter(host_rate)
+        self.stats = CrawlStats()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT},
+            timeout=self.timeout,
+            verify=self.verify,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=self.concurrency)
+        )
+
+    async def fetch(self, client: httpx.AsyncClient, url: str) -> Optional[str]:
+        """HTML of a page, or None. Revalidates cached copies instead of re-downloading."""
+        cached = self.cache.get(url) if self.cache else None
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        await self.limiter.acquire(urlparse(url).netloc)
+        async with self._semaphore:
+            try:
+                response = await client.get(url, headers=headers)
+            except (httpx.HTTPError, ValueError):
+                self.stats.failed += 1
+                return None
+
+        if response.status_code == 304 and cached:
+            self.stats.not_modified += 1
+            return cached["body"]
+        if response.status_code != 200 or "html" not in response.headers.get("content-type", "text/html"):
+            self.stats.failed += 1
+            return None
+
+        self.stats.fetched += 1
+        body = response.text
+        if self.cache:
+            self.cache.put(url, response.headers.get("etag"), response.headers.get("last-modified"), body)
+        return body
+
+    async def crawl_site(self, client: httpx.AsyncClient, url: str) -> Tuple[List[str], List[str], int, bool]:
+        """(online ISSNs, print ISSNs, pages fetched, confirmed) for one site."""
+        frontier = LinkFrontier()
+        frontier.push(url, 0)
+        issn_online: Set[str] = set()
+        issn_print: Set[str] = set()
+        pages = 0
+        confirmed = False
+
+        while frontier and pages < self.page_budget:
+            current, depth = frontier.pop()
+            html = await self.fetch(client, current)
+            pages += 1
+            if not html:
+                continue
+
+            page = parse_page(html, current)
+            online_found, print_found, unlabelled = _classify_issns(page.text)
+            issn_online |= online_found
+            issn_print |= print_found | unlabelled
+
+            if depth < self.max_depth:
+                for link, anchor in page.links:
+                    frontier.push(link, depth + 1, anchor)
+
+            if self.early_exit and (issn_online or issn_print):
+                best = frontier.best_score()
+                if (issn_online and issn_print) or best is None or best <= 0:
+                    confirmed = True
+                    break
+
+        return sorted(issn_online), sorted(issn_print), pages, confirmed
+
+    async def crawl(
+        self,
+        journals: Iterable[Tuple[str, str, Optional[str]]],
+        checkpoint: Optional[CrawlCheckpoint] = None
+    ) -> AsyncIterator[CrawlResult]:
+        """
+        Crawls (key, name, url) journals, `concurrency` at a time, yielding results as
+        they finish. Journals left without an http(s) URL yield an empty result, and so
+        do journals whose crawl raised, with `error` set.
+        """
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        pending = [j for j in journals if not (checkpoint and j[0] in checkpoint.done)]
+        results: asyncio.Queue = asyncio.Queue()
+        todo = deque(pending)
+
+        async def crawl_one(client: httpx.AsyncClient, key: str, name: str, url: Optional[str]) -> CrawlResult:
+            if not (url and str(url).startswith("http")) and self.resolve_url:
+                url = await self.resolve_url(name)
+            result = CrawlResult(key=key, name=name, url=url)
+            if url and str(url).startswith("http"):
+                try:
+                    result.issn_online, result.issn_print, result.pages, result.confirmed = await self.crawl_site(client, url)
+                except Exception as e:
+                    print(f"Error crawling {url}: {e}")
+                    result.error = str(e) or e.__class__.__name__
+                    self.stats.failed += 1
+                self.stats.journals += 1
+                self.stats.pages += result.pages
+                self.stats.confirmed += result.confirmed
+            return result
+
+        async def worker(client: httpx.AsyncClient) -> None:
+            try:
+                while todo:
+                    result = await crawl_one(client, *todo.popleft())
+                    if checkpoint and result.error is None:
+                        checkpoint.record(result)
+                    await results.put(result)
+            except Exception as e:
+                await results.put(e)
+
+        async with self._client() as client:
+            workers = [asyncio.create_task(worker(client)) for _ in range(min(self.concurrency, len(pending)))]
+            try:
+                for _ in range(len(pending)):
+                    item = await results.get()
+                    if isinstance(item, Exception):
+                        raise item
+                    yield item
+                await asyncio.gather(*workers)
+            finally:
+                for task in workers:
+                    task.cancel()
@@ -0,0 +1,166 @@
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+from typing import Any, Dict, Optional
+from backend.core.config import settings
+from backend.database.session import SessionLocal, PredatoryReadSessionLocal
+from backend.database.models import AnalysisJob
+from backend.engine.pipeline import analyze_document
+from backend.engine.uploads import StagedUpload
+import os
+import threading
+import uuid
+
+ACTIVE_STATUSES = ("queued", "running")
+FINAL_STATUSES = ("completed", "failed")
+
+class AnalysisJobQueue:
+    """
+    Runs PDF analyses on a local worker pool so request handlers return immediately.
+    Job state lives in the analysis_jobs table (ria.db), which is what the
+    /api/jobs endpoints read, so progress survives across requests and workers.
+    """
+
+    def __init__(self, max_workers: int = settings.ANALYSIS_WORKERS, session_factory: sessionmaker = SessionLocal):
+        self.max_workers = max_workers
+        self.session_factory = session_factory
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Uploads of jobs a worker hasn't picked up yet; shutdown() deletes them
+        self._queued: Dict[str, StagedUpload] = {}
+        self._queued_lock = threading.Lock()
+        # Score and streamed summary of running jobs, before they are persisted.
+        # In memory only: they are progress hints, the analyses table is the record.
+        self._previews: Dict[str, Dict[str, Any]] = {}
+        self._previews_lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        # Created lazily so importing the module (scripts, tests) starts no threads
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="analysis-worker")
+        return self._executor
+
+    def submit(self, db: Session, user_id: int, upload: StagedUpload) -> AnalysisJob:
+        """
+        Records a queued job and hands the upload to a worker. The worker owns the
+        upload from here on and cleans it up when done.
+        """
+        job = self._new_job(user_id, upload)
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        self._enqueue(job.id, upload)
+        return job
+
+    async def asubmit(self, db: AsyncSession, user_id: int, upload: StagedUpload) -> AnalysisJob:
+        """submit() for request handlers on an async session; the worker itself is unchanged."""
+        job = self._new_job(user_id, upload)
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+        self._enqueue(job.id, upload)
+        return job
+
+    def _new_job(self, user_id: int, upload: StagedUpload) -> AnalysisJob:
+        # analysis=None up front: the job has no report yet, and loading it lazily isn't possible on an async session
+        return AnalysisJob(
+            id=uuid.uuid4().hex, user_id=user_id, filename=upload.filename, status="queued", stage="queued",
+            upload_path=upload.path, analysis=None
+        )
+
+    def _enqueue(self, job_id: str, upload: StagedUpload) -> None:
+        with self._queued_lock:
+            self._queued[job_id] = upload
+        self.executor.submit(self._run, job_id)
+
+    def preview(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._previews_lock:
+            values = self._previews.get(job_id)
+            return dict(values) if values else None
+
+    def _update_preview(self, job_id: str, values: Dict[str, Any]) -> None:
+        with self._previews_lock:
+            self._previews.setdefault(job_id, {}).update(values)
+
+    def recover_interrupted(self) -> int:
+        """
+        Marks jobs left queued/running by a previous process as failed and deletes the
+        uploads they had staged on disk (nothing will ever analyze them).
+        """
+        db = self.session_factory()
+        try:
+            active = AnalysisJob.status.in_(ACTIVE_STATUSES)
+            for (path,) in db.query(AnalysisJob.upload_path).filter(active, AnalysisJob.upload_path.isnot(None)):
+                _remove_file(path)
+            count = db.query(AnalysisJob).filter(active).update(
+                {"status": "failed", "error": "Interrupted by a server restart", "upload_path": None},
+                synchronize_session=False
+            )
+            db.commit()
+            return count
+        finally:
+            db.close()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        # Cancelled jobs never reach _run; running ones clean up after themselves.
+        # The rows stay queued and recover_interrupted fails them on the next start.
+        with self._queued_lock:
+            queued, self._queued = self._queued, {}
+        for upload in queued.values():
+            upload.cleanup()
+
+    def _run(self, job_id: str) -> None:
+        with self._queued_lock:
+            upload = self._queued.pop(job_id, None)
+        if upload is None:
+            # Cleaned up by shutdown() while this job was waiting
+            return
+
+        db = self.session_factory()
+        predatory_db = PredatoryReadSessionLocal()
+        try:
+            job = db.get(AnalysisJob, job_id)
+            job.status = "running"
+            db.commit()
+
+            def on_stage(stage: str):
+                job.stage = stage
+                db.commit()
+
+            analysis = analyze_document(
+                upload.source, job.filename, job.user_id, db, predatory_db,
+                on_stage=on_stage, file_hash=upload.sha256,
+                on_partial=lambda values: self._update_preview(job_id, values)
+            )
+
+            job.status = "completed"
+            job.stage = "done"
+            job.analysis_id = analysis.id
+            job.upload_path = None
+            db.commit()
+        except Exception as e:
+            print(f"Analysis job {job_id} failed: {e}")
+            db.rollback()
+            job = db.get(AnalysisJob, job_id)
+            if job:
+                job.status = "failed"
+                job.error = str(e) or e.__class__.__name__
+                job.upload_path = None
+                db.commit()
+        finally:
+            db.close()
+            predatory_db.close()
+            upload.cleanup()
+            with self._previews_lock:
+                self._previews.pop(job_id, None)
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+analysis_jobs = AnalysisJobQueue()
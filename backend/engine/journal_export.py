@@ -0,0 +1,161 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from typing import Any, AsyncIterable, AsyncIterator, List, Optional, Tuple
+from backend.core.config import settings
+from backend.database.models import PredatoryJournal
+import csv
+import hashlib
+import io
+import json
+import zlib
+
+EXPORT_FORMATS = {
+    # format: (media type, file extension)
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "jsonl": ("application/x-ndjson", "jsonl"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+CSV_HEADER = ["Name", "ISSN", "Publisher", "Source", "URL", "Last Updated"]
+CSV_COLUMNS = ["name", "issn", "publisher", "source", "url", "last_updated"]
+RECORD_COLUMNS = ["id", "name", "issn", "publisher", "source", "entity_type", "url", "last_updated"]
+
+async def begin_snapshot(db: AsyncSession) -> AsyncConnection:
+    """
+    The connection db reads predatory_journals through, inside an explicit read
+    transaction, for export_version and iter_export. pysqlite only opens transactions
+    for writes, so without the BEGIN each statement would see the latest commit; with it
+    the ETag and the streamed rows come from one snapshot even if a sync commits in
+    between. Call it before db reads anything; closing db ends the transaction.
+    """
+    conn = await db.connection(bind_arguments={"mapper": PredatoryJournal})
+    await conn.exec_driver_sql("BEGIN")
+    return conn
+
+async def export_version(conn: AsyncConnection) -> Tuple[Optional[datetime], str]:
+    """
+    (last modified, version token) of the predatory_journals table. The row count and
+    max id are part of the token because deleting rows doesn't move max(last_updated).
+    """
+    last_updated, count, max_id = (await conn.execute(
+        select(func.max(PredatoryJournal.last_updated), func.count(PredatoryJournal.id), func.max(PredatoryJournal.id))
+    )).one()
+    if isinstance(last_updated, str):
+        last_updated = datetime.fromisoformat(last_updated)
+    if last_updated is not None and last_updated.tzinfo is None:
+        # SQLite CURRENT_TIMESTAMP is UTC
+        last_updated = last_updated.replace(tzinfo=timezone.utc)
+    token = f"{last_updated.isoformat() if last_updated else ''}:{count}:{max_id}"
+    return last_updated, token
+
+def make_etag(token: str, export_format: str, encoding: str) -> str:
+    digest = hashlib.sha1(f"{token}:{export_format}:{encoding}".encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+async def _iter_batches(columns: List[str], batch_rows: int, conn: AsyncConnection) -> AsyncIterator[List[Any]]:
+    """Rows of predatory_journals in id order, batch_rows at a time, read with a yield_per cursor."""
+    statement = (
+        select(*[getattr(PredatoryJournal, column) for column in columns])
+        .order_by(PredatoryJournal.id)
+        .execution_options(yield_per=batch_rows)
+    )
+    result = await conn.stream(statement)
+    async for partition in result.partitions():
+        yield partition
+
+async def _csv_chunks(batch_rows: int, conn: AsyncConnection) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM for Excel
+    buffer.write("\ufeff")
+    writer.writerow(CSV_HEADER)
+    async for rows in _iter_batches(CSV_COLUMNS, batch_rows, conn):
+        for row in rows:
+            writer.writerow(["" if value is None else str(value) for value in row])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+async def _jsonl_chunks(batch_rows: int, conn: AsyncConnection) -> AsyncIterator[bytes]:
+    async for rows in _iter_batches(RECORD_COLUMNS, batch_rows, conn):
+        lines = [json.dumps(dict(zip(RECORD_COLUMNS, row)), default=str, ensure_ascii=False) for row in rows]
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands out whatever was written since the last take()."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+async def _parquet_chunks(row_group_rows: int, conn: AsyncConnection) -> AsyncIterator[bytes]:
+    # Imported here so the other formats work without pyarrow installed
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [("id", pa.int64())]
+        + [(column, pa.string()) for column in RECORD_COLUMNS[1:-1]]
+        + [("last_updated", pa.timestamp("us"))]
+    )
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="snappy")
+    try:
+        # One row group per batch, streamed out as soon as it is written
+        async for rows in _iter_batches(RECORD_COLUMNS, row_group_rows, conn):
+            columns = list(zip(*rows))
+            writer.write_table(pa.table({name: list(values) for name, values in zip(RECORD_COLUMNS, columns)}, schema=schema))
+            yield sink.take()
+    finally:
+        writer.close()
+    yield sink.take()
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def iter_export(export_format: str, conn: AsyncConnection) -> AsyncIterator[bytes]:
+    """
+    Streams the whole predatory_journals table in the given format, read on conn (see
+    begin_snapshot), which must stay open until the stream is done.
+    """
+    if export_format == "parquet":
+        return _parquet_chunks(settings.EXPORT_PARQUET_ROW_GROUP_ROWS, conn)
+    if export_format == "jsonl":
+        return _jsonl_chunks(settings.EXPORT_BATCH_ROWS, conn)
+    return _csv_chunks(settings.EXPORT_BATCH_ROWS, conn)
+
+async def gzip_chunks(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,134 @@
+from collections import OrderedDict
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional, Tuple
+from backend.database.models import PredatoryJournal
+from backend.engine.predatory_index import predatory_index
+import html
+import re
+import threading
+
+FTS_TABLE = "predatory_journals_fts"  # see backend/scripts/migrate_journal_search.py
+
+# bm25 column weights: name, publisher, issn, domain
+RANK = f"bm25({FTS_TABLE}, 10.0, 5.0, 2.0, 1.0)"
+
+# Control characters as highlight markers, so the text can be HTML-escaped afterwards
+_MARK_START, _MARK_END = "\x02", "\x03"
+# The FTS queries are raw SQL; route them like PredatoryJournal queries on any session
+_PREDATORY_BIND = {"mapper": PredatoryJournal}
+
+JOURNAL_COLUMNS = ["id", "name", "issn", "publisher", "source", "entity_type", "url", "last_updated"]
+
+SEARCH_SQL = f"""
+    SELECT {", ".join("j." + column for column in JOURNAL_COLUMNS)},
+           highlight({FTS_TABLE}, 0, :mark_start, :mark_end) AS name_highlight,
+           highlight({FTS_TABLE}, 1, :mark_start, :mark_end) AS publisher_highlight
+    FROM {FTS_TABLE}
+    JOIN predatory_journals j ON j.id = {FTS_TABLE}.rowid
+    WHERE {FTS_TABLE} MATCH :query
+    ORDER BY {RANK}
+    LIMIT :limit OFFSET :skip
+"""
+
+COUNT_SQL = f"SELECT count(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :query"
+
+def build_fts_query(search: Optional[str]) -> Optional[str]:
+    """
+    Turns free text into an FTS5 prefix query: every word must match the start of a
+    token in any column ("int jour" -> '"int"* "jour"*'). Only word characters are
+    kept, so user input can never inject FTS syntax. None if nothing is searchable.
+    """
+    if not search:
+        return None
+    tokens = re.findall(r"\w+", search.lower())
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+def _highlight_html(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    return html.escape(value).replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+class _CountCache:
+    """
+    Totals per FTS query, valid for one version of the predatory list (see
+    PredatoryJournalIndex.version), so paging and repeated keystrokes don't re-count.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._counts: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, version: str, query: str) -> Optional[int]:
+        with self._lock:
+            count = self._counts.get((version, query))
+            if count is not None:
+                self._counts.move_to_end((version, query))
+            return count
+
+    def put(self, version: str, query: str, count: int) -> None:
+        with self._lock:
+            self._counts[(version, query)] = count
+            while len(self._counts) > self.max_entries:
+                self._counts.popitem(last=False)
+
+_count_cache = _CountCache()
+
+class PredatoryJournalSearch:
+    """Ranked prefix search over predatory.db using the FTS5 index."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def search(self, search: Optional[str], skip: int = 0, limit: int = 50) -> Dict[str, Any]:
+        predatory_index.ensure_fresh(self.db)
+        return self._page(build_fts_query(search), skip, limit)
+
+    @classmethod
+    async def asearch(cls, db: AsyncSession, search: Optional[str], skip: int = 0, limit: int = 50) -> Dict[str, Any]:
+        """search() on an async session: the index refresh awaits, the queries run through run_sync."""
+        await predatory_index.aensure_fresh(db)
+        query = build_fts_query(search)
+        return await db.run_sync(lambda session: cls(session)._page(query, skip, limit))
+
+    def _page(self, query: Optional[str], skip: int, limit: int) -> Dict[str, Any]:
+        version = predatory_index.version
+
+        total = _count_cache.get(version, query or "")
+        if total is None:
+            if query:
+                total = self.db.execute(text(COUNT_SQL), {"query": query}, bind_arguments=_PREDATORY_BIND).scalar()
+            else:
+                total = self.db.query(PredatoryJournal).count()
+            _count_cache.put(version, query or "", total)
+
+        if query:
+            items = self._ranked(query, skip, limit)
+        else:
+            journals = self.db.query(PredatoryJournal).order_by(PredatoryJournal.id).offset(skip).limit(limit).all()
+            items = [{column: getattr(j, column) for column in JOURNAL_COLUMNS} for j in journals]
+
+        return {"total": total, "items": items, "skip": skip, "limit": limit}
+
+    def _ranked(self, query: str, skip: int, limit: int) -> List[Dict[str, Any]]:
+        rows = self.db.execute(text(SEARCH_SQL), {
+            "query": query,
+            "skip": skip,
+            "limit": limit,
+            "mark_start": _MARK_START,
+            "mark_end": _MARK_END,
+        }, bind_arguments=_PREDATORY_BIND).mappings()
+
+        items = []
+        for row in rows:
+            item = {column: row[column] for column in JOURNAL_COLUMNS}
+            item["highlights"] = {
+                "name": _highlight_html(row["name_highlight"]),
+                "publisher": _highlight_html(row["publisher_highlight"]),
+            }
+            items.append(item)
+        return items
@@ -0,0 +1,89 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Union
+import re
+
+def trie_pattern(literals: List[str]) -> str:
+    """
+    Builds a regex alternation shaped like a trie ("fund(?:ed by|ing(?: provided by)?)"),
+    so the regex engine checks one branch per leading character and always takes the
+    longest literal at a position.
+    """
+    trie: Dict = {}
+    for literal in literals:
+        node = trie
+        for ch in literal:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return ("(?:" + body + ")?") if len(branches) == 1 else body + "?"
+        return body
+
+    return build(trie)
+
+def is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+def on_word_boundaries(text: str, start: int, end: int) -> bool:
+    """True if text[start:end] is not glued to letters/digits on either side."""
+    return (start == 0 or not is_word_char(text[start - 1])) and (end >= len(text) or not is_word_char(text[end]))
+
+@dataclass(frozen=True)
+class KeywordMatch:
+    keyword: str  # vocabulary entry as configured (without a trailing "*")
+    label: str    # list the keyword came from
+    start: int
+    end: int      # text[start:end] is the matched word(s), e.g. for highlighting
+
+class KeywordMatcher:
+    """
+    Case-insensitive, word-boundary-aware matcher for one or more keyword lists,
+    compiled once into a single trie-shaped regex.
+
+    "inc" matches "Pharma Inc." but not "including". A trailing "*" makes an entry a
+    stem: "pharma*" matches "Pharma", "pharmaceutical" and "Pharmaceuticals". Matches
+    carry offsets into the scanned text, so callers can highlight evidence without
+    scanning again.
+    """
+
+    def __init__(self, keywords: Union[Iterable[str], Dict[str, Iterable[str]]]):
+        lists = keywords if isinstance(keywords, dict) else {"": keywords}
+        self._exact: Dict[str, List[tuple]] = {}
+        self._stems: Dict[str, List[tuple]] = {}
+        for label, entries in lists.items():
+            for entry in entries:
+                if entry.endswith("*"):
+                    keyword = entry[:-1]
+                    self._stems.setdefault(keyword.lower(), []).append((keyword, label))
+                else:
+                    self._exact.setdefault(entry.lower(), []).append((entry, label))
+
+        branches = []
+        if self._exact:
+            branches.append(f"(?P<exact>{trie_pattern(list(self._exact))})(?!\\w)")
+        if self._stems:
+            branches.append(f"(?P<stem>{trie_pattern(list(self._stems))})\\w*")
+        self._regex: Optional[re.Pattern] = (
+            re.compile(r"(?<!\w)(?:" + "|".join(branches) + ")", re.IGNORECASE) if branches else None
+        )
+
+    def finditer(self, text: str) -> Iterable[KeywordMatch]:
+        if self._regex is None or not text:
+            return
+        for m in self._regex.finditer(text):
+            # The trie patterns have no capturing groups, so lastgroup is the branch that matched
+            table = self._exact if m.lastgroup == "exact" else self._stems
+            for keyword, label in table.get(m.group(m.lastgroup).lower(), ()):
+                yield KeywordMatch(keyword=keyword, label=label, start=m.start(), end=m.end())
+
+    def find_all(self, text: str) -> List[KeywordMatch]:
+        return list(self.finditer(text))
+
+    def keywords(self, text: str) -> List[str]:
+        """Distinct matched keywords in order of first appearance."""
+        return list(dict.fromkeys(match.keyword for match in self.finditer(text)))
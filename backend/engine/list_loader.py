@@ -0,0 +1,138 @@
+from typing import Iterator, Sequence, Tuple
+from backend.core.issn import ISSN_PATTERN
+from backend.core.journal_keys import JournalKey, URL_HOST_PATTERN
+from backend.engine.predatory_ingest import JournalRecord, RECORD_COLUMNS
+import numpy as np
+import pandas as pd
+
+# Raw 2025 lists: no header, column 0 is a running number and column 1 the name
+LIST_WORKBOOKS = [
+    ("RESOURCES/The Predatory Journals List 2025.xlsx", "Journal"),
+    ("RESOURCES/The Predatory Publishers List 2025-2.xlsx", "Publisher"),
+]
+SCRAPED_COLUMNS = ["name", "type", "url", "issn_online", "issn_print"]
+
+ENTITY_TYPES = {"journal": "journal", "journals": "journal", "publisher": "publisher", "publishers": "publisher"}
+_ISSN_WEIGHTS = np.arange(8, 1, -1)
+
+def read_list_workbooks(workbooks: Sequence[Tuple[str, str]] = LIST_WORKBOOKS) -> pd.DataFrame:
+    """
+    name, type, url columns of the raw list workbooks, one read per file. Names are
+    cleaned and exact (type, name) repeats dropped, all as column operations.
+    """
+    frames = []
+    for path, type_label in workbooks:
+        frame = pd.read_excel(path, header=None, usecols=[1], names=["name"], dtype="string")
+        frame["type"] = type_label
+        frames.append(frame)
+    frame = pd.concat(frames, ignore_index=True)
+    frame["name"] = clean_names(frame["name"])
+    frame = frame[frame["name"].notna()].drop_duplicates(["type", "name"], ignore_index=True)
+    frame["url"] = None
+    return frame
+
+def read_scraped_workbook(path: str) -> pd.DataFrame:
+    """The scrape_issn.py output workbook with every column read as text."""
+    frame = pd.read_excel(path, dtype="string")
+    missing = [column for column in SCRAPED_COLUMNS if column not in frame.columns]
+    if missing:
+        raise ValueError(f"Missing column(s) {', '.join(missing)} in {path}")
+    return frame[SCRAPED_COLUMNS]
+
+def clean_names(names: pd.Series) -> pd.Series:
+    """Whitespace-collapsed, trimmed names; empty and missing names become <NA>."""
+    names = names.astype("string").str.replace(r"\s+", " ", regex=True).str.strip()
+    return names.mask(names == "")
+
+def normalize_names(names: pd.Series) -> pd.Series:
+    """Column form of journal_keys.normalize_name."""
+    ascii_names = names.fillna("").str.normalize("NFKD").str.encode("ascii", "ignore").str.decode("ascii")
+    return ascii_names.str.lower().str.replace(r"[^0-9a-z]+", " ", regex=True).str.strip()
+
+def site_keys(urls: pd.Series, entity_types: pd.Series) -> pd.Series:
+    """Column form of journal_keys.site_key for normalized entity types."""
+    hosts = urls.astype("string").str.extract(URL_HOST_PATTERN, expand=False).fillna("")
+    hosts = hosts.str.lower().str.rstrip(".").str.replace(r"^www\.", "", regex=True)
+    return entity_types.astype(str) + ":" + hosts.astype(str)
+
+def normalize_issns(values: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Column form of issn.split_issns on free-form ISSN text: ("1234-5678, 2345-678X"
+    in order of appearance or <NA>, smallest canonical ISSN or ""). Check digits are
+    verified on a NumPy digit matrix instead of one canonicalize_issn call per value.
+    """
+    matches = values.fillna("").astype(str).str.extractall(ISSN_PATTERN.pattern)
+    formatted = pd.Series(pd.NA, index=values.index, dtype="object")
+    keys = pd.Series("", index=values.index, dtype="object")
+    if matches.empty:
+        return formatted, keys
+
+    compact = (matches[0] + matches[1]).str.upper()
+    digits = np.frombuffer("".join(compact.str[:7]).encode("ascii"), dtype=np.uint8).reshape(-1, 7) - ord("0")
+    check = (11 - (digits @ _ISSN_WEIGHTS) % 11) % 11
+    expected = np.where(check == 10, "X", check.astype(str))
+    valid = compact[compact.str[7].to_numpy() == expected]
+
+    # One row per (source row, ISSN) in order of appearance, first occurrence kept
+    found = valid.reset_index(level=1, drop=True)
+    found = found[~found.rename("issn").reset_index().duplicated().to_numpy()]
+    # Wide frame (one column per position) so joining is a few column-wise concatenations
+    wide = found.to_frame("issn").assign(position=found.groupby(level=0).cumcount()).pivot(columns="position", values="issn")
+    smallest = wide[0]
+    joined = wide[0].str[:4] + "-" + wide[0].str[4:]
+    for position in wide.columns[1:]:
+        column = wide[position]
+        smallest = smallest.where(column.isna() | (smallest <= column), column)
+        joined = joined.where(column.isna(), joined + ", " + column.str[:4] + "-" + column.str[4:])
+    keys.loc[wide.index] = smallest
+    formatted.loc[joined.index] = joined
+    return formatted, keys
+
+def normalize_frame(frame: pd.DataFrame, source: str) -> pd.DataFrame:
+    """
+    RECORD_COLUMNS plus name_key/issn_key/site_key for a frame with name, type, url and
+    optionally issn_online/issn_print columns, with the same normalization as
+    JournalRecord.normalized() and one row per natural key (first non-empty value of
+    every column wins, ISSNs of duplicates are kept). Rows without a name are dropped.
+    """
+    out = pd.DataFrame(index=frame.index)
+    out["name"] = clean_names(frame["name"])
+
+    issn_text = pd.Series("", index=frame.index, dtype="object")
+    for column in ("issn_online", "issn_print"):
+        if column in frame.columns:
+            issn_text = issn_text + ", " + frame[column].fillna("").astype(str)
+    out["issn"], out["issn_key"] = normalize_issns(issn_text)
+
+    out["publisher"] = pd.NA
+    out["source"] = source
+    types = frame["type"].astype("string").str.strip().str.lower() if "type" in frame.columns else pd.Series(pd.NA, index=frame.index)
+    out["entity_type"] = types.map(ENTITY_TYPES).fillna(types).fillna("journal")
+    urls = frame["url"].astype("string").str.strip() if "url" in frame.columns else pd.Series(pd.NA, index=frame.index, dtype="string")
+    out["url"] = urls.mask(urls == "")
+    out["name_key"] = normalize_names(out["name"])
+    out["site_key"] = site_keys(out["url"], out["entity_type"]).where(out["issn_key"] == "", "")
+
+    out = out[out["name"].notna() & (out["name_key"] != "")]
+    out.insert(0, "position", np.arange(len(out)))
+    key = ["name_key", "issn_key", "site_key"]
+    repeated = out.duplicated(key, keep=False)
+    if repeated.any():
+        # Only repeated keys need merging; unique rows pass through untouched
+        duplicates = out[repeated]
+        merged = duplicates.groupby(key, sort=False).first()
+        # Duplicates may list different ISSNs for the same key: keep all of them
+        union = duplicates.dropna(subset=["issn"])
+        union = union.assign(issn=union["issn"].str.split(", ")).explode("issn")
+        union = union.drop_duplicates(key + ["issn"]).groupby(key, sort=False)["issn"].agg(", ".join)
+        merged.loc[union.index, "issn"] = union
+        out = pd.concat([out[~repeated], merged.reset_index()]).sort_values("position")
+    return out.reset_index(drop=True)[RECORD_COLUMNS + key]
+
+def iter_keyed_records(frame: pd.DataFrame) -> Iterator[Tuple[JournalKey, JournalRecord]]:
+    """(natural key, JournalRecord) pairs of a normalize_frame() result, for PredatoryIngestor.stage_normalized."""
+    frame = frame.astype(object).where(frame.notna(), None)
+    columns = [frame[column].tolist() for column in RECORD_COLUMNS + ["name_key", "issn_key", "site_key"]]
+    for name, issn, publisher, source, entity_type, url, name_key, issn_key, site_key in zip(*columns):
+        record = JournalRecord(name=name, source=source, issn=issn, publisher=publisher, entity_type=entity_type, url=url)
+        yield (name_key, issn_key, site_key), record
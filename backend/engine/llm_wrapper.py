@@ -1,50 +1,243 @@
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Optional, Dict, Any, Callable, Coroutine, Tuple
+from backend.core.config import settings
+import asyncio
+import hashlib
+import httpx
+import json
 import openai
+import threading
+
+class LLMRuntime:
+    """
+    One background event loop and one AsyncOpenAI client (with its httpx connection
+    pool) per API key / base URL, shared by every summarization. Request handlers, job
+    workers and batch workers all submit coroutines here, so concurrent summaries are
+    multiplexed over a bounded pool of keep-alive connections instead of each upload
+    building its own client.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._clients: Dict[Tuple[str, Optional[str]], openai.AsyncOpenAI] = {}
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        # Started lazily so importing the module (scripts, tests) starts no threads
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-loop", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def client(self, api_key: str, base_url: Optional[str] = None) -> openai.AsyncOpenAI:
+        # Only called from coroutines running on the runtime loop, so no locking needed
+        key = (api_key, base_url)
+        client = self._clients.get(key)
+        if client is None:
+            client = openai.AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                max_retries=0,  # the deadline in LLMWrapper leaves no room for retries
+                http_client=httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=settings.LLM_MAX_CONNECTIONS,
+                        max_keepalive_connections=settings.LLM_MAX_CONNECTIONS
+                    )
+                )
+            )
+            self._clients[key] = client
+        return client
+
+    def submit(self, coro: Coroutine) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine) -> Any:
+        """Runs coro on the shared loop and blocks until it finishes (for worker threads)."""
+        return self.submit(coro).result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+
+        clients = list(self._clients.values())
+        self._clients.clear()
+
+        async def close_clients():
+            for client in clients:
+                await client.close()
+
+        try:
+            asyncio.run_coroutine_threadsafe(close_clients(), loop).result(timeout=5)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+
+class SummaryCache:
+    """
+    LRU cache of generated summaries keyed on a hash of the score, risk level, evidence
+    and triggered rules, i.e. everything the prompt is built from.
+    """
+
+    def __init__(self, max_entries: int = settings.LLM_SUMMARY_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(analysis_result: Dict[str, Any], score: int) -> str:
+        payload = {
+            "score": score,
+            "overall_risk": analysis_result.get("overall_risk"),
+            "evidence": analysis_result.get("evidence", {}),
+            "rules_triggered": analysis_result.get("rules_triggered", []),
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            summary = self._entries.get(key)
+            if summary is not None:
+                self._entries.move_to_end(key)
+            return summary
+
+    def put(self, key: str, summary: str) -> None:
+        with self._lock:
+            self._entries[key] = summary
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+llm_runtime = LLMRuntime()
+summary_cache = SummaryCache()
+
+class Summary(str):
+    """
+    Summary text as returned by LLMWrapper. is_fallback marks the heuristic text used
+    because the LLM call failed or timed out, so callers don't persist or reuse it as
+    if it were the real summary.
+    """
+    is_fallback = False
+
+    @classmethod
+    def fallback(cls, text: str) -> "Summary":
+        summary = cls(text)
+        summary.is_fallback = True
+        return summary
 
 class LLMWrapper:
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        cache: Optional[SummaryCache] = None
+    ):
         self.api_key = api_key
-        if self.api_key:
-            self.client = openai.OpenAI(api_key=self.api_key)
-        else:
-            self.client = None
+        self.base_url = base_url or settings.OPENAI_BASE_URL
+        self.timeout = settings.LLM_TIMEOUT_SECONDS if timeout is None else timeout
+        self.cache = summary_cache if cache is None else cache
 
-    def summarize_risk(self, analysis_result: Dict[str, Any], score: int) -> str:
+    def summarize_risk(
+        self,
+        analysis_result: Dict[str, Any],
+        score: int,
+        on_partial: Optional[Callable[[str], None]] = None
+    ) -> Summary:
         """
         Generates a summary of the risk based on the score and extracted evidence using OpenAI.
+        Blocking wrapper around asummarize_risk for worker threads.
+        """
+        if not self.api_key:
+            return Summary(self._heuristic_summary(score))
+        cached = self.cache.get(SummaryCache.key(analysis_result, score))
+        if cached is not None:
+            return Summary(cached)
+        return llm_runtime.run(self._summarize(analysis_result, score, on_partial))
+
+    async def asummarize_risk(
+        self,
+        analysis_result: Dict[str, Any],
+        score: int,
+        on_partial: Optional[Callable[[str], None]] = None
+    ) -> Summary:
         """
-        if not self.client:
-            return self._heuristic_summary(score)
-        
+        Async version of summarize_risk. Cache hits return immediately; otherwise the
+        summary is streamed, calling on_partial(text_so_far) as tokens arrive (on the
+        LLM loop thread, so keep it cheap). Falls back to the heuristic summary, marked
+        is_fallback, on any error or once LLM_TIMEOUT_SECONDS have passed.
+        """
+        if not self.api_key:
+            return Summary(self._heuristic_summary(score))
+        cached = self.cache.get(SummaryCache.key(analysis_result, score))
+        if cached is not None:
+            return Summary(cached)
+        return await asyncio.wrap_future(llm_runtime.submit(self._summarize(analysis_result, score, on_partial)))
+
+    async def _summarize(self, analysis_result: Dict[str, Any], score: int, on_partial: Optional[Callable[[str], None]]) -> Summary:
         try:
-            prompt = f"""
+            summary = await asyncio.wait_for(
+                self._stream_completion(analysis_result, score, on_partial),
+                timeout=self.timeout or None
+            )
+        except asyncio.TimeoutError:
+            print(f"LLM Error: no summary within {self.timeout}s, using heuristic summary")
+            return Summary.fallback(self._heuristic_summary(score))
+        except Exception as e:
+            print(f"LLM Error: {e}")
+            return Summary.fallback(self._heuristic_summary(score))
+
+        if not summary:
+            return Summary.fallback(self._heuristic_summary(score))
+        self.cache.put(SummaryCache.key(analysis_result, score), summary)
+        return Summary(summary)
+
+    async def _stream_completion(self, analysis_result: Dict[str, Any], score: int, on_partial: Optional[Callable[[str], None]]) -> str:
+        client = llm_runtime.client(self.api_key, self.base_url)
+        stream = await client.chat.completions.create(
+            model=settings.LLM_MODEL,
+            messages=[{"role": "user", "content": self._build_prompt(analysis_result, score)}],
+            max_tokens=150,
+            temperature=0.3,
+            stream=True
+        )
+        parts = []
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                if on_partial:
+                    on_partial("".join(parts))
+        return "".join(parts).strip()
+
+    def _build_prompt(self, analysis_result: Dict[str, Any], score: int) -> str:
+        return f"""
             You are an expert Research Integrity Analyst. Analyze the following conflict-of-interest data extracted from a scientific paper.
-            
+
             Risk Score: {score}/100 (Higher is worse)
             Risk Level: {analysis_result.get('overall_risk', 'unknown')}
-            
+
             Key Evidence Found:
             - Funding: {analysis_result.get('evidence', {}).get('funding', [])}
             - COI Statements: {analysis_result.get('evidence', {}).get('coi_statements', [])}
             - Affiliations: {analysis_result.get('evidence', {}).get('affiliations', [])}
             - Predatory Journal Check: {analysis_result.get('evidence', {}).get('predatory_check', 'Not detected')}
             - Rules Triggered: {analysis_result.get('rules_triggered', [])}
-            
+
             Task:
             Write a concise, professional executive summary (max 3 sentences) explaining why this paper received this score. Focus on the specific evidence found (e.g., commercial funding, missing disclosures). Be objective but firm.
             """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=150,
-                temperature=0.3
-            )
-            return response.choices[0].message.content.strip()
-            
-        except Exception as e:
-            print(f"LLM Error: {e}")
-            return self._heuristic_summary(score)
 
     def _heuristic_summary(self, score: int) -> str:
         if score < 34:
@@ -1,26 +1,232 @@
 import pdfplumber
 import hashlib
-from typing import Tuple
+import io
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_EXCEPTION
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+from backend.core.config import settings
+from backend.engine.evidence_engine import evidence_engine
 
-def extract_text_from_pdf(file_path: str) -> Tuple[str, str]:
+# Bump when a change to extraction alters the text of some documents: cached analyses
+# are only reused when their text was extracted the same way (see extraction_version)
+EXTRACTION_VERSION = 1
+
+def extraction_version() -> str:
     """
-    Extracts text from a PDF file and computes its SHA256 hash.
-    Returns: (full_text, file_hash)
+    Extraction version plus a short sha256 of the settings that decide which pages are
+    read (page budget, lazy mode and its page counts), e.g. "1:3f2a9c0d1e4b5a67".
+    Workers, parallelism and the timeout don't change the text and are left out.
     """
-    sha256_hash = hashlib.sha256()
-    full_text = []
+    config = {"page_budget": settings.PDF_PAGE_BUDGET, "lazy": settings.PDF_LAZY_EXTRACTION}
+    if settings.PDF_LAZY_EXTRACTION:
+        config.update(
+            lazy_min_pages=settings.PDF_LAZY_MIN_PAGES,
+            front_pages=settings.PDF_FRONT_PAGES,
+            back_pages=settings.PDF_BACK_PAGES
+        )
+    digest = hashlib.sha256(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()
+    return f"{EXTRACTION_VERSION}:{digest[:16]}"
+
+class PDFExtractionTimeout(TimeoutError):
+    pass
+
+# A PDF on disk (path) or held in memory (small uploads, see backend.engine.uploads)
+PDFSource = Union[str, bytes]
+
+def _open_pdf(source: PDFSource, **kwargs) -> pdfplumber.PDF:
+    if isinstance(source, bytes):
+        return pdfplumber.open(io.BytesIO(source), **kwargs)
+    return pdfplumber.open(source, **kwargs)
 
-    with open(file_path, "rb") as f:
-        # Read and update hash string value in blocks of 4K
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+def _get_process_pool(workers: int) -> ProcessPoolExecutor:
+    # One pool per process, created on first use and shared by all uploads.
+    # "spawn" because forking a server that already runs worker threads can deadlock.
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return _process_pool
+
+def shutdown_process_pool() -> None:
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+def extraction_workers() -> int:
+    return settings.PDF_EXTRACTION_WORKERS or os.cpu_count() or 1
+
+def compute_file_hash(source: PDFSource) -> str:
+    """
+    Computes the SHA256 hash of a file, reading it in blocks of 4K.
+    """
+    if isinstance(source, bytes):
+        return hashlib.sha256(source).hexdigest()
+    sha256_hash = hashlib.sha256()
+    with open(source, "rb") as f:
         for byte_block in iter(lambda: f.read(4096), b""):
             sha256_hash.update(byte_block)
-            
-    file_hash = sha256_hash.hexdigest()
+    return sha256_hash.hexdigest()
 
-    with pdfplumber.open(file_path) as pdf:
+def _extract_page_range(file_path: str, start: int, end: int) -> List[str]:
+    """
+    Extracts pages [start, end) (0-based). Runs inside pool worker processes, so it
+    opens the document itself instead of receiving page objects.
+    """
+    texts = []
+    with pdfplumber.open(file_path, pages=list(range(start + 1, end + 1))) as pdf:
         for page in pdf.pages:
-            text = page.extract_text()
-            if text:
-                full_text.append(text)
-    
-    return "\n".join(full_text), file_hash
+            texts.append(page.extract_text() or "")
+    return texts
+
+def _page_ranges(pages: range, workers: int) -> List[Tuple[int, int]]:
+    # About two chunks per worker so a slow (figure-heavy) range doesn't leave cores idle
+    chunk = max(1, -(-len(pages) // (workers * 2)))
+    return [(start, min(start + chunk, pages.stop)) for start in range(pages.start, pages.stop, chunk)]
+
+def _deadline(timeout: Optional[float]) -> Optional[float]:
+    return time.monotonic() + timeout if timeout else None
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    if deadline is None:
+        return None
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise PDFExtractionTimeout("PDF extraction exceeded its time limit")
+    return remaining
+
+def _extract_serial(source: PDFSource, pages: Sequence[int], deadline: Optional[float]) -> List[str]:
+    texts = []
+    with _open_pdf(source) as pdf:
+        for i in pages:
+            _remaining(deadline)
+            texts.append(pdf.pages[i].extract_text() or "")
+    return texts
+
+def _extract_parallel(file_path: str, pages: range, workers: int, deadline: Optional[float]) -> List[str]:
+    pool = _get_process_pool(workers)
+    futures = [pool.submit(_extract_page_range, file_path, start, end) for start, end in _page_ranges(pages, workers)]
+    done, pending = wait(futures, timeout=_remaining(deadline), return_when=FIRST_EXCEPTION)
+    if pending:
+        for future in pending:
+            future.cancel()
+        failed = [f for f in done if f.exception()]
+        if failed:
+            raise failed[0].exception()
+        # Ranges already running can't be interrupted; their results are discarded
+        raise PDFExtractionTimeout("PDF extraction exceeded its time limit")
+
+    # Reassemble in page order so the header heuristics in MetadataExtractor still see page 1 first
+    texts = []
+    for future in futures:
+        texts.extend(future.result())
+    return texts
+
+@contextmanager
+def _on_disk(source: PDFSource) -> Iterator[str]:
+    """A path to the PDF: the file itself, or a temp copy of in-memory bytes (removed afterwards)."""
+    if not isinstance(source, bytes):
+        yield source
+        return
+    fd, path = tempfile.mkstemp(prefix="ria_extract_", suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(source)
+        yield path
+    finally:
+        os.remove(path)
+
+def _extract_pages(source: PDFSource, pages: range, parallel: bool, deadline: Optional[float]) -> List[str]:
+    """
+    Text of a contiguous page range, split over the process pool when it is long enough.
+    Worker processes open the document by path, so in-memory uploads are written to a
+    temp file first (one write, cheap next to extracting the pages).
+    """
+    workers = extraction_workers()
+    if parallel and workers > 1 and len(pages) >= settings.PDF_PARALLEL_MIN_PAGES:
+        with _on_disk(source) as path:
+            return _extract_parallel(path, pages, workers, deadline)
+    return _extract_serial(source, pages, deadline)
+
+def _declarations_found(text: str) -> Tuple[bool, bool]:
+    scan = evidence_engine.scan(text)
+    return bool(scan["funding"]), bool(scan["coi_statements"])
+
+def extract_text_lazy(
+    source: PDFSource,
+    page_count: int,
+    page_budget: int = 0,
+    parallel: bool = True,
+    deadline: Optional[float] = None,
+    front_pages: Optional[int] = None,
+    back_pages: Optional[int] = None
+) -> str:
+    """
+    Front matter (title, journal header, affiliations) and back matter (funding, COI and
+    acknowledgement sections usually sit there) first, in-process, with one evidence scan
+    over both. The middle pages are only read when a funding or COI statement is still
+    missing, and then through the process pool like a whole document. Text is returned
+    in document order; a skipped body is simply left out. A page budget is spent on the
+    front and back matter first, then on the middle pages closest to the back.
+    """
+    front_pages = settings.PDF_FRONT_PAGES if front_pages is None else front_pages
+    back_pages = settings.PDF_BACK_PAGES if back_pages is None else back_pages
+    front_end = min(front_pages, page_count)
+    back_start = max(front_end, page_count - back_pages)
+
+    edges = list(range(front_end)) + list(range(back_start, page_count))
+    if page_budget:
+        edges = edges[:page_budget]
+    edge_texts = dict(zip(edges, _extract_serial(source, edges, deadline)))
+    front = [edge_texts[i] for i in range(front_end) if i in edge_texts]
+    back = [edge_texts[i] for i in range(back_start, page_count) if i in edge_texts]
+
+    middle: List[str] = []
+    has_funding, has_coi = _declarations_found("\n".join(front + back))
+    if not (has_funding and has_coi):
+        middle_pages = range(front_end, back_start)
+        if page_budget:
+            budget = max(0, page_budget - len(edges))
+            middle_pages = range(max(front_end, back_start - budget), back_start)
+        if middle_pages:
+            middle = _extract_pages(source, middle_pages, parallel, deadline)
+
+    return "\n".join(text for text in front + middle + back if text)
+
+def extract_text(
+    source: PDFSource,
+    page_budget: Optional[int] = None,
+    timeout: Optional[float] = None,
+    parallel: Optional[bool] = None,
+    lazy: Optional[bool] = None
+) -> str:
+    """
+    Extracts the text of a PDF (path or in-memory bytes), pages in document order.
+    page_budget caps the number of pages extracted and timeout bounds the whole
+    document; both default to the PDF_* settings (0 = no limit). Long documents are
+    split into page ranges extracted by a process pool sized to the host's cores. With lazy extraction enabled, documents
+    of at least PDF_LAZY_MIN_PAGES pages skip their body once the front and back matter
+    hold both declarations (see extract_text_lazy).
+    """
+    page_budget = settings.PDF_PAGE_BUDGET if page_budget is None else page_budget
+    timeout = settings.PDF_EXTRACTION_TIMEOUT if timeout is None else timeout
+    parallel = settings.PDF_PARALLEL_EXTRACTION if parallel is None else parallel
+    lazy = settings.PDF_LAZY_EXTRACTION if lazy is None else lazy
+    deadline = _deadline(timeout)
+
+    with _open_pdf(source) as pdf:
+        page_count = len(pdf.pages)
+
+    if lazy and page_count >= settings.PDF_LAZY_MIN_PAGES:
+        return extract_text_lazy(source, page_count, page_budget=page_budget, parallel=parallel, deadline=deadline)
+
+    if page_budget:
+        page_count = min(page_count, page_budget)
+    texts = _extract_pages(source, range(page_count), parallel, deadline)
+    return "\n".join(text for text in texts if text)
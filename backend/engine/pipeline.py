@@ -0,0 +1,100 @@
+from sqlalchemy.orm import Session
+from typing import Any, Callable, Dict, Optional
+from backend.core.config import settings
+from backend.database.models import Analysis
+from backend.engine.pdf_processor import PDFSource, compute_file_hash, extract_text, extraction_version
+from backend.engine.scorer import COIScorer, scorer_version
+from backend.engine.llm_wrapper import LLMWrapper
+from backend.engine.analysis_cache import AnalysisCache
+from backend.engine.predatory_index import predatory_index
+
+# Progress stages reported to on_stage, in order
+STAGES = ["extract", "score", "summarize", "persist"]
+
+def compute_analysis(
+    source: PDFSource,
+    db: Session,
+    predatory_db: Session,
+    on_stage: Optional[Callable[[str], None]] = None,
+    file_hash: Optional[str] = None,
+    on_partial: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Runs extract -> score -> summarize for a PDF (path or in-memory bytes) and returns the
+    Analysis column values (overall_risk, score, summary, full_result, file_hash,
+    predatory_list_version, scorer_version, extraction_version, summary_fallback) without
+    writing anything. Identical uploads are served from AnalysisCache. Pass file_hash
+    when the caller already hashed the upload.
+    on_partial receives {"score", "overall_risk"} once scoring is done and then
+    {"summary": text_so_far} while the LLM summary streams in.
+    """
+    notify = on_stage or (lambda stage: None)
+    partial = on_partial or (lambda values: None)
+
+    file_hash = file_hash or compute_file_hash(source)
+
+    # Results depend on the predatory list, the scorer and the extraction configuration,
+    # so the cache is keyed on their versions too
+    predatory_index.ensure_fresh(predatory_db)
+    list_version = predatory_index.version
+    rules_version = scorer_version()
+    pages_version = extraction_version()
+
+    if settings.ANALYSIS_CACHE_ENABLED:
+        cached = AnalysisCache(db).lookup(file_hash, list_version, rules_version, pages_version)
+        if cached:
+            return AnalysisCache.result_fields(cached)
+
+    # Process
+    notify("extract")
+    text = extract_text(source)
+
+    # Score
+    notify("score")
+    scorer = COIScorer(text, db=db, predatory_db=predatory_db)
+    result = scorer.compute_score()
+    partial({"score": result["score"], "overall_risk": result["overall_risk"]})
+
+    # Summarize
+    notify("summarize")
+    llm = LLMWrapper(api_key=settings.OPENAI_API_KEY)
+    summary = llm.summarize_risk(result, result["score"], on_partial=lambda text: partial({"summary": text}))
+
+    return {
+        "overall_risk": result["overall_risk"],
+        "score": result["score"],
+        "summary": summary,
+        "full_result": result,
+        "file_hash": file_hash,
+        "predatory_list_version": list_version,
+        "scorer_version": rules_version,
+        "extraction_version": pages_version,
+        # A heuristic stand-in for a failed LLM call is never served from the cache
+        "summary_fallback": summary.is_fallback
+    }
+
+def analyze_document(
+    source: PDFSource,
+    filename: str,
+    user_id: int,
+    db: Session,
+    predatory_db: Session,
+    on_stage: Optional[Callable[[str], None]] = None,
+    file_hash: Optional[str] = None,
+    on_partial: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Analysis:
+    """
+    Runs the analysis pipeline (extract -> score -> summarize -> persist) for a PDF
+    and returns the saved Analysis row.
+    """
+    fields = compute_analysis(source, db, predatory_db, on_stage=on_stage, file_hash=file_hash, on_partial=on_partial)
+
+    # Save to DB
+    if on_stage:
+        on_stage("persist")
+    db_analysis = Analysis(user_id=user_id, filename=filename, **fields)
+    db.add(db_analysis)
+    db.commit()
+    db.refresh(db_analysis)
+
+    return db_analysis
@@ -1,19 +1,24 @@
 from sqlalchemy.orm import Session
-from backend.database.models import PredatoryJournal
-from typing import Dict, Any, Optional
-import re
+from backend.engine.predatory_index import PredatoryJournalIndex, JournalEntry, predatory_index
+from typing import Dict, Any, Optional, Tuple
 
 class PredatoryJournalDetector:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, index: Optional[PredatoryJournalIndex] = None):
         self.db = db
+        # Shared process-wide index; the session is only used to (re)load it
+        self.index = index or predatory_index
 
     def detect(self, metadata: Dict[str, str]) -> Dict[str, Any]:
         """
         Detects if the journal is predatory based on metadata.
-        Returns a dictionary with flags and details.
+        Returns a dictionary with flags and details. Only an ISSN or an exact normalized
+        name/publisher match sets predatory_flag; a fuzzy hit ("International Journal of
+        Advanced Research in Education" ~ "International Journal of Advanced Research")
+        is reported as possible_match, which adds evidence without the critical override.
         """
         result = {
             "predatory_flag": False,
+            "possible_match": False,
             "match_type": "None",
             "sources": [],
             "confidence": 0.0,
@@ -24,6 +29,8 @@ class PredatoryJournalDetector:
         journal_name = metadata.get("journal")
         publisher = metadata.get("publisher")
 
+        self.index.ensure_fresh(self.db)
+
         # Priority 1: ISSN Match
         if issn:
             match = self._match_issn(issn)
@@ -35,66 +42,46 @@ class PredatoryJournalDetector:
                 result["details"] = f"Matched ISSN: {issn} in {match.source}"
                 return result
 
-        # Priority 2: Journal Name Match
+        # Priority 2: exact Journal Name or Publisher match, then either as a fuzzy hit
+        candidates = []
         if journal_name:
-            match = self._match_name(journal_name)
-            if match:
-                result["predatory_flag"] = True
-                result["match_type"] = "Name"
-                result["sources"].append(match.source)
-                result["confidence"] = 0.9 # High confidence for name match
-                result["details"] = f"Matched Journal Name: {journal_name} in {match.source}"
-                return result
-
-        # Priority 3: Publisher Match
+            found = self._match_name(journal_name)
+            if found:
+                candidates.append(("Name", "Journal Name", journal_name, 0.9, found))
         if publisher:
-            match = self._match_publisher(publisher)
-            if match:
-                result["predatory_flag"] = True
-                result["match_type"] = "Publisher"
-                result["sources"].append(match.source)
-                result["confidence"] = 0.8
-                result["details"] = f"Matched Publisher: {publisher} in {match.source}"
-                return result
+            found = self._match_publisher(publisher)
+            if found:
+                candidates.append(("Publisher", "Publisher", publisher, 0.8, found))
+
+        exact = [candidate for candidate in candidates if candidate[4][1] >= 1.0]
+        if candidates:
+            match_type, label, value, weight, (match, similarity) = (exact or candidates)[0]
+            result["predatory_flag"] = bool(exact)
+            result["possible_match"] = not exact
+            result["match_type"] = match_type if exact else f"Possible {match_type}"
+            result["sources"].append(match.source)
+            # High confidence for name match, scaled by similarity
+            result["confidence"] = round(weight * similarity, 3)
+            result["details"] = self._describe(label, value, match, similarity)
 
         return result
 
-    def _match_issn(self, issn: str) -> Optional[PredatoryJournal]:
-        # Normalize ISSN (remove hyphens for comparison if needed, but usually stored with hyphens)
-        return self.db.query(PredatoryJournal).filter(PredatoryJournal.issn == issn).first()
+    def _match_issn(self, issn: str) -> Optional[JournalEntry]:
+        # Canonical, checksum-validated form ("1234-567x" -> "1234567X"); journals with
+        # several ISSNs ("1234-5678, 2345-678X") are indexed under each of them
+        return self.index.lookup_issn(issn)
 
-    def _match_name(self, name: str) -> Optional[PredatoryJournal]:
-        # Normalize name: lowercase, remove punctuation
-        normalized_name = self._normalize_string(name)
-        
-        # Exact match on normalized name (simplified for performance)
-        # In a real production system, we might use fuzzy matching or full-text search
-        # Here we rely on the DB having clean names or doing a ILIKE
-        
-        # Try exact match first
-        match = self.db.query(PredatoryJournal).filter(PredatoryJournal.name == name).first()
-        if match:
-            return match
-            
-        # Try case-insensitive match
-        match = self.db.query(PredatoryJournal).filter(PredatoryJournal.name.ilike(name)).first()
-        return match
+    def _match_name(self, name: str) -> Optional[Tuple[JournalEntry, float]]:
+        # Fuzzy match: abbreviations are expanded ("Intl. J." -> "international journal")
+        # and candidates are ranked by trigram similarity
+        return self.index.match_name(name)
 
-    def _match_publisher(self, publisher: str) -> Optional[PredatoryJournal]:
-        # Check if publisher is in the list (usually we store publishers with a flag or separate table, 
-        # but here we assume they are in the same table with a 'publisher' type or just by name)
-        # For this implementation, we check if the publisher name exists in the DB as a 'publisher' entry
-        # Or if we have a specific 'publisher' column in our PredatoryJournal table that matches.
-        
-        # Assuming the PredatoryJournal table contains both Journals and Publishers (where name is the publisher name)
-        # We can check if the extracted publisher matches any entry known as a publisher.
-        
-        match = self.db.query(PredatoryJournal).filter(PredatoryJournal.name.ilike(publisher)).first()
-        return match
+    def _match_publisher(self, publisher: str) -> Optional[Tuple[JournalEntry, float]]:
+        # Publishers are stored as entries of their own (name == publisher name),
+        # so the extracted publisher is checked against names and the publisher column.
+        return self.index.match_publisher(publisher)
 
-    def _normalize_string(self, s: str) -> str:
-        if not s:
-            return ""
-        s = s.lower()
-        s = re.sub(r'[^\w\s]', '', s)
-        return s.strip()
+    def _describe(self, label: str, value: str, match: JournalEntry, similarity: float) -> str:
+        if similarity >= 1.0:
+            return f"Matched {label}: {value} in {match.source}"
+        return f"Possible match for {label}: {value} ~ {match.name} (similarity {similarity:.2f}) in {match.source}"
@@ -0,0 +1,151 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Any
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from backend.core.config import settings
+from backend.database.models import PredatoryJournal, JournalISSN, PredatoryListState
+from backend.core.issn import canonicalize_issn, split_issns
+from backend.engine.fuzzy_matcher import TrigramMatcher
+import threading
+import time
+
+@dataclass(frozen=True)
+class JournalEntry:
+    """Lightweight, session-independent copy of a PredatoryJournal row."""
+    id: int
+    name: Optional[str]
+    issn: Optional[str]
+    publisher: Optional[str]
+    source: Optional[str]
+    entity_type: Optional[str]
+    url: Optional[str]
+
+class PredatoryJournalIndex:
+    """
+    Process-wide in-memory copy of the predatory_journals table.
+    Rows are loaded once into a canonical-ISSN hash map and trigram name matchers (see
+    fuzzy_matcher.TrigramMatcher) and only reloaded when the table watermark
+    (list_version, row count, max id, max last_updated) changes. The watermark itself is checked
+    at most every `refresh_interval` seconds, so detection during an upload burst
+    does not touch the database.
+    """
+
+    def __init__(self, refresh_interval: float = settings.PREDATORY_INDEX_REFRESH_SECONDS):
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._by_issn: Dict[str, JournalEntry] = {}
+        self._names: TrigramMatcher[JournalEntry] = TrigramMatcher()
+        self._publishers: TrigramMatcher[JournalEntry] = TrigramMatcher()
+        self._watermark: Optional[Tuple[Any, ...]] = None
+        self._checked_at = 0.0
+
+    @property
+    def version(self) -> Optional[str]:
+        """
+        The watermark the index was loaded at as a string (None until loaded). Cached
+        analyses and search totals key on it, so they also expire after writes that
+        don't bump predatory_list_state.list_version (ORM edits, manual SQL).
+        """
+        if self._watermark is None:
+            return None
+        return ":".join(str(part) for part in self._watermark)
+
+    def ensure_fresh(self, db: Session) -> None:
+        if not self._is_stale():
+            return
+        with self._lock:
+            # Another thread may have refreshed while we waited for the lock
+            if not self._is_stale():
+                return
+            watermark = self._read_watermark(db)
+            if watermark != self._watermark:
+                self._load(db)
+                self._watermark = watermark
+            self._checked_at = time.monotonic()
+
+    async def aensure_fresh(self, db: AsyncSession) -> None:
+        """
+        ensure_fresh for async sessions. The thread lock can't be held across an await (a
+        second request on the same event loop would block the loop waiting for it), so
+        concurrent async refreshes aren't deduplicated; each one swaps in a complete index.
+        """
+        if not self._is_stale():
+            return
+        watermark = await db.run_sync(self._read_watermark)
+        if watermark != self._watermark:
+            await db.run_sync(self._load)
+            self._watermark = watermark
+        self._checked_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        # Force a watermark check on the next detection (used after in-process writes)
+        self._checked_at = 0.0
+
+    def lookup_issn(self, issn: str) -> Optional[JournalEntry]:
+        # Single point lookup on the canonical form; invalid check digits never match
+        canonical = canonicalize_issn(issn)
+        if canonical is None:
+            return None
+        return self._by_issn.get(canonical)
+
+    def match_name(self, name: str) -> Optional[Tuple[JournalEntry, float]]:
+        """Best journal name match as (entry, similarity); 1.0 means an exact normalized match."""
+        return self._names.match(name)
+
+    def match_publisher(self, publisher: str) -> Optional[Tuple[JournalEntry, float]]:
+        return self._publishers.match(publisher)
+
+    def _is_stale(self) -> bool:
+        if self._watermark is None:
+            return True
+        return time.monotonic() - self._checked_at >= self.refresh_interval
+
+    def _read_watermark(self, db: Session) -> Tuple[Any, ...]:
+        list_version = db.query(PredatoryListState.list_version).filter(PredatoryListState.id == 1).scalar() or 0
+        row = db.query(
+            func.count(PredatoryJournal.id),
+            func.max(PredatoryJournal.id),
+            func.max(PredatoryJournal.last_updated)
+        ).one()
+        return (list_version, *row)
+
+    def _load(self, db: Session) -> None:
+        by_issn: Dict[str, JournalEntry] = {}
+        names: TrigramMatcher[JournalEntry] = TrigramMatcher(settings.FUZZY_MATCH_MIN_SIMILARITY)
+        publishers: TrigramMatcher[JournalEntry] = TrigramMatcher(settings.FUZZY_MATCH_MIN_SIMILARITY)
+
+        rows = db.query(
+            PredatoryJournal.id,
+            PredatoryJournal.name,
+            PredatoryJournal.issn,
+            PredatoryJournal.publisher,
+            PredatoryJournal.source,
+            PredatoryJournal.entity_type,
+            PredatoryJournal.url
+        ).order_by(PredatoryJournal.id).all()
+
+        entries = [JournalEntry(*row) for row in rows]
+
+        # Canonical ISSNs come from journal_issns; journals without rows there (table not
+        # migrated yet) fall back to parsing the free-form issn column.
+        issns_by_journal: Dict[int, List[str]] = {}
+        for journal_id, issn in db.query(JournalISSN.journal_id, JournalISSN.issn).order_by(JournalISSN.id):
+            issns_by_journal.setdefault(journal_id, []).append(issn)
+
+        # Rows are ordered by id and the first entry per key wins, like the previous .first() queries
+        for entry in entries:
+            for issn in issns_by_journal.get(entry.id) or split_issns(entry.issn):
+                by_issn.setdefault(issn, entry)
+            names.add(entry.name, entry)
+            # Publishers are listed as entries of their own (name == publisher name),
+            # so publisher lookups search names first and then the publisher column.
+            publishers.add(entry.name, entry)
+
+        for entry in entries:
+            publishers.add(entry.publisher, entry)
+
+        # Swap everything in one go so concurrent readers never see a half-built index
+        self._by_issn, self._names, self._publishers = by_issn, names, publishers
+
+predatory_index = PredatoryJournalIndex()
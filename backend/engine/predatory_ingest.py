@@ -0,0 +1,328 @@
+from dataclasses import dataclass, fields, replace
+from sqlalchemy import bindparam, func, or_, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, Optional, Tuple
+from backend.database.models import PredatoryJournal, JournalISSN, PredatoryListState
+from backend.core.issn import format_issn, split_issns
+from backend.core.journal_keys import JournalKey, fold_target, journal_key, site_key
+from backend.engine.predatory_index import predatory_index
+import time
+
+# Columns an ingested record can set; everything else is managed by the database
+RECORD_COLUMNS = ["name", "issn", "publisher", "source", "entity_type", "url"]
+# Columns a later record may change (the display name of a key stays the first one seen)
+MERGED_COLUMNS = ["issn", "publisher", "source", "entity_type", "url"]
+
+@dataclass(frozen=True)
+class JournalRecord:
+    """
+    Source-independent staging format for one predatory journal or publisher.
+    Build one per source row; normalization happens in normalized().
+    """
+    name: str
+    source: str
+    issn: Optional[str] = None
+    publisher: Optional[str] = None
+    entity_type: str = "journal"
+    url: Optional[str] = None
+
+    def normalized(self) -> Optional["JournalRecord"]:
+        """Trimmed, empty strings as None, ISSNs canonical ("1234-5678, 2345-678X"); None if nameless."""
+        values = {}
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if isinstance(value, str):
+                value = value.strip() or None
+            values[f.name] = value
+        if not values["name"]:
+            return None
+        issns = split_issns(values["issn"])
+        if issns:
+            values["issn"] = ", ".join(format_issn(issn) for issn in issns)
+        values["entity_type"] = (values["entity_type"] or "journal").lower()
+        return JournalRecord(**values)
+
+    @property
+    def key(self) -> JournalKey:
+        return journal_key(self.name, self.issn, self.url, self.entity_type)
+
+KeyedRecord = Tuple[JournalKey, JournalRecord]
+
+@dataclass
+class IngestStats:
+    received: int = 0
+    staged: int = 0     # after normalization and in-memory dedupe
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    seconds: float = 0.0
+    skipped: int = 0    # records without a name
+
+    @property
+    def rows_per_second(self) -> float:
+        return round(self.received / self.seconds, 1) if self.seconds > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.received} records ({self.staged} unique): {self.inserted} inserted, "
+            f"{self.updated} updated, {self.unchanged} unchanged, {self.skipped} skipped "
+            f"in {self.seconds:.2f}s ({self.rows_per_second} rows/s)"
+        )
+
+def bump_list_version(db: Session) -> int:
+    """
+    Increments the predatory list version inside the caller's transaction and returns
+    the new value. Every write to predatory_journals that should invalidate cached
+    analyses and search totals goes with exactly one bump.
+    """
+    table = PredatoryListState.__table__
+    statement = sqlite_insert(table).values(id=1, list_version=1)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.id],
+        set_={"list_version": table.c.list_version + 1, "updated_at": func.current_timestamp()}
+    ).returning(table.c.list_version)
+    return db.execute(statement).scalar_one()
+
+def fold_keyless(records: List[KeyedRecord]) -> Tuple[List[KeyedRecord], Dict[JournalKey, JournalKey]]:
+    """
+    Merges the ISSN-less records of a batch into the record of the same name they are
+    the same journal as (journal_keys.fold_target): the only ISSN variant, or for a
+    record without URL host the only one of its type that has one. Returns the folded
+    records and {key of each record folded away: key it was merged into}.
+    """
+    by_name: Dict[str, Dict[JournalKey, JournalRecord]] = {}
+    for key, record in records:
+        by_name.setdefault(key[0], {})[key] = record
+
+    folded: List[KeyedRecord] = []
+    targets: Dict[JournalKey, JournalKey] = {}
+    for group in by_name.values():
+        # Records with a host fold first, so host-less ones follow them
+        for key in sorted((k for k in group if not k[1]), key=lambda k: k[2].endswith(":")):
+            target = fold_target(key, group)
+            if target is not None:
+                group[target] = _merge(group[target], group.pop(key), overwrite=False)
+                targets[key] = target
+        folded.extend(group.items())
+    return folded, targets
+
+def read_list_version(db: Session) -> int:
+    return db.execute(select(PredatoryListState.list_version).where(PredatoryListState.id == 1)).scalar() or 0
+
+def _merge(current: JournalRecord, incoming: JournalRecord, overwrite: bool) -> JournalRecord:
+    changes = {}
+    for column in MERGED_COLUMNS:
+        old, new = getattr(current, column), getattr(incoming, column)
+        if new is not None and (overwrite or old is None):
+            changes[column] = new
+    # Two rows for the same journal may list different ISSNs (print/online): keep both
+    issns = list(dict.fromkeys(split_issns(current.issn) + split_issns(incoming.issn)))
+    if issns:
+        changes["issn"] = ", ".join(format_issn(issn) for issn in issns)
+    return replace(current, **changes) if changes else current
+
+class PredatoryIngestor:
+    """
+    Bulk ingestion of predatory journal records from any source into predatory.db.
+
+    Records are normalized and deduplicated in memory on the natural key (normalized
+    name, smallest canonical ISSN, site of ISSN-less records), then applied in batches of
+    INSERT ... ON CONFLICT (name_key, issn_key, site_key) DO UPDATE inside a single transaction.
+    With overwrite=True incoming non-empty values replace stored ones; with
+    overwrite=False they only fill empty columns. ISSNs are always the union of the
+    stored and incoming ones. Rows whose values don't change are
+    not touched, so last_updated and the list version stay put.
+    """
+
+    def __init__(self, db: Session, overwrite: bool = True, batch_size: int = 500):
+        self.db = db
+        self.overwrite = overwrite
+        self.batch_size = batch_size
+        self.stats = IngestStats()
+        self._staged: Dict[JournalKey, JournalRecord] = {}
+        self._written_keys: Dict[JournalKey, JournalKey] = {}
+        self._started = time.perf_counter()
+
+    def add(self, record: JournalRecord) -> None:
+        self.stats.received += 1
+        record = record.normalized()
+        if record is None:
+            self.stats.skipped += 1
+            return
+        key = record.key
+        current = self._staged.get(key)
+        self._staged[key] = record if current is None else _merge(current, record, self.overwrite)
+
+    def extend(self, records: Iterable[JournalRecord]) -> None:
+        for record in records:
+            self.add(record)
+
+    def stage_normalized(self, keyed_records: Iterable[KeyedRecord]) -> None:
+        """
+        Stages (natural key, record) pairs that are already normalized and deduplicated,
+        e.g. by the columnar list_loader, skipping the per-record normalization of add().
+        """
+        for key, record in keyed_records:
+            self.stats.received += 1
+            current = self._staged.get(key)
+            self._staged[key] = record if current is None else _merge(current, record, self.overwrite)
+
+    @property
+    def staged(self) -> Dict[JournalKey, JournalRecord]:
+        """Normalized records waiting for apply(), by natural key."""
+        return self._staged
+
+    @property
+    def written_keys(self) -> Dict[JournalKey, JournalKey]:
+        """
+        Natural key of the row each record staged for the last apply() was written to,
+        by staged key: differs for records folded into another record of the same name.
+        """
+        return self._written_keys
+
+    def apply(self, commit: bool = True) -> IngestStats:
+        """
+        Writes the staged records and returns the stats. By default this is its own
+        transaction and bumps the list version when rows changed; with commit=False the
+        writes join the caller's transaction and versioning is left to the caller.
+        """
+        records, targets = fold_keyless(list(self._staged.items()))
+        self._written_keys = {key: targets.get(key, key) for key in self._staged}
+        self.stats.staged = len(records)
+
+        try:
+            existing = self._existing_ids(records)
+            self._attach_issns_to_keyless_rows(records, existing)
+            records = self._union_stored_issns(records, existing)
+
+            touched: List[Tuple[int, Optional[str]]] = []
+            for start in range(0, len(records), self.batch_size):
+                touched.extend(self._upsert(records[start:start + self.batch_size]))
+
+            self._sync_journal_issns(touched)
+            if commit:
+                if touched:
+                    bump_list_version(self.db)
+                self.db.commit()
+        except Exception:
+            if commit:
+                self.db.rollback()
+            raise
+
+        touched_ids = {journal_id for journal_id, _ in touched}
+        existing_ids = set(existing.values())
+        self.stats.updated = len(touched_ids & existing_ids)
+        self.stats.inserted = len(touched_ids - existing_ids)
+        self.stats.unchanged = self.stats.staged - len(touched_ids)
+        self.stats.seconds = time.perf_counter() - self._started
+        self._staged.clear()
+
+        if touched and commit:
+            predatory_index.invalidate()
+        return self.stats
+
+    def _existing_ids(self, records: List[KeyedRecord]) -> Dict[JournalKey, int]:
+        """Ids of stored rows sharing a normalized name with any record, by natural key."""
+        names = sorted({key[0] for key, _ in records})
+        existing: Dict[JournalKey, int] = {}
+        for start in range(0, len(names), self.batch_size):
+            rows = self.db.execute(
+                select(PredatoryJournal.id, PredatoryJournal.name_key, PredatoryJournal.issn_key, PredatoryJournal.site_key)
+                .where(PredatoryJournal.name_key.in_(names[start:start + self.batch_size]))
+            ).all()
+            existing.update({tuple(key): journal_id for journal_id, *key in rows})
+        return existing
+
+    def _attach_issns_to_keyless_rows(self, records: List[KeyedRecord], existing: Dict[JournalKey, int]) -> None:
+        # A stored row without ISSN that now arrives with one (e.g. enrichment) keeps its
+        # id: move it to the new key so the upsert updates it instead of adding a twin.
+        # A name with several ISSN-less rows only moves the one on the record's site
+        keyless: Dict[str, List[JournalKey]] = {}
+        for key in existing:
+            if not key[1]:
+                keyless.setdefault(key[0], []).append(key)
+
+        moves = []
+        for key, record in records:
+            if not key[1] or key in existing:
+                continue
+            candidates = list(keyless.get(key[0], []))
+            if len(candidates) > 1:
+                site = site_key(record.url, record.entity_type)
+                candidates = [candidate for candidate in candidates if candidate[2] == site]
+            if len(candidates) != 1:
+                continue
+            keyless[key[0]].remove(candidates[0])
+            moves.append({"journal_id": existing[candidates[0]], "new_issn_key": key[1]})
+            existing[key] = existing.pop(candidates[0])
+        if moves:
+            self.db.execute(
+                PredatoryJournal.__table__.update()
+                .where(PredatoryJournal.__table__.c.id == bindparam("journal_id"))
+                .values(issn_key=bindparam("new_issn_key"), site_key=""),
+                moves
+            )
+
+    def _union_stored_issns(self, records: List[KeyedRecord], existing: Dict[JournalKey, int]) -> List[KeyedRecord]:
+        # The upsert replaces the issn column, so a source listing only the print ISSN
+        # would drop the online one enrichment added: write the union, stored ones first
+        ids = [existing[key] for key, record in records if key in existing and record.issn]
+        stored: Dict[int, str] = {}
+        for start in range(0, len(ids), self.batch_size):
+            stored.update(self.db.execute(
+                select(PredatoryJournal.id, PredatoryJournal.issn)
+                .where(PredatoryJournal.id.in_(ids[start:start + self.batch_size]), PredatoryJournal.issn.isnot(None))
+            ).all())
+
+        merged = []
+        for key, record in records:
+            current = stored.get(existing.get(key))
+            if current:
+                issns = list(dict.fromkeys(split_issns(current) + split_issns(record.issn)))
+                record = replace(record, issn=", ".join(format_issn(issn) for issn in issns))
+            merged.append((key, record))
+        return merged
+
+    def _upsert(self, records: List[KeyedRecord]) -> List[Tuple[int, Optional[str]]]:
+        rows = []
+        for (name_key, issn_key, site), record in records:
+            row = {column: getattr(record, column) for column in RECORD_COLUMNS}
+            row.update(name_key=name_key, issn_key=issn_key, site_key=site)
+            rows.append(row)
+        # executemany on one statement: SQLAlchemy batches it into multi-row INSERTs
+        # ("insertmanyvalues") and compiles the statement once per process
+        return [(journal_id, issn) for journal_id, issn in self.db.execute(self._upsert_statement(), rows)]
+
+    def _upsert_statement(self):
+        table = PredatoryJournal.__table__
+        statement = sqlite_insert(table)
+        excluded = statement.excluded
+        if self.overwrite:
+            merged = {column: func.coalesce(excluded[column], table.c[column]) for column in MERGED_COLUMNS}
+        else:
+            merged = {column: func.coalesce(table.c[column], excluded[column]) for column in MERGED_COLUMNS}
+        # The staged ISSNs already include the stored ones (_union_stored_issns)
+        merged["issn"] = func.coalesce(excluded.issn, table.c.issn)
+        changed = or_(*[merged[column].is_distinct_from(table.c[column]) for column in MERGED_COLUMNS])
+
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.name_key, table.c.issn_key, table.c.site_key],
+            set_=dict(merged, last_updated=func.current_timestamp()),
+            where=changed
+        ).returning(table.c.id, table.c.issn)
+        return statement
+
+    def _sync_journal_issns(self, touched: List[Tuple[int, Optional[str]]]) -> None:
+        # Core statements bypass the ORM events that maintain journal_issns
+        issn_table = JournalISSN.__table__
+        ids = [journal_id for journal_id, _ in touched]
+        for start in range(0, len(ids), self.batch_size):
+            self.db.execute(issn_table.delete().where(issn_table.c.journal_id.in_(ids[start:start + self.batch_size])))
+        issn_rows = [
+            {"journal_id": journal_id, "issn": issn}
+            for journal_id, raw in touched
+            for issn in split_issns(raw)
+        ]
+        if issn_rows:
+            self.db.execute(issn_table.insert(), issn_rows)
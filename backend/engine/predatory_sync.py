@@ -0,0 +1,178 @@
+from dataclasses import asdict, dataclass, field
+from sqlalchemy import bindparam, select
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, Tuple
+from backend.core.journal_keys import JournalKey, fold_target
+from backend.database.models import PredatoryJournal, JournalISSN
+from backend.engine.predatory_ingest import (
+    JournalRecord, KeyedRecord, PredatoryIngestor, bump_list_version, fold_keyless, read_list_version
+)
+from backend.engine.predatory_index import predatory_index
+import hashlib
+import json
+import time
+
+def record_fingerprint(record: JournalRecord) -> str:
+    """sha256 over a normalized record's fields; equal fingerprints mean nothing to write."""
+    payload = json.dumps(asdict(record), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+@dataclass
+class SyncDelta:
+    # (key of the row to write, record): a changed record without ISSN may update an owned
+    # row that was enriched with one since, under that row's key
+    added: List[KeyedRecord] = field(default_factory=list)
+    changed: List[KeyedRecord] = field(default_factory=list)
+    removed: List[int] = field(default_factory=list)  # predatory_journals ids
+    unchanged: int = 0
+    fingerprints: Dict[JournalKey, str] = field(default_factory=dict)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.changed or self.removed)
+
+@dataclass
+class SyncStats:
+    added: int = 0
+    changed: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    list_version: int = 0
+    seconds: float = 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.added} added, {self.changed} changed, {self.removed} removed, "
+            f"{self.unchanged} unchanged -> list version {self.list_version} in {self.seconds:.2f}s"
+        )
+
+class PredatoryListSync:
+    """
+    Incremental synchronization of predatory.db with complete source feeds.
+
+    The rows a sync owns are those whose `source` is one of `sources`. Every incoming
+    record is fingerprinted and compared with the fingerprint stored when its row was
+    last synced, giving adds, changes and removes (owned rows missing from the feed).
+    Only that delta is written, in one transaction together with one list_version
+    bump, so readers never see a partially applied list and an unchanged feed writes
+    nothing at all. A record without ISSN that matches no owned key belongs to the
+    owned row its key folds into (journal_keys.fold_target), so ISSNs added by
+    enrichment survive the next sync of an unchanged feed.
+    """
+
+    def __init__(self, db: Session, sources: Iterable[str], batch_size: int = 500):
+        self.db = db
+        self.sources = sorted(set(sources))
+        self.batch_size = batch_size
+
+    def diff(self, records: Iterable[JournalRecord]) -> SyncDelta:
+        staging = PredatoryIngestor(self.db, batch_size=self.batch_size)
+        staging.extend(records)
+        # Fingerprint what is written: feed records that fold into one row are one record
+        feed = dict(fold_keyless(list(staging.staged.items()))[0])
+
+        owned: Dict[JournalKey, Tuple[int, str]] = {}
+        rows = self.db.execute(
+            select(
+                PredatoryJournal.id, PredatoryJournal.name_key, PredatoryJournal.issn_key,
+                PredatoryJournal.site_key, PredatoryJournal.source_fingerprint
+            )
+            .where(PredatoryJournal.source.in_(self.sources))
+        )
+        for journal_id, name_key, issn_key, site_key, fingerprint in rows:
+            owned[(name_key, issn_key, site_key)] = (journal_id, fingerprint)
+
+        # Exact keys first, so only rows no record claims are left to fold into
+        matches = {key: key for key in feed if key in owned}
+        unclaimed: Dict[str, List[JournalKey]] = {}
+        for key in owned.keys() - set(matches):
+            unclaimed.setdefault(key[0], []).append(key)
+        for key in feed:
+            if key not in matches:
+                target = fold_target(key, unclaimed.get(key[0], []))
+                if target is not None:
+                    unclaimed[key[0]].remove(target)
+                matches[key] = target
+
+        delta = SyncDelta()
+        for key, record in feed.items():
+            fingerprint = record_fingerprint(record)
+            target = matches[key]
+            if target is None:
+                delta.fingerprints[key] = fingerprint
+                delta.added.append((key, record))
+                continue
+            delta.fingerprints[target] = fingerprint
+            if owned[target][1] != fingerprint:
+                delta.changed.append((target, record))
+            else:
+                delta.unchanged += 1
+
+        delta.removed = sorted(journal_id for key, (journal_id, _) in owned.items() if key not in delta.fingerprints)
+        return delta
+
+    def apply(self, delta: SyncDelta) -> SyncStats:
+        started = time.perf_counter()
+        stats = SyncStats(
+            added=len(delta.added), changed=len(delta.changed),
+            removed=len(delta.removed), unchanged=delta.unchanged
+        )
+        if delta.is_empty:
+            stats.list_version = read_list_version(self.db)
+            stats.seconds = time.perf_counter() - started
+            return stats
+
+        try:
+            self._delete(delta.removed)
+
+            writer = PredatoryIngestor(self.db, overwrite=True, batch_size=self.batch_size)
+            writer.stage_normalized(delta.added + delta.changed)
+            writer.apply(commit=False)
+            # Stored under the key each record's row ended up with, so the next diff matches it
+            self._store_fingerprints({
+                writer.written_keys[key]: fingerprint
+                for key, fingerprint in delta.fingerprints.items() if key in writer.written_keys
+            })
+
+            stats.list_version = bump_list_version(self.db)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        predatory_index.invalidate()
+        stats.seconds = time.perf_counter() - started
+        return stats
+
+    def sync(self, records: Iterable[JournalRecord]) -> SyncStats:
+        started = time.perf_counter()
+        stats = self.apply(self.diff(records))
+        stats.seconds = time.perf_counter() - started
+        return stats
+
+    def _delete(self, ids: List[int]) -> None:
+        # Core deletes bypass the ORM events; the FTS index follows through its triggers
+        journals = PredatoryJournal.__table__
+        issns = JournalISSN.__table__
+        for start in range(0, len(ids), self.batch_size):
+            batch = ids[start:start + self.batch_size]
+            self.db.execute(issns.delete().where(issns.c.journal_id.in_(batch)))
+            self.db.execute(journals.delete().where(journals.c.id.in_(batch)))
+
+    def _store_fingerprints(self, fingerprints: Dict[JournalKey, str]) -> None:
+        if not fingerprints:
+            return
+        journals = PredatoryJournal.__table__
+        self.db.execute(
+            journals.update()
+            .where(
+                journals.c.name_key == bindparam("key_name"),
+                journals.c.issn_key == bindparam("key_issn"),
+                journals.c.site_key == bindparam("key_site")
+            )
+            .values(source_fingerprint=bindparam("fingerprint")),
+            [
+                {"key_name": name_key, "key_issn": issn_key, "key_site": site_key, "fingerprint": fingerprint}
+                for (name_key, issn_key, site_key), fingerprint in fingerprints.items()
+            ]
+        )
@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
-from backend.database.models import PredatoryJournal
+from backend.engine.predatory_index import predatory_index
+from backend.engine.predatory_ingest import PredatoryIngestor, JournalRecord
 import requests
 import csv
 import io
@@ -22,6 +23,9 @@ class PredatoryJournalUpdater:
         # 2. Future: Implement scraping for Beall's list and PredatoryJournals.org
         # count += self._scrape_bealls_list()
         
+        # Make the next detection re-check the table instead of waiting for the refresh interval
+        predatory_index.invalidate()
+
         print(f"Update complete. Added/Updated {count} entries.")
         return count
 
@@ -32,39 +36,11 @@ class PredatoryJournalUpdater:
             {"name": "Waset", "publisher": "Waset", "source": "beall", "url": "https://waset.org/"},
             {"name": "Science Domain International", "publisher": "Science Domain", "source": "beall", "url": ""},
             {"name": "IOSR Journals", "publisher": "IOSR", "source": "beall", "url": ""},
-            {"name": "Fake Predatory Journal", "issn": "1234-5678", "source": "test", "url": "http://fake.com"}
+            {"name": "Fake Predatory Journal", "issn": "1234-5679", "source": "test", "url": "http://fake.com"}
         ]
         
-        added = 0
-        for entry in entries:
-            if self._add_or_update(entry):
-                added += 1
-        return added
-
-    def _add_or_update(self, data: dict) -> bool:
-        # Check if exists by name or ISSN
-        existing = None
-        if data.get("issn"):
-            existing = self.db.query(PredatoryJournal).filter(PredatoryJournal.issn == data["issn"]).first()
-        
-        if not existing and data.get("name"):
-            existing = self.db.query(PredatoryJournal).filter(PredatoryJournal.name == data["name"]).first()
-            
-        if existing:
-            # Update fields if needed
-            existing.source = data["source"]
-            existing.url = data.get("url")
-            existing.publisher = data.get("publisher")
-            # self.db.commit() # Commit batch or single?
-            return False
-        else:
-            new_entry = PredatoryJournal(
-                name=data.get("name"),
-                issn=data.get("issn"),
-                publisher=data.get("publisher"),
-                source=data["source"],
-                url=data.get("url")
-            )
-            self.db.add(new_entry)
-            self.db.commit()
-            return True
+        ingestor = PredatoryIngestor(self.db, overwrite=True)
+        ingestor.extend(JournalRecord(**entry) for entry in entries)
+        stats = ingestor.apply()
+        print(stats)
+        return stats.inserted + stats.updated
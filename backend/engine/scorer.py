@@ -1,12 +1,36 @@
 from backend.engine.extractors import EvidenceExtractor, MetadataExtractor
 from backend.engine.predatory_detector import PredatoryJournalDetector
+from backend.engine.evidence_engine import PROMOTIONAL_KEYWORDS
+from backend.engine.keyword_matcher import KeywordMatch, KeywordMatcher
+from backend.core.config import settings
 from sqlalchemy.orm import Session
 from typing import Dict, Any, List, Tuple
+import hashlib
+import json
+
+# Compiled once per process from the configured lists
+commercial_funding_matcher = KeywordMatcher(settings.COMMERCIAL_FUNDING_KEYWORDS)
+commercial_affiliation_matcher = KeywordMatcher(settings.COMMERCIAL_AFFILIATION_KEYWORDS)
+
+# Bump when the scoring rules or evidence patterns change: cached analyses are only
+# reused when they were scored by the same rules and keyword lists (see scorer_version)
+SCORER_RULES_VERSION = 2
+
+def scorer_version() -> str:
+    """Rules version plus a short sha256 of the configured keyword lists, e.g. "1:3f2a9c0d1e4b5a67"."""
+    keyword_lists = {
+        "commercial_funding": settings.COMMERCIAL_FUNDING_KEYWORDS,
+        "commercial_affiliation": settings.COMMERCIAL_AFFILIATION_KEYWORDS,
+        "promotional": settings.PROMOTIONAL_KEYWORDS,
+        "publishers": settings.KNOWN_PUBLISHERS,
+    }
+    digest = hashlib.sha256(json.dumps(keyword_lists, sort_keys=True).encode("utf-8")).hexdigest()
+    return f"{SCORER_RULES_VERSION}:{digest[:16]}"
 
 class COIScorer:
     def __init__(self, text: str, db: Session = None, predatory_db: Session = None):
         self.extractor = EvidenceExtractor(text)
-        self.metadata_extractor = MetadataExtractor(text)
+        self.metadata_extractor = MetadataExtractor(text, evidence=self.extractor)
         self.db = db
         self.predatory_db = predatory_db
         self.evidence = {}
@@ -26,7 +50,10 @@ class COIScorer:
             "funding": funding,
             "coi_statements": coi_statements,
             "affiliations": affiliations,
-            "metadata": self.metadata
+            "metadata": self.metadata,
+            # Where each keyword was found, for highlighting: "funding"/"affiliations"
+            # offsets are into that evidence item, "text" offsets into the document
+            "keyword_highlights": []
         }
 
         # Calculate Dimension Scores
@@ -90,6 +117,15 @@ class COIScorer:
             "rules_triggered": self.rules_triggered
         }
 
+    def _highlight(self, field: str, index: int, match: KeywordMatch) -> None:
+        self.evidence["keyword_highlights"].append({
+            "field": field,
+            "index": index,
+            "keyword": match.keyword,
+            "start": match.start,
+            "end": match.end
+        })
+
     def _get_risk_level(self, score: int) -> str:
         if score >= 67:
             return "high"
@@ -128,17 +164,16 @@ class COIScorer:
         score = 0
         evidence = []
         rules = []
-        commercial_keywords = ["pharma", "inc", "ltd", "corp", "company", "laboratories"]
         
-        found_commercial = []
-        for f in funding:
-            for kw in commercial_keywords:
-                if kw in f.lower():
-                    found_commercial.append(kw)
+        found_commercial = {}
+        for index, f in enumerate(funding):
+            for match in commercial_funding_matcher.finditer(f):
+                found_commercial[match.keyword] = None
+                self._highlight("funding", index, match)
         
         if found_commercial:
             score += 80
-            evidence.append(f"Funding source contains commercial keywords: {', '.join(set(found_commercial))}")
+            evidence.append(f"Funding source contains commercial keywords: {', '.join(found_commercial)}")
             rules.append("Commercial funding detected -> High Risk")
         elif funding:
             evidence.append("Funding appears to be from non-commercial/public sources.")
@@ -152,13 +187,15 @@ class COIScorer:
         score = 0
         evidence = []
         rules = []
-        commercial_keywords = ["pharma", "inc", "ltd", "corp", "company"]
         
         found_commercial = []
-        for aff in affiliations:
-            if any(kw in aff.lower() for kw in commercial_keywords):
+        for index, aff in enumerate(affiliations):
+            matches = commercial_affiliation_matcher.find_all(aff)
+            if matches:
                 found_commercial.append(aff)
                 score += 60
+            for match in matches:
+                self._highlight("affiliations", index, match)
         
         if found_commercial:
             evidence.append(f"Authors affiliated with commercial entities: {found_commercial[0]}")
@@ -183,6 +220,12 @@ class COIScorer:
                 evidence.append(f"Journal flagged as predatory: {result['details']}")
                 rules.append("Predatory Journal Detected -> High Risk")
                 self.evidence["predatory_check"] = result
+            elif result["possible_match"]:
+                # Fuzzy hits are often a legitimate title containing a listed one: no override
+                score = 50
+                evidence.append(f"Journal resembles a listed predatory journal: {result['details']}")
+                rules.append("Possible predatory journal match -> Medium Risk")
+                self.evidence["predatory_check"] = result
             else:
                 score = 10 
                 evidence.append("Journal not found in predatory database.")
@@ -199,8 +242,9 @@ class COIScorer:
         evidence = []
         rules = []
         
-        promotional = ["groundbreaking", "miracle", "unprecedented", "perfect", "amazing"]
-        found = self.extractor.check_keywords(promotional)
+        found = self.extractor.check_keywords(PROMOTIONAL_KEYWORDS)
+        for match in self.extractor.keyword_matches("promotional"):
+            self._highlight("text", 0, match)
         
         if found:
             score = 40
@@ -0,0 +1,81 @@
+from typing import BinaryIO, Optional
+from backend.core.config import settings
+from backend.engine.pdf_processor import PDFSource
+import hashlib
+import os
+import tempfile
+
+CHUNK_SIZE = 64 * 1024
+
+class UploadTooLarge(ValueError):
+    pass
+
+class StagedUpload:
+    """
+    An uploaded PDF copied out of the request, hashed on the way in.
+    Uploads up to UPLOAD_SPOOL_MAX_BYTES stay in memory; larger ones are written once to
+    a uniquely named temp file. Long in-memory documents are still extracted in parallel:
+    pdf_processor writes them to a temp file for its worker processes.
+    Whoever ends up owning the upload calls cleanup().
+    """
+
+    def __init__(self, filename: str, sha256: str, size: int, data: Optional[bytes] = None, path: Optional[str] = None):
+        self.filename = filename
+        self.sha256 = sha256
+        self.size = size
+        self.data = data
+        self.path = path
+
+    @property
+    def source(self) -> PDFSource:
+        return self.path if self.path is not None else self.data
+
+    def cleanup(self) -> None:
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+        self.data = None
+
+def stage_stream(
+    stream: BinaryIO,
+    filename: str,
+    max_bytes: Optional[int] = None,
+    spool_bytes: Optional[int] = None
+) -> StagedUpload:
+    """
+    Reads stream in chunks, hashing as it goes, and returns a StagedUpload.
+    Raises UploadTooLarge (nothing is left on disk) once more than max_bytes have been read.
+    """
+    max_bytes = settings.UPLOAD_MAX_BYTES if max_bytes is None else max_bytes
+    spool_bytes = settings.UPLOAD_SPOOL_MAX_BYTES if spool_bytes is None else spool_bytes
+
+    sha256 = hashlib.sha256()
+    chunks = []
+    size = 0
+    spill = None
+    path = None
+    try:
+        for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+            size += len(chunk)
+            if max_bytes and size > max_bytes:
+                raise UploadTooLarge(f"Upload exceeds the {max_bytes} byte limit")
+            sha256.update(chunk)
+
+            if spill is None and size > spool_bytes:
+                fd, path = tempfile.mkstemp(prefix="ria_upload_", suffix=".pdf")
+                spill = os.fdopen(fd, "wb")
+                spill.writelines(chunks)
+                chunks = []
+            if spill is not None:
+                spill.write(chunk)
+            else:
+                chunks.append(chunk)
+    except BaseException:
+        if spill is not None:
+            spill.close()
+            os.remove(path)
+        raise
+
+    if spill is not None:
+        spill.close()
+        return StagedUpload(filename, sha256.hexdigest(), size, path=path)
+    return StagedUpload(filename, sha256.hexdigest(), size, data=b"".join(chunks))
@@ -7,8 +7,17 @@ from backend.database import models # Import models to register them with Base
 
 # Create tables
 Base.metadata.create_all(bind=engine)
+# Add columns introduced after the first release to existing databases
+from backend.scripts.migrate_analysis_cache import migrate_analysis_cache
+migrate_analysis_cache()
 from backend.database.session import predatory_engine, PredatoryBase
 PredatoryBase.metadata.create_all(bind=predatory_engine)
+from backend.scripts.migrate_journal_keys import migrate_journal_keys
+migrate_journal_keys()
+from backend.scripts.migrate_predatory_sync import migrate_predatory_sync
+migrate_predatory_sync()
+from backend.scripts.migrate_journal_search import migrate_journal_search
+migrate_journal_search()
 
 app = FastAPI(title=settings.PROJECT_NAME)
 
@@ -28,6 +37,29 @@ app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(analysis.router, prefix="/api", tags=["analysis"])
 app.include_router(data.router, prefix="/api/data", tags=["data"])
 
+from backend.engine.job_queue import analysis_jobs
+from backend.engine.pdf_processor import shutdown_process_pool
+from backend.engine.llm_wrapper import llm_runtime
+from backend.core.security import password_hasher
+from backend.database.session import dispose_async_engines
+
+@app.on_event("startup")
+def recover_analysis_jobs():
+    interrupted = analysis_jobs.recover_interrupted()
+    if interrupted:
+        print(f"Marked {interrupted} interrupted analysis jobs as failed.")
+
+@app.on_event("shutdown")
+def stop_analysis_workers():
+    analysis_jobs.shutdown()
+    shutdown_process_pool()
+    llm_runtime.shutdown()
+    password_hasher.shutdown()
+
+@app.on_event("shutdown")
+async def close_async_connections():
+    await dispose_async_engines()
+
 @app.get("/api/health")
 def health_check():
     return {"status": "ok"}
@@ -42,5 +42,38 @@ class AnalysisResponse(AnalysisBase):
     class Config:
         from_attributes = True
 
+class AnalysisSummary(BaseModel):
+    """History row without full_result; GET /api/history/{id} returns the full report."""
+    id: int
+    filename: str
+    upload_date: datetime
+    overall_risk: str
+    score: int
+    summary: str
+
+    class Config:
+        from_attributes = True
+
+class HistoryPage(BaseModel):
+    items: List[AnalysisSummary]
+    next_cursor: Optional[str] = None  # pass as ?cursor= for the next (older) page
+
+class JobResponse(BaseModel):
+    id: str
+    filename: Optional[str] = None
+    status: str
+    stage: str
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    # Available while the job runs: the score once computed, then the summary as it streams
+    score: Optional[int] = None
+    overall_risk: Optional[str] = None
+    summary: Optional[str] = None
+    analysis: Optional[AnalysisResponse] = None
+
+    class Config:
+        from_attributes = True
+
 class AnalysisRequestURL(BaseModel):
     url: str
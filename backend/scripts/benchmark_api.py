@@ -0,0 +1,224 @@
+import sys
+import os
+import asyncio
+import tempfile
+import time
+import argparse
+import statistics
+import httpx
+from fastapi import APIRouter, Depends, FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import text
+from sqlalchemy.orm import Session, sessionmaker
+
+# Add the project root to the python path so we can import backend modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from backend.api import deps
+from backend.api.api_v1.endpoints import analysis, auth, data
+from backend.core import security
+from backend.core.config import settings
+from backend.core.user_cache import AuthenticatedUser, user_cache
+from backend.database.session import (
+    Base, PredatoryBase, async_session_router, get_async_db, get_async_predatory_read_db, get_db,
+    get_predatory_read_db, session_router
+)
+from backend.database.models import Analysis, User
+from backend.database.sqlite import create_async_sqlite_engine, create_sqlite_engine
+from backend.engine.journal_search import PredatoryJournalSearch
+from backend.engine.predatory_ingest import JournalRecord, PredatoryIngestor
+from backend.scripts.migrate_journal_search import STATEMENTS
+
+PASSWORD = "benchmark password!"
+SEARCHES = ["journal", "international res", "science", "global", "medical"]
+
+def legacy_router() -> APIRouter:
+    # The login/history/search endpoints as they were on the sync sessions, kept as the baseline
+    router = APIRouter()
+
+    @router.post("/api/auth/login")
+    async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+        user = await run_in_threadpool(lambda: db.query(User).filter(User.email == form_data.username).first())
+        if user is None or not await security.password_hasher.averify(form_data.password, user.hashed_password):
+            raise HTTPException(status_code=401, detail="Incorrect email or password")
+        return {"access_token": security.create_access_token(data=security.user_token_data(user)), "token_type": "bearer"}
+
+    @router.get("/api/history")
+    def get_history(db: Session = Depends(get_db), current_user: AuthenticatedUser = Depends(deps.get_current_user)):
+        rows = (
+            db.query(Analysis.id, Analysis.filename, Analysis.upload_date, Analysis.overall_risk, Analysis.score, Analysis.summary)
+            .filter(Analysis.user_id == current_user.id)
+            .order_by(Analysis.upload_date.desc(), Analysis.id.desc())
+            .limit(50)
+            .all()
+        )
+        return {"items": [dict(row._mapping) for row in rows]}
+
+    @router.get("/api/data/predatory-journals")
+    def get_predatory_journals(skip: int = 0, limit: int = 50, search: str = None, db: Session = Depends(get_predatory_read_db)):
+        return PredatoryJournalSearch(db).search(search, skip=skip, limit=min(limit, 200))
+
+    return router
+
+def seed(directory: str, users: int, analyses: int, journals: int):
+    ria_uri = f"sqlite:///{os.path.join(directory, 'ria.db')}"
+    predatory_uri = f"sqlite:///{os.path.join(directory, 'predatory.db')}"
+    ria = create_sqlite_engine(ria_uri)
+    predatory = create_sqlite_engine(predatory_uri)
+    Base.metadata.create_all(bind=ria)
+    PredatoryBase.metadata.create_all(bind=predatory)
+    with predatory.begin() as conn:
+        for statement in STATEMENTS:
+            conn.execute(text(statement))
+
+    hashed_password = security.get_password_hash(PASSWORD)
+    with sessionmaker(bind=ria)() as db:
+        db.add_all(User(email=f"user{i}@example.com", hashed_password=hashed_password) for i in range(users))
+        db.add_all(
+            Analysis(user_id=i % users + 1, filename=f"paper{i}.pdf", overall_risk="low", score=10, summary="ok", full_result={})
+            for i in range(analyses)
+        )
+        db.commit()
+    words = ["International", "Global", "Journal", "Research", "Science", "Medical", "Advanced", "Studies"]
+    with sessionmaker(bind=predatory)() as db:
+        writer = PredatoryIngestor(db)
+        writer.extend(
+            JournalRecord(name=f"{words[i % 8]} {words[i // 8 % 8]} {words[i // 64 % 8]} {i}", source="benchmark")
+            for i in range(journals)
+        )
+        writer.apply()
+    ria.dispose()
+    predatory.dispose()
+    return ria_uri, predatory_uri
+
+def sync_app(ria_uri: str, predatory_uri: str):
+    ria = create_sqlite_engine(ria_uri)
+    predatory_read = create_sqlite_engine(predatory_uri, read_only=True)
+    Session = session_router(ria, predatory_read)
+    PredatorySession = sessionmaker(bind=predatory_read)
+
+    def routed_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def predatory_db():
+        db = PredatorySession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(legacy_router())
+    app.dependency_overrides[get_db] = routed_db
+    app.dependency_overrides[get_predatory_read_db] = predatory_db
+
+    async def close():
+        ria.dispose()
+        predatory_read.dispose()
+    return app, close
+
+def async_app(ria_uri: str, predatory_uri: str):
+    ria = create_async_sqlite_engine(ria_uri)
+    predatory_read = create_async_sqlite_engine(predatory_uri, read_only=True)
+    Session = async_session_router(ria, predatory_read)
+
+    async def routed_db():
+        async with Session() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/api/auth")
+    app.include_router(analysis.router, prefix="/api")
+    app.include_router(data.router, prefix="/api/data")
+    app.dependency_overrides[get_async_db] = routed_db
+    app.dependency_overrides[get_async_predatory_read_db] = routed_db
+
+    async def close():
+        await ria.dispose()
+        await predatory_read.dispose()
+    return app, close
+
+async def run(app, clients: int, seconds: float, users: int, logins: int, searches: int):
+    """
+    `clients` concurrent sessions: each logs in, then loops over a mix of one login,
+    `searches` journal searches and history pages for the rest of a 10-request cycle.
+    """
+    latencies = {"login": [], "history": [], "search": []}
+    errors = [0]
+    deadline = time.perf_counter() + seconds
+
+    async def client(index: int, http: httpx.AsyncClient):
+        credentials = {"username": f"user{index % users}@example.com", "password": PASSWORD}
+        token = (await http.post("/api/auth/login", data=credentials)).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        step = 0
+        while time.perf_counter() < deadline:
+            slot = step % 10
+            start = time.perf_counter()
+            if slot < logins:
+                kind, response = "login", await http.post("/api/auth/login", data=credentials)
+            elif slot < logins + searches:
+                params = {"search": SEARCHES[step % len(SEARCHES)], "limit": 20}
+                kind, response = "search", await http.get("/api/data/predatory-journals", params=params)
+            else:
+                kind, response = "history", await http.get("/api/history", headers=headers)
+            if response.status_code == 200:
+                latencies[kind].append(time.perf_counter() - start)
+            else:
+                errors[0] += 1
+            step += 1
+
+    # Unhandled errors (e.g. pool timeouts) come back as 500s and are counted, not raised
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as http:
+        start = time.perf_counter()
+        await asyncio.gather(*(client(index, http) for index in range(clients)))
+        elapsed = time.perf_counter() - start
+
+    every = sorted(value for values in latencies.values() for value in values)
+    result = {"requests/s": len(every) / elapsed, "p50 ms": statistics.median(every) * 1000, "p99 ms": every[int(len(every) * 0.99)] * 1000}
+    for kind, values in latencies.items():
+        result[f"{kind} p50"] = statistics.median(values) * 1000 if values else 0.0
+    result["errors"] = errors[0]
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Requests/s of a mixed login/history/search workload, sync vs async endpoints.")
+    parser.add_argument("--clients", type=int, default=32, help="Concurrent API clients")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Duration of each run")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--analyses", type=int, default=20000, help="Seeded history rows")
+    parser.add_argument("--journals", type=int, default=5000, help="Seeded predatory journals")
+    parser.add_argument("--logins", type=int, default=1, help="Logins per 10 requests")
+    parser.add_argument("--searches", type=int, default=3, help="Searches per 10 requests")
+    parser.add_argument("--rounds", type=int, default=4, help="bcrypt rounds (low so hashing doesn't dominate)")
+    args = parser.parse_args()
+
+    settings.PASSWORD_HASH_ROUNDS = args.rounds
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        ria_uri, predatory_uri = seed(directory, args.users, args.analyses, args.journals)
+        for label, factory in (("sync", sync_app), ("async", async_app)):
+            user_cache.clear()
+            app, close = factory(ria_uri, predatory_uri)
+
+            async def measure():
+                try:
+                    return await run(app, args.clients, args.seconds, args.users, args.logins, args.searches)
+                finally:
+                    await close()
+            results.append((label, asyncio.run(measure())))
+    security.password_hasher.shutdown()
+
+    columns = list(results[0][1])
+    print(f"{'endpoints':>9} " + " ".join(f"{column:>12}" for column in columns))
+    for label, values in results:
+        print(f"{label:>9} " + " ".join(f"{values[column]:>12.1f}" for column in columns))
+
+if __name__ == "__main__":
+    main()
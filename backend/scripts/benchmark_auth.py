@@ -0,0 +1,86 @@
+import sys
+import os
+import tempfile
+import time
+import argparse
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from jose import jwt
+
+# Add the project root to the python path so we can import backend modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from backend.api.deps import get_current_user
+from backend.core import security
+from backend.core.config import settings
+from backend.core.user_cache import user_cache
+from backend.database.session import Base
+from backend.database.models import User
+
+def legacy_current_user(token: str, db):
+    # What get_current_user did before the user cache, kept as the baseline
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    return db.query(User).filter(User.email == payload.get("sub")).first()
+
+def dashboards(Session, authenticate, tokens, dashboards: int, requests: int):
+    """`dashboards` threads, each authenticating `requests` calls with its own token and session."""
+    def dashboard(index: int):
+        token = tokens[index % len(tokens)]
+        latencies = []
+        db = Session()
+        try:
+            for _ in range(requests):
+                start = time.perf_counter()
+                authenticate(token, db)
+                latencies.append(time.perf_counter() - start)
+        finally:
+            db.close()
+        return latencies
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=dashboards) as pool:
+        latencies = [value for result in pool.map(dashboard, range(dashboards)) for value in result]
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.95)], len(latencies) / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure get_current_user latency under concurrent dashboards.")
+    parser.add_argument("--users", type=int, default=5000, help="Rows in the users table")
+    parser.add_argument("--dashboards", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=500, help="Authenticated calls per client")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'users.db')}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        with Session() as db:
+            db.add_all(User(email=f"user{i}@example.com", hashed_password="x") for i in range(args.users))
+            db.commit()
+            users = db.query(User).order_by(User.id).limit(args.dashboards).all()
+            email_tokens = [security.create_access_token(data={"sub": user.email}) for user in users]
+            id_tokens = [security.create_access_token(data={"sub": user.email, "uid": user.id}) for user in users]
+
+        ttl = user_cache.ttl
+        runs = [
+            ("legacy ORM", legacy_current_user, email_tokens, 0),
+            ("email", get_current_user, email_tokens, 0),
+            ("user id", get_current_user, id_tokens, 0),
+            ("cached", get_current_user, id_tokens, ttl or 30.0),
+        ]
+        print(f"{'lookup':>12} {'p50 ms':>8} {'p95 ms':>8} {'calls/s':>10}")
+        try:
+            for label, authenticate, tokens, cache_ttl in runs:
+                user_cache.clear()
+                user_cache.ttl = cache_ttl
+                p50, p95, rate = dashboards(Session, authenticate, tokens, args.dashboards, args.requests)
+                print(f"{label:>12} {p50 * 1000:>8.3f} {p95 * 1000:>8.3f} {rate:>10.0f}")
+        finally:
+            user_cache.ttl = ttl
+            engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import sys
+import os
+import time
+import argparse
+
+# Add the project root to the python path so we can import backend modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from backend.engine.evidence_engine import EvidenceEngine
+# The per-pattern extraction that EvidenceEngine replaced, kept as the baseline
+from extraction_reference import legacy_extract, synthetic_paper
+
+def bench(fn, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare legacy per-pattern extraction with the single-pass EvidenceEngine.")
+    parser.add_argument("--file", type=str, help="Plain-text file to benchmark (defaults to synthetic papers)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best time is reported)")
+    args = parser.parse_args()
+
+    engine = EvidenceEngine()
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            documents = [(os.path.basename(args.file), f.read())]
+    else:
+        documents = [(f"{pages} pages", synthetic_paper(pages)) for pages in (10, 40, 200)]
+
+    print(f"{'document':>12} {'chars':>10} {'legacy ms':>10} {'engine ms':>10} {'speedup':>8}")
+    for label, text in documents:
+        legacy = bench(legacy_extract, text, args.repeat)
+        single = bench(engine.scan, text, args.repeat)
+        print(f"{label:>12} {len(text):>10} {legacy * 1000:>10.1f} {single * 1000:>10.1f} {legacy / single:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import sys
+import os
+import random
+import tempfile
+import time
+import argparse
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add the project root to the python path so we can import backend modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from backend.database.session import PredatoryBase
+from backend.database import models  # noqa: F401 (registers the tables)
+from backend.core.issn import issn_check_digit
+from backend.engine.list_loader import LIST_WORKBOOKS, iter_keyed_records, normalize_frame, read_list_workbooks
+from backend.engine.predatory_ingest import JournalRecord, PredatoryIngestor
+
+SOURCE = "scraped_list_2025"
+
+def legacy_stage(df: pd.DataFrame, ingestor: PredatoryIngestor) -> None:
+    # The iterrows loop populate_db.py used before the columnar loader, kept as the baseline
+    for index, row in df.iterrows():
+        issns = []
+        if pd.notna(row["issn_online"]):
+            issns.append(str(row["issn_online"]))
+        if pd.notna(row["issn_print"]):
+            issns.append(str(row["issn_print"]))
+
+        ingestor.add(JournalRecord(
+            name=str(row["name"]),
+            issn=", ".join(issns) if issns else None,
+            source=SOURCE,
+            entity_type=str(row["type"]),
+            url=row["url"] if pd.notna(row["url"]) else None
+        ))
+
+def columnar_stage(df: pd.DataFrame, ingestor: PredatoryIngestor) -> None:
+    ingestor.stage_normalized(iter_keyed_records(normalize_frame(df, source=SOURCE)))
+
+def random_issn(rng: random.Random) -> str:
+    digits = "".join(str(rng.randint(0, 9)) for _ in range(7))
+    return f"{digits[:4]}-{digits[4:]}{issn_check_digit(digits)}"
+
+def scraped_frame(names: pd.DataFrame, scale: int, seed: int = 42) -> pd.DataFrame:
+    """A full_database_with_issn.xlsx-shaped frame built from the list names: ISSNs, URLs, gaps, repeats."""
+    rng = random.Random(seed)
+    rows = []
+    for copy in range(scale):
+        for name, type_ in zip(names["name"], names["type"]):
+            name = name if copy == 0 else f"{name} {copy}"
+            rows.append({
+                "name": f"  {name} " if rng.random() < 0.1 else name,
+                "type": type_,
+                "url": f"https://{abs(hash(name)) % 10**8}.example" if rng.random() < 0.7 else None,
+                "issn_online": random_issn(rng) if rng.random() < 0.5 else None,
+                "issn_print": random_issn(rng) if rng.random() < 0.4 else None,
+            })
+    frame = pd.DataFrame(rows)
+    # A few exact repeats, as scraped lists have
+    return pd.concat([frame, frame.sample(frac=0.02, random_state=seed)], ignore_index=True)
+
+def run(stage, df: pd.DataFrame, directory: str, label: str):
+    engine = create_engine(f"sqlite:///{os.path.join(directory, label + '.db')}")
+    PredatoryBase.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        ingestor = PredatoryIngestor(db, overwrite=False)
+        start = time.perf_counter()
+        stage(df, ingestor)
+        staged = time.perf_counter() - start
+        keys = {key: (record.issn, record.url, record.entity_type) for key, record in ingestor.staged.items()}
+        start = time.perf_counter()
+        stats = ingestor.apply()
+        applied = time.perf_counter() - start
+        return staged, applied, keys, stats
+    finally:
+        db.close()
+        engine.dispose()
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the iterrows ingestion path with the columnar list loader.")
+    parser.add_argument("--scale", type=int, default=5, help="Copies of the 2025 lists in the synthetic workbook")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    names = read_list_workbooks(LIST_WORKBOOKS)
+    print(f"Read {len(names)} list entries in {(time.perf_counter() - start) * 1000:.0f} ms")
+    df = scraped_frame(names, args.scale)
+
+    with tempfile.TemporaryDirectory() as directory:
+        legacy = run(legacy_stage, df, directory, "legacy")
+        columnar = run(columnar_stage, df, directory, "columnar")
+
+    print(f"{'path':>10} {'rows':>8} {'stage ms':>10} {'insert ms':>10} {'rows/s':>10}")
+    for label, (staged, applied, _, stats) in (("iterrows", legacy), ("columnar", columnar)):
+        print(f"{label:>10} {len(df):>8} {staged * 1000:>10.1f} {applied * 1000:>10.1f} {len(df) / (staged + applied):>10.0f}")
+    print(f"staging speedup: {legacy[0] / columnar[0]:.1f}x, inserted {legacy[3].inserted} vs {columnar[3].inserted}")
+    print("same records" if legacy[2] == columnar[2] else "RECORDS DIFFER")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import sys
+import os
+import tempfile
+import threading
+import time
+import argparse
+import statistics
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+# Add the project root to the python path so we can import backend modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from backend.database.session import Base
+from backend.database.models import Analysis, User
+from backend.database.sqlite import create_sqlite_engine
+
+def legacy_engine(uri: str):
+    # How session.py built its engines before the SQLite tuning layer, kept as the baseline
+    return create_engine(uri, connect_args={"check_same_thread": False})
+
+def seed(Session, users: int, analyses: int) -> None:
+    with Session() as db:
+        db.add_all(User(email=f"user{i}@example.com", hashed_password="x") for i in range(users))
+        db.add_all(
+            Analysis(user_id=i % users + 1, filename=f"paper{i}.pdf", overall_risk="low", score=10, summary="ok", full_result={})
+            for i in range(analyses)
+        )
+        db.commit()
+
+def history_page(db, user_id: int):
+    # The query behind GET /api/history (summary columns, newest first)
+    return (
+        db.query(Analysis.id, Analysis.filename, Analysis.upload_date, Analysis.overall_risk, Analysis.score, Analysis.summary)
+        .filter(Analysis.user_id == user_id)
+        .order_by(Analysis.upload_date.desc(), Analysis.id.desc())
+        .limit(50)
+        .all()
+    )
+
+def run(engine, readers: int, seconds: float, payload_kb: int, users: int):
+    """`readers` threads load history pages while one writer commits analyses with a large full_result."""
+    Session = sessionmaker(bind=engine)
+    stop = threading.Event()
+    read_latencies = [[] for _ in range(readers)]
+    commit_latencies = []
+    errors = [0]
+    payload = {"evidence": {"text": "x" * (payload_kb * 1024)}}
+
+    def reader(index: int):
+        with Session() as db:
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    history_page(db, index % users + 1)
+                    db.rollback()  # end the read transaction like a finished request
+                except OperationalError:
+                    db.rollback()
+                    errors[0] += 1
+                    continue
+                read_latencies[index].append(time.perf_counter() - start)
+
+    def writer():
+        with Session() as db:
+            while not stop.is_set():
+                db.add(Analysis(user_id=1, filename="new.pdf", overall_risk="high", score=90, summary="s", full_result=payload))
+                start = time.perf_counter()
+                try:
+                    db.commit()
+                except OperationalError:
+                    db.rollback()
+                    errors[0] += 1
+                    continue
+                commit_latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)] + [threading.Thread(target=writer)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    reads = sorted(value for values in read_latencies for value in values)
+    return {
+        "reads/s": len(reads) / seconds,
+        "read p50": statistics.median(reads) * 1000,
+        "read p99": reads[int(len(reads) * 0.99)] * 1000,
+        "read max": reads[-1] * 1000,
+        "commits/s": len(commit_latencies) / seconds,
+        "errors": errors[0],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent history reads against analysis commits, default vs tuned SQLite engines.")
+    parser.add_argument("--readers", type=int, default=4, help="Concurrent history readers")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each run")
+    parser.add_argument("--payload-kb", type=int, default=2048, help="Size of each committed full_result")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--analyses", type=int, default=20000, help="Seeded history rows")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for label, factory in (("default", legacy_engine), ("tuned", create_sqlite_engine)):
+            engine = factory(f"sqlite:///{os.path.join(directory, label + '.db')}")
+            Base.metadata.create_all(bind=engine)
+            seed(sessionmaker(bind=engine), args.users, args.analyses)
+            results.append((label, run(engine, args.readers, args.seconds, args.payload_kb, args.users)))
+            engine.dispose()
+
+    columns = list(results[0][1])
+    print(f"{'engine':>8} " + " ".join(f"{column:>10}" for column in columns))
+    for label, values in results:
+        print(f"{label:>8} " + " ".join(f"{values[column]:>10.1f}" for column in columns))
+
+if __name__ == "__main__":
+    main()
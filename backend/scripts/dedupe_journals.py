@@ -0,0 +1,64 @@
+import sys
+import os
+
+# Add the parent directory to sys.path to allow imports from backend
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from typing import Dict, List
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker
+from backend.database.session import PredatorySessionLocal
+from backend.database.models import PredatoryJournal
+from backend.core.issn import format_issn, split_issns
+from backend.core.journal_keys import JournalKey, journal_key
+from backend.engine.predatory_ingest import bump_list_version
+from backend.engine.predatory_index import predatory_index
+
+def find_duplicates(db: Session) -> List[List[PredatoryJournal]]:
+    """Groups of journals sharing a natural key, lowest id first."""
+    groups: Dict[JournalKey, List[PredatoryJournal]] = {}
+    for journal in db.execute(select(PredatoryJournal).order_by(PredatoryJournal.id)).scalars():
+        groups.setdefault(journal_key(journal.name, journal.issn, journal.url, journal.entity_type), []).append(journal)
+    return [group for group in groups.values() if len(group) > 1]
+
+def dedupe_journals(apply: bool = False, session_factory: sessionmaker = PredatorySessionLocal) -> int:
+    """
+    Lists journals that share a natural key (migrate_journal_keys keeps them apart with
+    a "#<id>" site_key) and, with apply=True, merges each group into its lowest id: empty
+    columns are filled from the duplicates, ISSNs are combined and the duplicates are
+    deleted, in one transaction with one list version bump. Returns the number of
+    duplicate rows found. Never run automatically.
+    """
+    with session_factory() as db:
+        groups = find_duplicates(db)
+        for keep, *duplicates in groups:
+            print(f"{keep.id} {keep.name!r} ({keep.entity_type}, {keep.url or 'no URL'}) <- {', '.join(str(j.id) for j in duplicates)}")
+        count = sum(len(group) - 1 for group in groups)
+        if not apply or not groups:
+            print(f"{count} duplicate journals." + (" Run with --apply to merge them." if count else ""))
+            return count
+
+        merged = []
+        for keep, *duplicates in groups:
+            values = {"publisher": keep.publisher, "url": keep.url, "issn": split_issns(keep.issn)}
+            for journal in duplicates:
+                values["publisher"] = values["publisher"] or journal.publisher
+                values["url"] = values["url"] or journal.url
+                values["issn"] += split_issns(journal.issn)
+                db.delete(journal)
+            merged.append((keep, values))
+        # Duplicates go first: the kept rows get their plain key back
+        db.flush()
+        for keep, values in merged:
+            keep.publisher, keep.url = values["publisher"], values["url"]
+            keep.issn = ", ".join(format_issn(issn) for issn in dict.fromkeys(values["issn"])) or None
+            keep.name_key, keep.issn_key, keep.site_key = journal_key(keep.name, keep.issn, keep.url, keep.entity_type)
+        bump_list_version(db)
+        db.commit()
+
+    predatory_index.invalidate()
+    print(f"Merged {count} duplicate journals into {len(groups)}.")
+    return count
+
+if __name__ == "__main__":
+    dedupe_journals(apply="--apply" in sys.argv)
@@ -0,0 +1,62 @@
+import sys
+import os
+
+# Add the parent directory to sys.path to allow imports from backend
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import text, inspect
+from backend.database.session import engine as ria_engine
+
+NEW_COLUMNS = {
+    "file_hash": "VARCHAR(64)",
+    "predatory_list_version": "VARCHAR",
+    "scorer_version": "VARCHAR",
+    "extraction_version": "VARCHAR",
+    "summary_fallback": "BOOLEAN",
+}
+
+# Columns added to analysis_jobs after it was introduced
+NEW_JOB_COLUMNS = {
+    "upload_path": "VARCHAR",
+}
+
+NEW_INDEXES = {
+    "ix_analyses_file_hash": "analyses (file_hash)",
+    "ix_analyses_user_id_upload_date": "analyses (user_id, upload_date)",
+}
+
+def migrate_analysis_cache():
+    """
+    Adds the result cache columns (file_hash, predatory_list_version, scorer_version,
+    extraction_version, summary_fallback) and the ix_analyses_file_hash and history (user_id, upload_date)
+    indexes to an existing analyses table in ria.db, and analysis_jobs.upload_path to an
+    existing jobs table.
+    New databases get them from Base.metadata.create_all; main.py also runs this on
+    startup so existing databases keep working. Safe to re-run.
+    """
+    inspector = inspect(ria_engine)
+    if "analyses" not in inspector.get_table_names():
+        print("Table 'analyses' does not exist in ria.db. It will be created on startup.")
+        return
+
+    existing = {col["name"] for col in inspector.get_columns("analyses")}
+    job_columns = None
+    if "analysis_jobs" in inspector.get_table_names():
+        job_columns = {col["name"] for col in inspector.get_columns("analysis_jobs")}
+
+    with ria_engine.connect() as conn:
+        for name, sql_type in NEW_COLUMNS.items():
+            if name not in existing:
+                conn.execute(text(f"ALTER TABLE analyses ADD COLUMN {name} {sql_type}"))
+                print(f"Added column '{name}' to analyses.")
+        for name, sql_type in NEW_JOB_COLUMNS.items():
+            if job_columns is not None and name not in job_columns:
+                conn.execute(text(f"ALTER TABLE analysis_jobs ADD COLUMN {name} {sql_type}"))
+                print(f"Added column '{name}' to analysis_jobs.")
+
+        for name, target in NEW_INDEXES.items():
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {target}"))
+        conn.commit()
+
+if __name__ == "__main__":
+    migrate_analysis_cache()
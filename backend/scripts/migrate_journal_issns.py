@@ -0,0 +1,48 @@
+import sys
+import os
+
+# Add the parent directory to sys.path to allow imports from backend
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import text
+from backend.database.session import predatory_engine, PredatoryBase
+from backend.database.models import JournalISSN
+from backend.core.issn import split_issns, ISSN_PATTERN
+
+def migrate_journal_issns():
+    """
+    Fills the journal_issns table from the free-form predatory_journals.issn column
+    ("1234-5678, 2345-678X"), one canonical check-digit validated ISSN per row.
+    Safe to re-run: the table is rebuilt from scratch.
+    """
+    print("Starting migration of journal ISSNs...")
+
+    # Creates journal_issns if it does not exist yet
+    PredatoryBase.metadata.create_all(bind=predatory_engine)
+
+    with predatory_engine.connect() as conn:
+        rows = conn.execute(
+            text("SELECT id, issn FROM predatory_journals WHERE issn IS NOT NULL AND issn != ''")
+        ).fetchall()
+        print(f"Found {len(rows)} journals with ISSN data.")
+
+        issn_rows = []
+        rejected = 0
+        for journal_id, raw in rows:
+            valid = split_issns(raw)
+            # Count candidates that look like ISSNs but fail the check digit
+            rejected += len(ISSN_PATTERN.findall(raw)) - len(valid)
+            issn_rows.extend({"journal_id": journal_id, "issn": issn} for issn in valid)
+
+        conn.execute(JournalISSN.__table__.delete())
+        if issn_rows:
+            conn.execute(JournalISSN.__table__.insert(), issn_rows)
+        conn.commit()
+
+    print(f"Inserted {len(issn_rows)} canonical ISSNs.")
+    if rejected:
+        print(f"Skipped {rejected} invalid (check digit) or duplicate ISSNs.")
+    print("ISSN migration complete.")
+
+if __name__ == "__main__":
+    migrate_journal_issns()
@@ -0,0 +1,85 @@
+import sys
+import os
+
+# Add the parent directory to sys.path to allow imports from backend
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from typing import Dict, List
+from sqlalchemy import text, inspect
+from sqlalchemy.engine import Engine
+from backend.database.session import predatory_engine, PredatoryBase
+from backend.database import models  # noqa: F401 (registers the tables)
+from backend.core.journal_keys import JournalKey, journal_key
+from backend.engine.predatory_ingest import bump_list_version
+
+NEW_COLUMNS = {
+    "name_key": "VARCHAR",
+    "issn_key": "VARCHAR(8) NOT NULL DEFAULT ''",
+    "site_key": "VARCHAR NOT NULL DEFAULT ''",
+}
+KEY_INDEX = "uq_predatory_journals_journal_key"
+OLD_KEY_INDEXES = ["uq_predatory_journals_name_key_issn_key"]
+
+def migrate_journal_keys(engine: Engine = predatory_engine):
+    """
+    Adds the natural key columns (name_key, issn_key, site_key) to an existing
+    predatory_journals table in predatory.db, backfills them, bumps the list version and
+    creates the unique index bulk ingestion upserts on. Nothing is deleted: a row that
+    duplicates an earlier row's key is reported and keeps its data, its site_key gets a
+    "#<id>" suffix so the index can still be created. backend/scripts/dedupe_journals.py
+    merges such rows on request. New databases get all of this from
+    PredatoryBase.metadata.create_all; main.py runs this on startup. Safe to re-run.
+    """
+    inspector = inspect(engine)
+    if "predatory_journals" not in inspector.get_table_names():
+        print("Table 'predatory_journals' does not exist in predatory.db. It will be created on startup.")
+        return
+
+    existing = {col["name"] for col in inspector.get_columns("predatory_journals")}
+    indexes = {index["name"] for index in inspector.get_indexes("predatory_journals")}
+    if set(NEW_COLUMNS) <= existing and KEY_INDEX in indexes:
+        return
+
+    # Creates journal_issns and predatory_list_state if they do not exist yet
+    PredatoryBase.metadata.create_all(bind=engine)
+
+    with engine.connect() as conn:
+        for name, sql_type in NEW_COLUMNS.items():
+            if name not in existing:
+                conn.execute(text(f"ALTER TABLE predatory_journals ADD COLUMN {name} {sql_type}"))
+                print(f"Added column '{name}' to predatory_journals.")
+        for index in OLD_KEY_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {index}"))
+
+        rows = conn.execute(text("SELECT id, name, issn, url, entity_type FROM predatory_journals ORDER BY id")).fetchall()
+        keys = []
+        first: Dict[JournalKey, int] = {}
+        duplicates: Dict[JournalKey, List[int]] = {}
+        for journal_id, name, issn, url, entity_type in rows:
+            name_key, issn_key, site_key = key = journal_key(name, issn, url, entity_type)
+            if key in first:
+                duplicates.setdefault(key, [first[key]]).append(journal_id)
+                site_key = f"{site_key}#{journal_id}"
+            else:
+                first[key] = journal_id
+            keys.append({"id": journal_id, "name_key": name_key, "issn_key": issn_key, "site_key": site_key})
+
+        if keys:
+            conn.execute(text(
+                "UPDATE predatory_journals SET name_key = :name_key, issn_key = :issn_key, site_key = :site_key WHERE id = :id"
+            ), keys)
+        conn.execute(text(f"CREATE UNIQUE INDEX IF NOT EXISTS {KEY_INDEX} ON predatory_journals (name_key, issn_key, site_key)"))
+        bump_list_version(conn)
+        conn.commit()
+        print(f"Backfilled natural keys for {len(keys)} journals.")
+
+    for key, ids in duplicates.items():
+        print(f"Journals {', '.join(map(str, ids))} share the key {key}.")
+    if duplicates:
+        print(
+            f"Kept {sum(len(ids) - 1 for ids in duplicates.values())} duplicate journals. "
+            "Review and merge them with: python backend/scripts/dedupe_journals.py [--apply]"
+        )
+
+if __name__ == "__main__":
+    migrate_journal_keys()
@@ -0,0 +1,77 @@
+import sys
+import os
+
+# Add the parent directory to sys.path to allow imports from backend
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import text, inspect
+from backend.database.session import predatory_engine
+
+FTS_TABLE = "predatory_journals_fts"
+
+# Host part of the URL ("https://www.example.com/path" -> "www.example.com") in plain SQL,
+# so the triggers work for every connection, including the sqlite3 shell
+_URL_REST = "CASE WHEN instr({url}, '://') > 0 THEN substr({url}, instr({url}, '://') + 3) ELSE coalesce({url}, '') END"
+_DOMAIN = "lower(CASE WHEN instr({rest}, '/') > 0 THEN substr({rest}, 1, instr({rest}, '/') - 1) ELSE {rest} END)"
+
+def _domain_sql(url: str) -> str:
+    rest = "(" + _URL_REST.format(url=url) + ")"
+    return _DOMAIN.format(rest=rest)
+
+def _issn_sql(issn: str) -> str:
+    # Both "1234-5678" and "12345678" forms, so either spelling matches as a prefix
+    return f"coalesce({issn}, '') || ' ' || replace(coalesce({issn}, ''), '-', '')"
+
+def _row_values(alias: str) -> str:
+    return (
+        f"{alias}.id, {alias}.name, {alias}.publisher, "
+        f"{_issn_sql(alias + '.issn')}, {_domain_sql(alias + '.url')}"
+    )
+
+STATEMENTS = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, publisher, issn, domain,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON predatory_journals BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, name, publisher, issn, domain) VALUES ({_row_values('new')});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON predatory_journals BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF name, publisher, issn, url ON predatory_journals BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+        INSERT INTO {FTS_TABLE} (rowid, name, publisher, issn, domain) VALUES ({_row_values('new')});
+    END""",
+]
+
+def migrate_journal_search(rebuild: bool = False):
+    """
+    Creates the FTS5 search index over predatory_journals (name, publisher, ISSN and URL
+    domain) in predatory.db, plus the triggers that keep it in sync with every write.
+    The index is filled from the existing rows when it is first created (or when
+    rebuild=True). main.py runs this on startup. Safe to re-run.
+    """
+    inspector = inspect(predatory_engine)
+    tables = inspector.get_table_names()
+    if "predatory_journals" not in tables:
+        print("Table 'predatory_journals' does not exist in predatory.db. It will be created on startup.")
+        return
+    created = FTS_TABLE not in tables
+
+    with predatory_engine.connect() as conn:
+        for statement in STATEMENTS:
+            conn.execute(text(statement))
+
+        if created or rebuild:
+            conn.execute(text(f"DELETE FROM {FTS_TABLE}"))
+            conn.execute(text(
+                f"INSERT INTO {FTS_TABLE} (rowid, name, publisher, issn, domain) "
+                f"SELECT {_row_values('j')} FROM predatory_journals j"
+            ))
+            count = conn.execute(text(f"SELECT count(*) FROM {FTS_TABLE}")).scalar()
+            print(f"Indexed {count} predatory journals for search.")
+        conn.commit()
+
+if __name__ == "__main__":
+    migrate_journal_search(rebuild="--rebuild" in sys.argv)
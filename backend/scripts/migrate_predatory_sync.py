@@ -0,0 +1,37 @@
+import sys
+import os
+
+# Add the parent directory to sys.path to allow imports from backend
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import text, inspect
+from backend.database.session import predatory_engine
+
+NEW_COLUMNS = {
+    "source_fingerprint": "VARCHAR(64)",
+}
+
+def migrate_predatory_sync():
+    """
+    Adds the source_fingerprint column incremental list sync compares against to an
+    existing predatory_journals table in predatory.db (predatory_list_state is a new
+    table and comes from PredatoryBase.metadata.create_all). Rows without a
+    fingerprint count as changed on their first sync. main.py runs this on startup.
+    Safe to re-run.
+    """
+    inspector = inspect(predatory_engine)
+    if "predatory_journals" not in inspector.get_table_names():
+        print("Table 'predatory_journals' does not exist in predatory.db. It will be created on startup.")
+        return
+
+    existing = {col["name"] for col in inspector.get_columns("predatory_journals")}
+
+    with predatory_engine.connect() as conn:
+        for name, sql_type in NEW_COLUMNS.items():
+            if name not in existing:
+                conn.execute(text(f"ALTER TABLE predatory_journals ADD COLUMN {name} {sql_type}"))
+                print(f"Added column '{name}' to predatory_journals.")
+        conn.commit()
+
+if __name__ == "__main__":
+    migrate_predatory_sync()
@@ -1,12 +1,15 @@
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
-import re
+import argparse
+import asyncio
 import pandas as pd
+import sys
 import time
 import os
 
-requests.packages.urllib3.disable_warnings()
+# Add the project root to the python path so we can import backend modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from backend.engine.issn_crawler import CrawlCheckpoint, HTTPCache, HostRateLimiter, ISSNCrawler
+from backend.engine.list_loader import LIST_WORKBOOKS, read_list_workbooks
 
 from duckduckgo_search import DDGS
 
@@ -23,197 +26,133 @@ def find_official_url(name):
         print(f"Error searching for {name}: {e}")
     return None
 
+def make_url_resolver(searches_per_second):
+    # DDGS is blocking: run it in a thread, spaced out like the old time.sleep(1)
+    limiter = HostRateLimiter(searches_per_second)
 
-# ---------------------------------------------------
-# 2. Detectar ISSN
-# ---------------------------------------------------
-def extract_issn(text):
-    text = text.lower()
-    issn_pattern = r"([0-9]{4}-[0-9]{3}[0-9x])"
-    candidates = re.findall(issn_pattern, text)
-
-    online = set()
-    printing = set()
-
-    for issn in candidates:
-        idx = text.find(issn.lower())
-        context = text[max(0, idx-40): idx+40]
-
-        if "online" in context or "e-issn" in context:
-            online.add(issn.upper())
-        elif "print" in context or "p-issn" in context:
-            printing.add(issn.upper())
-        else:
-            printing.add(issn.upper())
-
-    return list(online), list(printing)
-
-
-# ---------------------------------------------------
-# 3. Descargar HTML
-# ---------------------------------------------------
-def get_html(url):
-    headers = {"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X)"}
-    try:
-        r = requests.get(url, headers=headers, timeout=10, verify=False)
-        if r.status_code == 200:
-            return r.text
-    except:
-        return None
-    return None
-
-
-# ---------------------------------------------------
-# 4. Extraer enlaces internos
-# ---------------------------------------------------
-def get_internal_links(html, base_url):
-    soup = BeautifulSoup(html, "html.parser")
-    links = set()
-    domain = urlparse(base_url).netloc
-
-    for a in soup.find_all("a", href=True):
-        full = urljoin(base_url, a["href"])
-        if urlparse(full).netloc == domain:
-            links.add(full)
+    async def resolve(name):
+        await limiter.acquire("duckduckgo.com")
+        print(f"\n🔍 Buscando URL oficial para: {name}")
+        url = await asyncio.to_thread(find_official_url, str(name))
+        print(f"➡️  URL encontrada: {url}")
+        return url
 
-    return list(links)
+    return resolve
 
 
 # ---------------------------------------------------
-# 5. Scraping profundo (3 niveles)
+# 2-5. Detectar ISSN, descargar HTML y scraping profundo:
+#      backend.engine.issn_crawler
 # ---------------------------------------------------
-def deep_scrape(url, max_depth=3):
-    visited = set()
-    queue = [(url, 0)]
-    issn_online = set()
-    issn_print = set()
-
-    while queue:
-        current, depth = queue.pop(0)
-
-        if current in visited or depth > max_depth:
-            continue
-
-        visited.add(current)
-
-        html = get_html(current)
-        if not html:
-            continue
-
-        text = BeautifulSoup(html, "html.parser").get_text(" ", strip=True)
-
-        online_found, print_found = extract_issn(text)
-        issn_online.update(online_found)
-        issn_print.update(print_found)
-
-        if depth < max_depth:
-            internal = get_internal_links(html, current)
-            for link in internal:
-                if link not in visited:
-                    queue.append((link, depth + 1))
-
-        time.sleep(0.3)
-
-    return list(issn_online), list(issn_print)
 
 
 # ---------------------------------------------------
 # 6. Cargar el Full Database
 # ---------------------------------------------------
-def main():
-    # Define input files
-    files = [
-        {"path": "RESOURCES/The Predatory Journals List 2025.xlsx", "type": "Journal"},
-        {"path": "RESOURCES/The Predatory Publishers List 2025-2.xlsx", "type": "Publisher"}
-    ]
-    
-    data_frames = []
-    
-    for f in files:
-        file_path = f["path"]
+def load_journals():
+    workbooks = []
+    for file_path, type_ in LIST_WORKBOOKS:
         # Handle relative paths if running from backend/scripts or root
         if not os.path.exists(file_path):
              if os.path.exists(os.path.join("..", "..", file_path)):
                  file_path = os.path.join("..", "..", file_path)
              elif os.path.exists(os.path.join("..", file_path)):
                  file_path = os.path.join("..", file_path)
-        
+
         if not os.path.exists(file_path):
             print(f"Error: {file_path} not found.")
             continue
-            
         print(f"Loading {file_path}...")
-        try:
-            # Read without header, assuming col 1 is name
-            df_temp = pd.read_excel(file_path, header=None)
-            # Rename columns: 0 -> ID, 1 -> Name
-            if len(df_temp.columns) >= 2:
-                df_temp = df_temp.iloc[:, :2]
-                df_temp.columns = ["id", "name"]
-                df_temp["type"] = f["type"]
-                df_temp["url"] = None
-                data_frames.append(df_temp)
-            else:
-                print(f"Warning: {file_path} has unexpected format.")
-        except Exception as e:
-            print(f"Error reading {file_path}: {e}")
-
-    if not data_frames:
-        print("No data loaded. Exiting.")
-        return
-
-    df = pd.concat(data_frames, ignore_index=True)
-    print(f"Total records loaded: {len(df)}")
-
-    # ---------------------------------------------------
-    # 7. Encontrar URLs automáticamente
-    # ---------------------------------------------------
-    for i, row in df.iterrows():
-        if pd.notna(row.get("url")) and str(row["url"]).startswith("http"):
-            continue # Skip if URL already exists
-
-        name = row["name"]
-        print(f"\n🔍 Buscando URL oficial para: {name}")
+        workbooks.append((file_path, type_))
 
-        found_url = find_official_url(str(name))
-        df.loc[i, "url"] = found_url
+    if not workbooks:
+        return None
 
-        print(f"➡️  URL encontrada: {found_url}")
+    try:
+        # Columns: name (cleaned, de-duplicated per type), type, url
+        return read_list_workbooks(workbooks)
+    except Exception as e:
+        print(f"Error reading workbooks: {e}")
+        return None
 
-        time.sleep(1)
 
+async def crawl_all(df, args):
+    crawler = ISSNCrawler(
+        concurrency=args.concurrency,
+        host_rate=args.host_rate,
+        page_budget=args.page_budget,
+        max_depth=args.max_depth,
+        cache=HTTPCache(args.cache_dir) if args.cache_dir else None,
+        resolve_url=make_url_resolver(args.search_rate),
+        early_exit=not args.no_early_exit
+    )
+    checkpoint = CrawlCheckpoint(args.checkpoint)
+    if checkpoint.done:
+        print(f"Resuming: {len(checkpoint.done)} journals already done in {args.checkpoint}")
 
     # ---------------------------------------------------
-    # 8. Hacer scraping profundo de ISSN
+    # 7-8. Encontrar URLs y hacer scraping de ISSN, varias revistas a la vez
     # ---------------------------------------------------
-    issn_results = []
-
-    for i, row in df.iterrows():
-        name = row["name"]
-        type_ = row.get("type", "Unknown")
-        url = row["url"]
-
-        print(f"\n📘 Scrapeando ISSN de: {name}")
-        print(f"URL: {url}")
+    keys = df["type"] + ":" + df["name"]
+    urls = df["url"].where(df["url"].notna(), None)
+    journals = list(zip(keys, df["name"], urls))
+
+    remaining = sum(1 for key, _, _ in journals if key not in checkpoint.done)
+    started = time.perf_counter()
+    done = 0
+    async for result in crawler.crawl(journals, checkpoint):
+        done += 1
+        print(f"📘 [{done}/{remaining}] {result.name}: "
+              f"online={result.issn_online} print={result.issn_print} ({result.pages} pages"
+              f"{', confirmed' if result.confirmed else ''})")
+
+    elapsed = time.perf_counter() - started
+    stats = crawler.stats
+    print(f"\nCrawled {done} journals in {elapsed:.1f}s: {stats.fetched} pages fetched, "
+          f"{stats.not_modified} not modified, {stats.failed} failed")
+    print(f"{stats.pages_per_journal} pages per journal, {stats.confirmed}/{stats.journals} stopped early on ISSNs")
+    return checkpoint
 
-        if pd.isna(url) or not str(url).startswith("http"):
-            issn_results.append([name, type_, url, None, None])
-            continue
-
-        online, printing = deep_scrape(url)
 
-        issn_results.append([name, type_, url, ", ".join(online), ", ".join(printing)])
+def main():
+    parser = argparse.ArgumentParser(description="Find official sites and scrape ISSNs for the predatory lists.")
+    parser.add_argument("--output", default="full_database_with_issn.xlsx", help="Excel file to write")
+    parser.add_argument("--checkpoint", default="scrape_issn.checkpoint.jsonl", help="Progress file; re-running resumes from it")
+    parser.add_argument("--cache-dir", default=".scrape_cache", help="Conditional-GET page cache ('' to disable)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight across all sites")
+    parser.add_argument("--host-rate", type=float, default=2.0, help="Requests per second per site")
+    parser.add_argument("--search-rate", type=float, default=1.0, help="DuckDuckGo searches per second")
+    parser.add_argument("--page-budget", type=int, default=30, help="Pages fetched per journal at most")
+    parser.add_argument("--max-depth", type=int, default=3, help="Link depth from the home page")
+    parser.add_argument("--no-early-exit", action="store_true", help="Keep crawling after the ISSNs are found (for comparison)")
+    args = parser.parse_args()
+
+    df = load_journals()
+    if df is None:
+        print("No data loaded. Exiting.")
+        return
+    print(f"Total records loaded: {len(df)}")
 
+    checkpoint = asyncio.run(crawl_all(df, args))
 
     # ---------------------------------------------------
     # 9. Crear DataFrame final
     # ---------------------------------------------------
-    final_df = pd.DataFrame(
-        issn_results,
-        columns=["name", "type", "url", "issn_online", "issn_print"]
+    results = pd.DataFrame(
+        [
+            (key, result.url, ", ".join(result.issn_online), ", ".join(result.issn_print))
+            for key, result in checkpoint.done.items()
+        ],
+        columns=["key", "url", "issn_online", "issn_print"]
+    )
+    final_df = (
+        df[["name", "type"]]
+        .assign(key=df["type"] + ":" + df["name"])
+        .merge(results, on="key", how="left")
+        [["name", "type", "url", "issn_online", "issn_print"]]
     )
 
-    output_file = "full_database_with_issn.xlsx"
+    output_file = args.output
     final_df.to_excel(output_file, index=False)
 
     print("\n🎉 TODO COMPLETADO")
@@ -1,12 +1,14 @@
 import requests
 import re
-from backend.database.session import SessionLocal
-from backend.database.models import PredatoryJournal
+from backend.database.session import PredatorySessionLocal
+from backend.engine.predatory_ingest import PredatoryIngestor, JournalRecord
 
 README_URL = "https://raw.githubusercontent.com/twincacca/PredatoryJournals/main/README.md"
 
 def enrich_data():
-    db = SessionLocal()
+    db = PredatorySessionLocal()
+    # Only fill in missing fields: an existing row without ISSN gets this one, other values stay
+    ingestor = PredatoryIngestor(db, overwrite=False)
     print(f"Fetching data from {README_URL}...")
     r = requests.get(README_URL)
     r.raise_for_status()
@@ -17,9 +19,6 @@ def enrich_data():
     # Regex to find ISSN: (ISSN: XXXX-XXXX) or similar
     issn_pattern = re.compile(r'\(ISSN:\s*([\dX-]{8,9})\)', re.IGNORECASE)
     
-    count = 0
-    new_records = 0
-    
     for line in lines:
         line = line.strip()
         if not line.startswith('- '):
@@ -44,33 +43,17 @@ def enrich_data():
         if not name:
             continue
 
-        # Check if exists
-        exists = db.query(PredatoryJournal).filter(PredatoryJournal.name.ilike(f"%{name}%")).first()
-        
-        if exists:
-            if issn and not exists.issn:
-                print(f"Updating {name} with ISSN {issn}")
-                exists.issn = issn
-                count += 1
-        else:
-            # Add new record if it has ISSN or just to add more data?
-            # User wants to fix missing fields. Adding more data is good.
-            # But let's prioritize ISSNs.
-            if issn:
-                print(f"Adding new record {name} with ISSN {issn}")
-                journal = PredatoryJournal(
-                    name=name,
-                    issn=issn,
-                    source="Twincacca List",
-                    publisher=None
-                )
-                db.add(journal)
-                new_records += 1
+        # Prioritize ISSNs: entries without one add nothing the other lists don't have
+        if issn:
+            ingestor.add(JournalRecord(name=name, issn=issn, source="Twincacca List"))
 
-    db.commit()
-    print(f"Updated {count} records with ISSNs.")
-    print(f"Added {new_records} new records.")
-    db.close()
+    try:
+        stats = ingestor.apply()
+        print(f"Updated {stats.updated} records with ISSNs.")
+        print(f"Added {stats.inserted} new records.")
+        print(stats)
+    finally:
+        db.close()
 
 if __name__ == "__main__":
     enrich_data()
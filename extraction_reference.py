@@ -0,0 +1,55 @@
+"""
+Reference implementations the tests compare against: the per-pattern extraction that
+EvidenceEngine replaced and a synthetic paper to run both on. Also used as the baseline
+by backend/scripts/benchmark_extraction.py.
+"""
+import random
+import re
+from backend.engine.evidence_engine import PROMOTIONAL_KEYWORDS, KNOWN_PUBLISHERS
+
+# The per-pattern extraction that EvidenceEngine replaced
+LEGACY_PATTERNS = {
+    "funding": [
+        r"funding[:\s]+(.*?)(?:\.|$)", r"supported by[:\s]+(.*?)(?:\.|$)", r"grant[:\s]+(.*?)(?:\.|$)",
+        r"financial support[:\s]+(.*?)(?:\.|$)", r"funded by[:\s]+(.*?)(?:\.|$)", r"funding provided by[:\s]+(.*?)(?:\.|$)"
+    ],
+    "coi_statements": [
+        r"conflict of interest[:\s]+(.*?)(?:\.|$)", r"competing interest[:\s]+(.*?)(?:\.|$)", r"disclosure[:\s]+(.*?)(?:\.|$)",
+        r"declaration of interest[:\s]+(.*?)(?:\.|$)", r"authors declare[:\s]+(.*?)(?:\.|$)",
+        r"no conflict of interest declared", r"no competing interests declared"
+    ],
+}
+LEGACY_AFFILIATIONS = [
+    r"((?:Department|Institute|University|Hospital) of [^\n\.]+)",
+    r"([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})"
+]
+
+def legacy_extract(text: str) -> dict:
+    result = {}
+    for category, patterns in LEGACY_PATTERNS.items():
+        evidence = []
+        for p in patterns:
+            evidence.extend(re.findall(p, text, re.IGNORECASE | re.MULTILINE))
+        result[category] = set(evidence)
+    evidence = []
+    for p in LEGACY_AFFILIATIONS:
+        evidence.extend(re.findall(p, text, re.IGNORECASE))
+    result["affiliations"] = set(evidence)
+    result["promotional"] = {kw for kw in PROMOTIONAL_KEYWORDS if kw.lower() in text.lower()}
+    result["publishers"] = {pub for pub in KNOWN_PUBLISHERS if pub.lower() in text.lower()}
+    return result
+
+def synthetic_paper(pages: int, seed: int = 42) -> str:
+    """Roughly 3,000 characters of filler per page with declarations sprinkled in."""
+    random.seed(seed)
+    words = ("the of and results patients study treatment analysis data were significant group "
+             "clinical method using between effect model increase compared research").split()
+    chunks = []
+    for page in range(pages):
+        for _ in range(8):
+            chunks.append(" ".join(random.choice(words) for _ in range(50)) + ".\n")
+        if page % 10 == 0:
+            chunks.append("Department of Medicine, University of Oxford. Contact: author@ox.ac.uk\n")
+    chunks.append("Funding: This work was supported by Pharma Inc (grant 123).\n")
+    chunks.append("Conflict of interest: The authors declare no competing interests. Published by Elsevier.\n")
+    return "".join(chunks)
@@ -60,6 +60,46 @@ async function apiCall(endpoint, method = 'GET', body = null, isFile = false) {
     return response;
 }
 
+// Background Analysis Jobs
+// Follows a job's Server-Sent Events stream (fetch is used instead of EventSource so the
+// Authorization header is sent) and falls back to polling. Resolves with the final job.
+async function watchJob(jobId, onProgress = null) {
+    try {
+        const response = await apiCall(`/jobs/${jobId}/events`);
+        if (response && response.ok && response.body) {
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            let job = null;
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                const events = buffer.split('\n\n');
+                buffer = events.pop();
+                for (const event of events) {
+                    const dataLine = event.split('\n').find(line => line.startsWith('data: '));
+                    if (!dataLine) continue;
+                    job = JSON.parse(dataLine.slice(6));
+                    if (onProgress) onProgress(job);
+                }
+            }
+            if (job && (job.status === 'completed' || job.status === 'failed')) return job;
+        }
+    } catch (error) {
+        console.warn('Job event stream unavailable, polling instead.', error);
+    }
+
+    while (true) {
+        const response = await apiCall(`/jobs/${jobId}`);
+        if (!response || !response.ok) return null;
+        const job = await response.json();
+        if (onProgress) onProgress(job);
+        if (job.status === 'completed' || job.status === 'failed') return job;
+        await new Promise(resolve => setTimeout(resolve, 1000));
+    }
+}
+
 document.addEventListener('DOMContentLoaded', updateNav);
 
 // Social Login Handler
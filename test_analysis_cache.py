@@ -0,0 +1,63 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.core.config import settings
+from backend.database.session import Base
+from backend.database.models import Analysis
+from backend.engine.analysis_cache import AnalysisCache
+from backend.engine.pdf_processor import extraction_version
+from backend.engine.scorer import scorer_version
+
+def test_cache_misses_after_a_keyword_list_change(monkeypatch):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    version = scorer_version()
+    pages = extraction_version()
+    db.add(Analysis(user_id=1, score=40, file_hash="a" * 64, predatory_list_version="1:10:10:x", scorer_version=version, extraction_version=pages))
+    db.commit()
+
+    cache = AnalysisCache(db)
+    assert cache.lookup("a" * 64, "1:10:10:x", scorer_version(), pages).score == 40
+    assert cache.lookup("a" * 64, "2:10:10:x", scorer_version(), pages) is None
+
+    monkeypatch.setattr(settings, "PROMOTIONAL_KEYWORDS", settings.PROMOTIONAL_KEYWORDS + ["revolutionary"])
+    assert scorer_version() != version
+    assert cache.lookup("a" * 64, "1:10:10:x", scorer_version(), pages) is None
+    db.close()
+
+def test_cache_misses_after_a_page_selection_change(monkeypatch):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    version = scorer_version()
+    monkeypatch.setattr(settings, "PDF_LAZY_EXTRACTION", False)
+    pages = extraction_version()
+    db.add(Analysis(user_id=1, score=40, file_hash="a" * 64, predatory_list_version="1:10:10:x", scorer_version=version, extraction_version=pages))
+    db.commit()
+
+    cache = AnalysisCache(db)
+    # Lazy-mode page counts don't matter while lazy mode is off; its switch and the budget do
+    monkeypatch.setattr(settings, "PDF_BACK_PAGES", settings.PDF_BACK_PAGES + 1)
+    assert cache.lookup("a" * 64, "1:10:10:x", version, extraction_version()).score == 40
+    monkeypatch.setattr(settings, "PDF_LAZY_EXTRACTION", True)
+    assert cache.lookup("a" * 64, "1:10:10:x", version, extraction_version()) is None
+    monkeypatch.setattr(settings, "PDF_LAZY_EXTRACTION", False)
+    monkeypatch.setattr(settings, "PDF_PAGE_BUDGET", 10)
+    assert cache.lookup("a" * 64, "1:10:10:x", version, extraction_version()) is None
+    db.close()
+
+def test_cache_skips_fallback_summaries():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    version = scorer_version()
+    pages = extraction_version()
+    db.add(Analysis(user_id=1, score=40, summary="real", file_hash="a" * 64, predatory_list_version="1:10:10:x", scorer_version=version, extraction_version=pages))
+    db.add(Analysis(user_id=1, score=40, summary="heuristic", file_hash="a" * 64, predatory_list_version="1:10:10:x", scorer_version=version, extraction_version=pages, summary_fallback=True))
+    db.add(Analysis(user_id=1, score=60, summary="heuristic", file_hash="b" * 64, predatory_list_version="1:10:10:x", scorer_version=version, extraction_version=pages, summary_fallback=True))
+    db.commit()
+
+    cache = AnalysisCache(db)
+    assert cache.lookup("a" * 64, "1:10:10:x", version, pages).summary == "real"
+    assert cache.lookup("b" * 64, "1:10:10:x", version, pages) is None
+    db.close()
@@ -0,0 +1,96 @@
+import asyncio
+import os
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from backend.api.api_v1.endpoints import analysis, auth
+from backend.core.config import settings
+from backend.core.user_cache import user_cache
+from backend.database.session import Base, PredatoryBase, async_session_router, get_async_db
+from backend.database.models import Analysis
+from backend.database.sqlite import create_async_sqlite_engine, create_sqlite_engine
+
+def test_login_and_history_on_the_async_session(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_ROUNDS", 4)
+    user_cache.clear()
+    ria_uri = f"sqlite:///{os.path.join(tmp_path, 'ria.db')}"
+    predatory_uri = f"sqlite:///{os.path.join(tmp_path, 'predatory.db')}"
+    ria = create_sqlite_engine(ria_uri)
+    Base.metadata.create_all(bind=ria)
+    PredatoryBase.metadata.create_all(bind=create_sqlite_engine(predatory_uri))
+    async_ria = create_async_sqlite_engine(ria_uri)
+    async_predatory = create_async_sqlite_engine(predatory_uri, read_only=True)
+    Session = async_session_router(async_ria, async_predatory)
+
+    async def routed_db():
+        async with Session() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/api/auth")
+    app.include_router(analysis.router, prefix="/api")
+    app.dependency_overrides[get_async_db] = routed_db
+    with TestClient(app) as client:
+        credentials = {"email": "async@example.com", "password": "correct horse!"}
+        assert client.post("/api/auth/register", json=credentials).status_code == 200
+        assert client.post("/api/auth/register", json=credentials).status_code == 400
+        login = client.post("/api/auth/login", data={"username": credentials["email"], "password": "correct horse!"})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        assert client.post("/api/auth/login", data={"username": credentials["email"], "password": "wrong"}).status_code == 401
+
+        with sessionmaker(bind=ria)() as db:
+            db.add_all(
+                Analysis(user_id=1, filename=f"paper{i}.pdf", overall_risk="low", score=i, summary="ok", full_result={})
+                for i in range(3)
+            )
+            db.commit()
+
+        first = client.get("/api/history", params={"limit": 2}, headers=headers).json()
+        assert [item["filename"] for item in first["items"]] == ["paper2.pdf", "paper1.pdf"]
+        rest = client.get("/api/history", params={"limit": 2, "cursor": first["next_cursor"]}, headers=headers).json()
+        assert [item["filename"] for item in rest["items"]] == ["paper0.pdf"]
+        assert client.get(f"/api/history/{first['items'][0]['id']}", headers=headers).json()["score"] == 2
+        assert client.get("/api/jobs", headers=headers).json() == []
+        assert client.get("/api/jobs/missing", headers=headers).status_code == 404
+        assert client.get("/api/history", headers={"Authorization": "Bearer nonsense"}).status_code == 401
+
+    ria.dispose()
+    for engine in (async_ria, async_predatory):
+        asyncio.run(engine.dispose())
+
+def test_concurrent_registrations_of_one_email(tmp_path, monkeypatch):
+    import httpx
+    from backend.core import security
+
+    monkeypatch.setattr(settings, "PASSWORD_HASH_ROUNDS", 4)
+    ria_uri = f"sqlite:///{os.path.join(tmp_path, 'ria.db')}"
+    Base.metadata.create_all(bind=create_sqlite_engine(ria_uri))
+    async_ria = create_async_sqlite_engine(ria_uri)
+    Session = async_session_router(async_ria, async_ria)
+
+    async def routed_db():
+        async with Session() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/api/auth")
+    app.dependency_overrides[get_async_db] = routed_db
+
+    async def register_twice():
+        # Both requests pass the existence check before either inserts
+        both_checked = asyncio.Barrier(2)
+        ahash = security.password_hasher.ahash
+
+        async def hash_after_both_checked(password):
+            await both_checked.wait()
+            return await ahash(password)
+
+        monkeypatch.setattr(security.password_hasher, "ahash", hash_after_both_checked)
+        credentials = {"email": "race@example.com", "password": "correct horse!"}
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await asyncio.gather(*(client.post("/api/auth/register", json=credentials) for _ in range(2)))
+
+    responses = asyncio.run(register_twice())
+    assert sorted(response.status_code for response in responses) == [200, 400]
+    assert "already exists" in next(r for r in responses if r.status_code == 400).json()["detail"]
+    asyncio.run(async_ria.dispose())
@@ -0,0 +1,48 @@
+import time
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.database.session import Base
+from backend.database.models import Analysis
+from backend.engine import batch
+from backend.engine.uploads import StagedUpload
+
+def test_finished_analyses_are_committed_when_the_client_disconnects(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    monkeypatch.setattr(batch, "_analyze_file", lambda upload: {
+        "overall_risk": "low", "score": 10, "summary": upload.filename, "full_result": {}, "file_hash": upload.sha256
+    })
+
+    files = [StagedUpload(f"paper{i}.pdf", f"{i:064d}", 4, data=b"%PDF") for i in range(5)]
+    events = batch.BatchAnalyzer(1, max_workers=1, commit_size=4, session_factory=Session).run(files)
+    results = [next(events) for _ in range(3)]
+    assert [event["event"] for event in results] == ["result"] * 3
+    events.close()
+
+    with Session() as db:
+        assert db.query(Analysis).count() == 3
+
+def test_disconnect_waits_for_running_analyses_before_cleanup(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    running = []
+
+    def analyze(upload):
+        running.append(upload.filename)
+        if upload.filename != "paper0.pdf":
+            time.sleep(0.3)
+        running.remove(upload.filename)
+        return {"overall_risk": "low", "score": 10, "summary": upload.filename, "full_result": {}, "file_hash": upload.sha256}
+
+    monkeypatch.setattr(batch, "_analyze_file", analyze)
+    files = [StagedUpload(f"paper{i}.pdf", f"{i:064d}", 4, data=b"%PDF") for i in range(4)]
+    events = batch.BatchAnalyzer(1, max_workers=2, commit_size=10, session_factory=Session).run(files)
+    assert next(events)["filename"] == "paper0.pdf"
+    events.close()
+
+    # paper1 and paper2 were running: close() waited for them; paper3 never started
+    assert running == []
+    with Session() as db:
+        assert [analysis.summary for analysis in db.query(Analysis)] == ["paper0.pdf"]
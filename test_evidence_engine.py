@@ -0,0 +1,21 @@
+from backend.engine.extractors import EvidenceExtractor, MetadataExtractor
+from extraction_reference import legacy_extract, synthetic_paper
+
+SAMPLE = (
+    "Funding: funding provided by: NIH grant 5. The authors declare: no conflict of interest declared.\n"
+    "Department of Medicine, University of Oxford. Contact: a.b-c@ox.ac.uk, x@y.org\n"
+    "Competing interest: none. This groundbreaking work was published by Wiley.\n"
+)
+
+def test_single_pass_matches_legacy_extraction():
+    for text in (SAMPLE, synthetic_paper(20)):
+        legacy = legacy_extract(text)
+        extractor = EvidenceExtractor(text)
+        assert set(extractor.extract_funding()) == legacy["funding"]
+        assert set(extractor.extract_coi_statement()) == legacy["coi_statements"]
+        assert set(extractor.scan["affiliations"]) == legacy["affiliations"]
+
+def test_keywords_and_publisher():
+    extractor = EvidenceExtractor(SAMPLE)
+    assert extractor.check_keywords(["groundbreaking", "miracle", "oxford"]) == ["groundbreaking", "oxford"]
+    assert MetadataExtractor(SAMPLE, evidence=extractor).extract_metadata()["publisher"] == "Wiley"
@@ -0,0 +1,27 @@
+from backend.engine.fuzzy_matcher import TrigramMatcher, expand_name
+
+def build_matcher():
+    names = [
+        "International Journal of Advanced Research",
+        "Journal of Science and Technology",
+        "Academic Exchange Quarterly",
+        "Global Journal of Management and Business Research",
+    ]
+    return TrigramMatcher(min_similarity=0.85).build((n, n) for n in names)
+
+def test_expand_name():
+    assert expand_name("Intl. J. of Advanced Research") == "international journal advanced research"
+    assert expand_name("J. Sci. & Tech.") == "journal science technology"
+
+def test_abbreviated_name_matches_exactly():
+    match = build_matcher().match("Intl. J. of Advanced Research")
+    assert match == ("International Journal of Advanced Research", 1.0)
+
+def test_misspelled_name_matches_fuzzily():
+    value, similarity = build_matcher().match("Academic Exchange Quartely")
+    assert value == "Academic Exchange Quarterly"
+    assert 0.85 <= similarity < 1.0
+
+def test_unrelated_name_does_not_match():
+    assert build_matcher().match("Journal of the American Chemical Society") is None
+    assert build_matcher().match("") is None
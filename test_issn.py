@@ -0,0 +1,18 @@
+from backend.core.issn import canonicalize_issn, split_issns
+from backend.engine.extractors import MetadataExtractor
+
+def test_canonicalize_issn():
+    assert canonicalize_issn("2320-5407") == "23205407"
+    assert canonicalize_issn("0975-833x") == "0975833X"
+    # Wrong check digit
+    assert canonicalize_issn("1234-5678") is None
+
+def test_split_issns():
+    assert split_issns("2320-5407, 2249-622X") == ["23205407", "2249622X"]
+    assert split_issns("1234-5678; 2320-5407 / 2320-5407") == ["23205407"]
+    assert split_issns(None) == []
+
+def test_extract_issn_rejects_page_ranges_and_years():
+    text = "Vol. 12, pp. 1123-1131, 2019-2020. Journal of Science 2049-7318"
+    assert MetadataExtractor(text).extract_metadata()["issn"] == "2049-7318"
+    assert MetadataExtractor("pp. 1123-1131").extract_metadata()["issn"] is None
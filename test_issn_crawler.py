@@ -0,0 +1,131 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import asyncio
+import threading
+import pytest
+from backend.engine.issn_crawler import CrawlCheckpoint, HTTPCache, ISSNCrawler, extract_issn, parse_page
+
+PAGES = {
+    "/": '<a href="/archive">Archive</a> <a href="/news">News</a> <a href="/about">About the journal</a> <a href="http://elsewhere.example/">x</a>',
+    "/news": "<p>Call for papers</p>",
+    "/about": "<p>Online ISSN: 2049-7318</p><p>Published monthly since 2011 by the society.</p><p>Print ISSN: 0975-833X</p>",
+    "/archive": '<a href="/archive/1">1</a> <a href="/archive/2">2</a> <a href="/archive/3">3</a>',
+    "/archive/1": "<p>Volume 1</p>",
+    "/archive/2": "<p>Volume 2</p>",
+    "/archive/3": "<p>Volume 3</p>",
+}
+
+class FixtureSite(BaseHTTPRequestHandler):
+    """Static journal site that answers If-None-Match with 304."""
+    hits = []
+
+    def do_GET(self):
+        FixtureSite.hits.append(self.path)
+        body = PAGES.get(self.path)
+        if body is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        etag = f'"{hash(body) & 0xffffffff:x}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        data = f"<html><body>{body}</body></html>".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def site_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureSite)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    FixtureSite.hits = []
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+
+def _crawl(crawler, journals, checkpoint=None):
+    async def run():
+        return [result async for result in crawler.crawl(journals, checkpoint)]
+    return asyncio.run(run())
+
+def test_crawl_finds_issns_and_revalidates_from_cache(site_url, tmp_path):
+    cache = HTTPCache(str(tmp_path / "cache"))
+    crawler = ISSNCrawler(host_rate=0, cache=cache, early_exit=False)
+    [result] = _crawl(crawler, [("j1", "Journal One", site_url)])
+    assert result.issn_online == ["2049-7318"]
+    assert result.issn_print == ["0975-833X"]
+    assert result.pages == len(PAGES)
+    assert crawler.stats.fetched == len(PAGES)
+
+    again = ISSNCrawler(host_rate=0, cache=cache, early_exit=False)
+    [result] = _crawl(again, [("j1", "Journal One", site_url)])
+    assert result.issn_online == ["2049-7318"]
+    assert again.stats.fetched == 0
+    assert again.stats.not_modified == len(PAGES)
+
+def test_hinted_links_first_and_early_exit(site_url):
+    crawler = ISSNCrawler(host_rate=0)
+    [result] = _crawl(crawler, [("j1", "Journal One", site_url)])
+    assert FixtureSite.hits == ["/", "/about"]
+    assert result.confirmed and result.pages == 2
+    assert result.issn_print == ["0975-833X"]
+    assert crawler.stats.pages_per_journal == 2
+
+def test_parse_page_single_pass():
+    page = parse_page(
+        '<html><head><script>var issn = "0000-0000";</script></head><body>'
+        '<a href="/journal-info#top">Journal <b>info</b></a><a href="mailto:x@y.z">mail</a>'
+        '<a href="/files/paper.pdf">PDF</a><p>ISSN 2049-7318 phone 0123-4567</p></body></html>',
+        "http://journal.example/"
+    )
+    assert page.links == [("http://journal.example/journal-info", "Journal info")]
+    assert "0000-0000" not in page.text
+    # 0123-4567 fails the ISSN check digit
+    assert extract_issn(page.text) == ([], ["2049-7318"])
+
+def test_page_budget_and_checkpoint_resume(site_url, tmp_path):
+    checkpoint_path = str(tmp_path / "progress.jsonl")
+    crawler = ISSNCrawler(host_rate=0, page_budget=2)
+    results = _crawl(crawler, [("j1", "Journal One", site_url), ("j2", "No Site", None)], CrawlCheckpoint(checkpoint_path))
+    assert {r.key: r.pages for r in results} == {"j1": 2, "j2": 0}
+
+    # A restarted run only crawls journals missing from the checkpoint
+    FixtureSite.hits = []
+    checkpoint = CrawlCheckpoint(checkpoint_path)
+    results = _crawl(ISSNCrawler(host_rate=0), [("j1", "Journal One", site_url), ("j3", "Journal Three", site_url)], checkpoint)
+    assert [r.key for r in results] == ["j3"]
+    assert set(checkpoint.done) == {"j1", "j2", "j3"}
+
+def test_failed_crawls_are_counted_and_retried(site_url, tmp_path):
+    checkpoint_path = str(tmp_path / "progress.jsonl")
+    crawler = ISSNCrawler(host_rate=0, page_budget=2)
+    results = _crawl(crawler, [("j1", "Journal One", site_url), ("j2", "Broken", "http://[::1/")], CrawlCheckpoint(checkpoint_path))
+    broken = next(r for r in results if r.key == "j2")
+    assert broken.error and not (broken.issn_online or broken.issn_print)
+    assert crawler.stats.failed == 1
+
+    # Only the journal that was crawled is checkpointed: a restart retries the failed one
+    checkpoint = CrawlCheckpoint(checkpoint_path)
+    assert set(checkpoint.done) == {"j1"}
+    results = _crawl(ISSNCrawler(host_rate=0), [("j1", "Journal One", site_url), ("j2", "Broken", "http://[::1/")], checkpoint)
+    assert [r.key for r in results] == ["j2"]
+
+def test_host_rate_limit_spaces_requests(site_url):
+    crawler = ISSNCrawler(host_rate=20, page_budget=4, early_exit=False)
+    loop_time = []
+
+    async def run():
+        start = asyncio.get_running_loop().time()
+        [result async for result in crawler.crawl([("j1", "Journal One", site_url)])]
+        loop_time.append(asyncio.get_running_loop().time() - start)
+
+    asyncio.run(run())
+    # 4 requests at 20/s with a burst of 1: at least 3 waits of 50ms
+    assert loop_time[0] >= 0.15
@@ -0,0 +1,50 @@
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.database.session import Base
+from backend.database.models import AnalysisJob
+from backend.engine.job_queue import AnalysisJobQueue
+from backend.engine.uploads import stage_stream
+
+def make_queue():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    return AnalysisJobQueue(max_workers=1, session_factory=Session), Session
+
+def test_shutdown_deletes_uploads_of_queued_jobs():
+    queue, Session = make_queue()
+    # Keep the only worker busy so the submitted jobs stay queued
+    release = threading.Event()
+    queue._executor = ThreadPoolExecutor(max_workers=1)
+    queue._executor.submit(release.wait)
+
+    uploads = [stage_stream(io.BytesIO(b"%PDF" * 100), f"paper{i}.pdf", spool_bytes=10) for i in range(2)]
+    with Session() as db:
+        jobs = [queue.submit(db, 1, upload) for upload in uploads]
+        assert [job.upload_path for job in jobs] == [upload.path for upload in uploads]
+    assert all(os.path.exists(upload.path) for upload in uploads)
+
+    queue.shutdown()
+    release.set()
+    assert not any(os.path.exists(upload.path) for upload in uploads)
+
+def test_recovery_fails_interrupted_jobs_and_deletes_their_uploads():
+    queue, Session = make_queue()
+    upload = stage_stream(io.BytesIO(b"%PDF" * 100), "paper.pdf", spool_bytes=10)
+    with Session() as db:
+        db.add_all([
+            AnalysisJob(id="running", user_id=1, status="running", upload_path=upload.path),
+            AnalysisJob(id="queued", user_id=1, status="queued", upload_path="/nonexistent/ria_upload_gone.pdf"),
+            AnalysisJob(id="done", user_id=1, status="completed"),
+        ])
+        db.commit()
+
+    assert queue.recover_interrupted() == 2
+    assert not os.path.exists(upload.path)
+    with Session() as db:
+        statuses = {job.id: (job.status, job.upload_path) for job in db.query(AnalysisJob)}
+    assert statuses == {"running": ("failed", None), "queued": ("failed", None), "done": ("completed", None)}
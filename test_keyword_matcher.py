@@ -0,0 +1,31 @@
+from backend.engine.extractors import EvidenceExtractor, MetadataExtractor
+from backend.engine.keyword_matcher import KeywordMatcher
+from backend.engine.scorer import COIScorer
+
+def test_word_boundaries_stems_and_offsets():
+    matcher = KeywordMatcher(["pharma*", "inc", "ltd", "Taylor & Francis"])
+    text = "Funding, including travel, came from Acme Pharmaceuticals Inc. (Taylor & Francis)"
+    matches = matcher.find_all(text)
+    assert [m.keyword for m in matches] == ["pharma", "inc", "Taylor & Francis"]
+    assert [text[m.start:m.end] for m in matches] == ["Pharmaceuticals", "Inc", "Taylor & Francis"]
+    assert matcher.keywords("Incorporated in London; Ltd.") == ["ltd"]
+
+def test_scorer_ignores_substrings_and_reports_highlights():
+    text = (
+        "Funding: grants including a fellowship from the national council.\n"
+        "A dosage study. This miracle cure was funded by Novo Pharma Ltd.\n"
+    )
+    extractor = EvidenceExtractor(text)
+    assert MetadataExtractor(text, evidence=extractor).extract_metadata()["publisher"] is None
+    assert extractor.check_keywords(["miracle", "cure", "dose"]) == ["miracle", "cure"]
+
+    result = COIScorer(text).compute_score()
+    alignment = result["categories"][1]
+    assert alignment["score"] == 80
+    assert alignment["evidence_found"] == ["Funding source contains commercial keywords: pharma, ltd"]
+
+    highlights = result["evidence"]["keyword_highlights"]
+    promotional = [h for h in highlights if h["field"] == "text"]
+    assert [text[h["start"]:h["end"]] for h in promotional] == ["miracle"]
+    funding = result["evidence"]["funding"]
+    assert {funding[h["index"]][h["start"]:h["end"]] for h in highlights if h["field"] == "funding"} == {"Pharma", "Ltd"}
@@ -0,0 +1,27 @@
+import pandas as pd
+from backend.engine.list_loader import iter_keyed_records, normalize_frame, normalize_issns
+from backend.engine.predatory_ingest import JournalRecord
+
+def test_issn_columns_match_split_issns():
+    values = pd.Series(["2049-7318, 0975-833X", "0123-4567 or 20497318", None, "", "0975833x; 2049-7318; 0975-833X"])
+    formatted, keys = normalize_issns(values)
+    assert formatted.tolist() == ["2049-7318, 0975-833X", "2049-7318", pd.NA, pd.NA, "0975-833X, 2049-7318"]
+    assert keys.tolist() == ["0975833X", "20497318", "", "", "0975833X"]
+
+def test_frame_matches_record_normalization():
+    frame = pd.DataFrame({
+        "name": ["Journal of Things", " Journal  of Things ", None, "Some Publisher"],
+        "type": ["Journal", "journal", "Journal", "Publisher"],
+        "url": ["http://things.example", None, "http://x.example", " "],
+        "issn_online": ["2049-7318", None, None, None],
+        "issn_print": [None, "0975-833X", None, None],
+    }, dtype="string")
+    keyed = list(iter_keyed_records(normalize_frame(frame, source="test")))
+
+    assert [key for key, _ in keyed] == [
+        ("journal of things", "20497318", ""), ("journal of things", "0975833X", ""), ("some publisher", "", "publisher:")
+    ]
+    assert all(key == record.key for key, record in keyed)
+    expected = JournalRecord(name="Journal of Things", source="test", issn="2049-7318", url="http://things.example").normalized()
+    assert keyed[0][1] == expected
+    assert keyed[2][1] == JournalRecord(name="Some Publisher", source="test", entity_type="Publisher").normalized()
@@ -0,0 +1,80 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+import pytest
+from backend.engine.llm_wrapper import LLMWrapper, SummaryCache
+
+SUMMARY_CHUNKS = ["Commercial funding ", "was found ", "without a COI statement."]
+
+class StubOpenAI(BaseHTTPRequestHandler):
+    """Minimal OpenAI-compatible /v1/chat/completions that streams SUMMARY_CHUNKS."""
+    requests = 0
+    delay = 0.0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        assert body["stream"] is True
+        StubOpenAI.requests += 1
+        time.sleep(StubOpenAI.delay)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for content in SUMMARY_CHUNKS:
+            chunk = {
+                "id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": 0, "model": body["model"],
+                "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": None}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def stub_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOpenAI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    StubOpenAI.requests = 0
+    StubOpenAI.delay = 0.0
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+
+RESULT = {
+    "overall_risk": "medium",
+    "evidence": {"funding": ["Pharma Corp Grant"], "coi_statements": [], "affiliations": []},
+    "rules_triggered": ["Commercial funding detected"],
+}
+
+def test_streamed_summary_is_cached(stub_url):
+    llm = LLMWrapper(api_key="test", base_url=stub_url, cache=SummaryCache())
+    partials = []
+
+    summary = llm.summarize_risk(RESULT, 55, on_partial=partials.append)
+    assert summary == "".join(SUMMARY_CHUNKS).strip()
+    assert partials[-1] == "".join(SUMMARY_CHUNKS)
+    assert len(partials) == len(SUMMARY_CHUNKS)
+
+    # Same evidence and rules: served from the cache without another request
+    assert llm.summarize_risk(RESULT, 55) == summary
+    assert StubOpenAI.requests == 1
+
+def test_deadline_falls_back_to_heuristic(stub_url):
+    StubOpenAI.delay = 1.0
+    llm = LLMWrapper(api_key="test", base_url=stub_url, timeout=0.2, cache=SummaryCache())
+    fallback = llm.summarize_risk(RESULT, 55)
+    assert fallback == llm._heuristic_summary(55)
+    assert fallback.is_fallback
+
+    # The fallback isn't cached: once the server recovers the real summary comes back
+    StubOpenAI.delay = 0.0
+    summary = llm.summarize_risk(RESULT, 55)
+    assert summary == "".join(SUMMARY_CHUNKS).strip()
+    assert not summary.is_fallback
+
+def test_async_summary(stub_url):
+    import asyncio
+    llm = LLMWrapper(api_key="test", base_url=stub_url, cache=SummaryCache())
+    assert asyncio.run(llm.asummarize_risk(RESULT, 80)) == "".join(SUMMARY_CHUNKS).strip()
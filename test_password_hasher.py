@@ -0,0 +1,24 @@
+import asyncio
+import pytest
+from backend.core.security import PasswordHasher, PasswordHasherBusy, UNUSABLE_PASSWORD, verify_password
+
+def test_bounded_hasher_rejects_when_full():
+    hasher = PasswordHasher(workers=1, max_pending=1)
+
+    async def scenario():
+        first = asyncio.ensure_future(hasher.ahash("password123!"))
+        await asyncio.sleep(0)  # first hash is now running and holds the only slot
+        with pytest.raises(PasswordHasherBusy):
+            await hasher.ahash("another password")
+        hashed = await first
+        assert await hasher.averify("password123!", hashed)
+        assert not await hasher.averify("wrong", hashed)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        hasher.shutdown()
+
+def test_unusable_password_never_verifies():
+    assert not verify_password("!", UNUSABLE_PASSWORD)
+    assert not asyncio.run(PasswordHasher(workers=1, max_pending=1).averify("", UNUSABLE_PASSWORD))
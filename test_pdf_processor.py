@@ -0,0 +1,87 @@
+import os
+from typing import List
+from backend.core.config import settings
+from backend.engine import pdf_processor
+
+def make_pdf(pages: List[str]) -> bytes:
+    """A minimal PDF with one line of Helvetica text per page."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return out
+
+def record_parallel(monkeypatch):
+    """Runs the 'pool' in-process and records the page ranges sent to it."""
+    calls = []
+
+    def fake_parallel(file_path, pages, workers, deadline):
+        calls.append(pages)
+        return pdf_processor._extract_serial(file_path, pages, deadline)
+
+    monkeypatch.setattr(settings, "PDF_EXTRACTION_WORKERS", 2)
+    monkeypatch.setattr(pdf_processor, "_extract_parallel", fake_parallel)
+    return calls
+
+def write_pdf(tmp_path, pages: List[str]) -> str:
+    path = tmp_path / "paper.pdf"
+    path.write_bytes(make_pdf(pages))
+    return str(path)
+
+def test_lazy_mode_sends_the_body_to_the_pool_when_declarations_are_missing(tmp_path, monkeypatch):
+    calls = record_parallel(monkeypatch)
+    pages = ["Journal of Tests"] + [f"Body page {i} groundbreaking" for i in range(1, 13)] + ["References"]
+    text = pdf_processor.extract_text(write_pdf(tmp_path, pages), lazy=True)
+    assert calls == [range(2, 11)]
+    assert text.splitlines() == pages
+
+def test_lazy_mode_skips_the_body_once_both_declarations_are_found(tmp_path, monkeypatch):
+    calls = record_parallel(monkeypatch)
+    pages = ["Journal of Tests"] + [f"Body page {i}" for i in range(1, 12)]
+    pages += ["Funding: This work was supported by NIH.", "Conflict of interest: none declared."]
+    text = pdf_processor.extract_text(write_pdf(tmp_path, pages), lazy=True)
+    assert calls == []
+    assert text.splitlines() == pages[:2] + pages[-3:]
+
+def test_full_extraction_keeps_the_body_by_default(tmp_path, monkeypatch):
+    calls = record_parallel(monkeypatch)
+    pages = ["Funding: NIH.", "Conflict of interest: none."] + [f"Body page {i} miracle" for i in range(12)]
+    text = pdf_processor.extract_text(write_pdf(tmp_path, pages))
+    assert calls == [range(0, 14)]
+    assert text.splitlines() == pages
+
+def test_small_in_memory_upload_still_goes_through_the_pool(monkeypatch):
+    calls = record_parallel(monkeypatch)
+    paths = []
+    real_parallel = pdf_processor._extract_parallel
+
+    def on_disk(file_path, pages, workers, deadline):
+        assert isinstance(file_path, str)
+        paths.append(file_path)
+        return real_parallel(file_path, pages, workers, deadline)
+
+    monkeypatch.setattr(pdf_processor, "_extract_parallel", on_disk)
+    pages = [f"Page {i}" for i in range(10)]
+    data = make_pdf(pages)
+    assert len(data) < settings.UPLOAD_SPOOL_MAX_BYTES
+    assert pdf_processor.extract_text(data).splitlines() == pages
+    assert calls == [range(0, 10)]
+    # The temp copy for the worker processes is gone afterwards
+    assert len(paths) == 1 and not os.path.exists(paths[0])
@@ -0,0 +1,46 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.database.session import PredatoryBase
+from backend.engine import scorer as scorer_module
+from backend.engine.predatory_detector import PredatoryJournalDetector
+from backend.engine.predatory_index import PredatoryJournalIndex
+from backend.engine.predatory_ingest import JournalRecord, PredatoryIngestor
+
+def _detector(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'predatory.db'}")
+    PredatoryBase.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    writer = PredatoryIngestor(db)
+    writer.extend([
+        JournalRecord(name="International Journal of Advanced Research", source="beall", issn="2320-5407"),
+        JournalRecord(name="American Journal of Engineering Research", source="beall"),
+    ])
+    writer.apply()
+    index = PredatoryJournalIndex(refresh_interval=0)
+    return PredatoryJournalDetector(db, index=index), db, index
+
+def test_title_with_extra_words_is_only_a_possible_match(tmp_path):
+    detector, db, _ = _detector(tmp_path)
+    for title in ["International Journal of Advanced Research in Education", "American Journal of Engineering Research and Reviews"]:
+        result = detector.detect({"journal": title})
+        assert result["predatory_flag"] is False
+        assert result["possible_match"] is True
+        assert result["match_type"] == "Possible Name"
+    db.close()
+
+def test_exact_name_and_issn_matches_flag(tmp_path):
+    detector, db, _ = _detector(tmp_path)
+    assert detector.detect({"journal": "Intl. J. of Advanced Research"})["predatory_flag"] is True
+    assert detector.detect({"issn": "2320-5407", "journal": "Anything"})["match_type"] == "ISSN"
+    db.close()
+
+def test_possible_match_does_not_force_critical_risk(tmp_path, monkeypatch):
+    _, db, index = _detector(tmp_path)
+    monkeypatch.setattr("backend.engine.predatory_detector.predatory_index", index)
+    scorer = scorer_module.COIScorer("Some text", predatory_db=db)
+    scorer.metadata = {"journal": "International Journal of Advanced Research in Education"}
+    score, evidence, rules = scorer._score_d4_journal()
+    assert score == 50
+    assert rules == ["Possible predatory journal match -> Medium Risk"]
+    assert not scorer.evidence["predatory_check"]["predatory_flag"]
+    db.close()
@@ -0,0 +1,150 @@
+from dataclasses import replace
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.orm import sessionmaker
+from backend.database.models import PredatoryJournal, JournalISSN
+from backend.database.session import PredatoryBase
+from backend.core.journal_keys import journal_key
+from backend.engine.predatory_index import PredatoryJournalIndex
+from backend.engine.predatory_ingest import JournalRecord, PredatoryIngestor, read_list_version
+from backend.scripts.dedupe_journals import dedupe_journals
+from backend.scripts.migrate_journal_keys import KEY_INDEX, migrate_journal_keys
+
+def _session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'predatory.db'}")
+    PredatoryBase.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+def test_journal_key_ignores_case_accents_and_issn_order():
+    assert journal_key("The Journal of Médical Sciences.", "2049-7318, 0975-833X") == \
+        journal_key("the journal of medical sciences", "0975833x 20497318")
+
+def test_journal_key_tells_issn_less_namesakes_apart_by_site():
+    assert journal_key("Intl J of Computing", None, "http://www.ijact.org/") == journal_key("Intl J of Computing", None, "ijact.org/about")
+    assert journal_key("Intl J of Computing", None, "http://ijact.org") != journal_key("Intl J of Computing", None, "http://ijact.in")
+    assert journal_key("Labome", None, "http://labome.org", "journal") != journal_key("Labome", None, "http://labome.org", "publisher")
+    # An ISSN identifies the journal whatever site lists it
+    assert journal_key("J", "2049-7318", "http://a.example") == journal_key("J", "2049-7318", "http://b.example")
+
+def test_upsert_merges_and_skips_unchanged(tmp_path):
+    db = _session(tmp_path)
+    first = PredatoryIngestor(db)
+    first.extend([
+        JournalRecord(name="Intl Journal of Things", source="a", url="http://a.example"),
+        JournalRecord(name="intl journal of things", source="a"),
+        JournalRecord(name="", source="a"),
+    ])
+    stats = first.apply()
+    assert (stats.inserted, stats.updated, stats.skipped) == (1, 0, 1)
+
+    enrich = PredatoryIngestor(db, overwrite=False)
+    enrich.add(JournalRecord(name="Intl Journal of Things", source="b", issn="2049-7318, 0975-833X", url="http://b.example"))
+    stats = enrich.apply()
+    assert (stats.inserted, stats.updated) == (0, 1)
+
+    journal = db.execute(select(PredatoryJournal)).scalar_one()
+    assert journal.name == "Intl Journal of Things"
+    assert journal.url == "http://a.example"
+    assert journal.source == "a"
+    assert sorted(db.execute(select(JournalISSN.issn)).scalars()) == ["0975833X", "20497318"]
+
+    again = PredatoryIngestor(db)
+    again.add(JournalRecord(name="intl. journal of things", source="a", issn="2049-7318, 0975-833X"))
+    assert again.apply().unchanged == 1
+    db.close()
+
+def test_reingest_keeps_issns_added_by_enrichment(tmp_path):
+    db = _session(tmp_path)
+    source_row = JournalRecord(name="Journal of Things", source="a", issn="0975-833X", url="http://a.example")
+    first = PredatoryIngestor(db)
+    first.add(source_row)
+    first.apply()
+
+    enrich = PredatoryIngestor(db, overwrite=False)
+    enrich.add(JournalRecord(name="Journal of Things", source="b", issn="0975-833X, 2049-7318"))
+    assert enrich.apply().updated == 1
+
+    # The source still lists only the print ISSN: the online one stays
+    again = PredatoryIngestor(db)
+    again.add(replace(source_row, url="http://a.example/new"))
+    assert again.apply().updated == 1
+    db.expire_all()
+    journal = db.execute(select(PredatoryJournal)).scalar_one()
+    assert (journal.issn, journal.url) == ("0975-833X, 2049-7318", "http://a.example/new")
+    assert sorted(db.execute(select(JournalISSN.issn)).scalars()) == ["0975833X", "20497318"]
+
+    unchanged = PredatoryIngestor(db)
+    unchanged.add(replace(source_row, url="http://a.example/new"))
+    assert unchanged.apply().unchanged == 1
+    db.close()
+
+def test_namesakes_on_different_sites_stay_separate_rows(tmp_path):
+    db = _session(tmp_path)
+    ingestor = PredatoryIngestor(db)
+    ingestor.extend([
+        JournalRecord(name="Intl J of Computing", source="a", url="http://ijact.org"),
+        JournalRecord(name="Intl J of Computing", source="a", url="http://ijact.in"),
+        JournalRecord(name="Intl J of Computing", source="a", entity_type="publisher", url="http://ijact.in"),
+    ])
+    assert ingestor.apply().inserted == 3
+
+    enrich = PredatoryIngestor(db, overwrite=False)
+    enrich.add(JournalRecord(name="Intl J of Computing", source="b", issn="2049-7318", url="http://www.ijact.in/issn"))
+    assert enrich.apply().updated == 1
+    assert db.execute(select(PredatoryJournal.url).where(PredatoryJournal.issn.is_not(None))).scalar_one() == "http://ijact.in"
+    db.close()
+
+def _old_predatory_db(tmp_path, rows):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE predatory_journals (id INTEGER PRIMARY KEY, name VARCHAR, issn VARCHAR, publisher VARCHAR, "
+            "source VARCHAR, entity_type VARCHAR, url VARCHAR, last_updated DATETIME, name_key VARCHAR, "
+            "issn_key VARCHAR(8) NOT NULL DEFAULT '', source_fingerprint VARCHAR(64))"
+        ))
+        conn.execute(text("CREATE UNIQUE INDEX uq_predatory_journals_name_key_issn_key ON predatory_journals (name_key, issn_key)"))
+        conn.execute(text(
+            "INSERT INTO predatory_journals (id, name, issn, publisher, source, entity_type, url, issn_key) "
+            "VALUES (:id, :name, :issn, :publisher, 'beall', :entity_type, :url, :id)"
+        ), rows)
+    return engine
+
+def test_key_migration_keeps_every_row_and_dedupe_is_opt_in(tmp_path):
+    rows = [
+        {"id": 1, "name": "IJACT", "issn": None, "publisher": None, "entity_type": "journal", "url": "http://ijact.org"},
+        {"id": 2, "name": "IJACT", "issn": None, "publisher": None, "entity_type": "journal", "url": "http://ijact.in"},
+        {"id": 3, "name": "CSCanada", "issn": None, "publisher": None, "entity_type": "publisher", "url": "http://cscanada.net"},
+        {"id": 4, "name": "CSCanada", "issn": None, "publisher": "CS", "entity_type": "publisher", "url": "http://www.cscanada.net/"},
+    ]
+    engine = _old_predatory_db(tmp_path, rows)
+    migrate_journal_keys(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        keys = db.execute(select(PredatoryJournal.id, PredatoryJournal.site_key).order_by(PredatoryJournal.id)).all()
+        assert keys == [(1, "journal:ijact.org"), (2, "journal:ijact.in"), (3, "publisher:cscanada.net"), (4, "publisher:cscanada.net#4")]
+        assert read_list_version(db) == 1
+    assert KEY_INDEX in {index["name"] for index in inspect(engine).get_indexes("predatory_journals")}
+
+    assert dedupe_journals(session_factory=Session) == 1
+    with Session() as db:
+        assert sorted(db.execute(select(PredatoryJournal.id)).scalars()) == [1, 2, 3, 4]
+    assert dedupe_journals(apply=True, session_factory=Session) == 1
+    with Session() as db:
+        journals = db.execute(select(PredatoryJournal).order_by(PredatoryJournal.id)).scalars().all()
+        assert [(j.id, j.publisher) for j in journals] == [(1, None), (2, None), (3, "CS")]
+        assert read_list_version(db) == 2
+
+def test_index_version_changes_on_writes_that_skip_the_list_version(tmp_path):
+    db = _session(tmp_path)
+    ingestor = PredatoryIngestor(db)
+    ingestor.add(JournalRecord(name="Journal A", source="a"))
+    ingestor.apply()
+    index = PredatoryJournalIndex(refresh_interval=0)
+    index.ensure_fresh(db)
+    loaded = index.version
+
+    db.add(PredatoryJournal(name="Manual Entry", source="admin"))
+    db.commit()
+    index.ensure_fresh(db)
+    assert read_list_version(db) == 1
+    assert index.version != loaded
+    db.close()
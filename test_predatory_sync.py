@@ -0,0 +1,94 @@
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from backend.database.models import PredatoryJournal, JournalISSN
+from backend.database.session import PredatoryBase
+from backend.engine.predatory_ingest import JournalRecord, PredatoryIngestor, read_list_version
+from backend.engine.predatory_sync import PredatoryListSync
+from ingest_data import JOURNALS_SOURCE, JOURNALS_URL, journal_records, read_source
+
+def _session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'predatory.db'}")
+    PredatoryBase.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+def _replay(db, feed_dir, csv_text):
+    feed_dir.mkdir(exist_ok=True)
+    (feed_dir / "journals.csv").write_text(csv_text, encoding="utf-8")
+    records = journal_records(read_source(JOURNALS_URL, from_dir=str(feed_dir)))
+    return PredatoryListSync(db, sources=[JOURNALS_SOURCE]).sync(records)
+
+def test_sync_applies_only_the_delta(tmp_path):
+    db = _session(tmp_path)
+    feed = tmp_path / "feed"
+
+    stats = _replay(db, feed, "url,name,abbr\nhttp://a.example,Journal A,JA\nhttp://b.example,Journal B,JB\n")
+    assert (stats.added, stats.changed, stats.removed, stats.list_version) == (2, 0, 0, 1)
+    journal_a = db.execute(select(PredatoryJournal).where(PredatoryJournal.name == "Journal A")).scalar_one()
+
+    # Unchanged feed: nothing written, version stays
+    stats = _replay(db, feed, "url,name,abbr\nhttp://a.example,Journal A,JA\nhttp://b.example,Journal B,JB\n")
+    assert (stats.added, stats.changed, stats.removed, stats.unchanged) == (0, 0, 0, 2)
+    assert read_list_version(db) == 1
+
+    # B dropped, A moved, C new: one transaction, one version bump
+    stats = _replay(db, feed, "url,name,abbr\nhttp://a.example/new,Journal A,JA\nhttp://c.example,Journal C,JC\n")
+    assert (stats.added, stats.changed, stats.removed, stats.list_version) == (1, 1, 1, 2)
+
+    db.expire_all()
+    rows = {j.name: j for j in db.execute(select(PredatoryJournal)).scalars()}
+    assert sorted(rows) == ["Journal A", "Journal C"]
+    assert rows["Journal A"].id == journal_a.id
+    assert rows["Journal A"].url == "http://a.example/new"
+    db.close()
+
+def test_sync_leaves_other_sources_alone(tmp_path):
+    db = _session(tmp_path)
+    db.add(PredatoryJournal(name="Manual Entry", source="beall"))
+    db.commit()
+
+    stats = _replay(db, tmp_path / "feed", "url,name,abbr\nhttp://a.example,Journal A,JA\n")
+    assert (stats.added, stats.removed) == (1, 0)
+    assert db.execute(select(PredatoryJournal.name).where(PredatoryJournal.source == "beall")).scalar_one() == "Manual Entry"
+    db.close()
+
+def test_sync_keeps_issns_added_by_enrichment(tmp_path):
+    db = _session(tmp_path)
+    feed = tmp_path / "feed"
+    csv_text = "url,name,abbr\nhttp://a.example,Journal A,JA\nhttp://b.example,Journal B,JB\n"
+    _replay(db, feed, csv_text)
+
+    enrich = PredatoryIngestor(db, overwrite=False)
+    enrich.add(JournalRecord(name="Journal A", source="issn_crawler", issn="2049-7318", url="http://a.example/about"))
+    assert enrich.apply().updated == 1
+    version = read_list_version(db)
+
+    # Unchanged feed: the enriched row is the feed's row, nothing is written
+    stats = _replay(db, feed, csv_text)
+    assert (stats.added, stats.changed, stats.removed, stats.unchanged) == (0, 0, 0, 2)
+    assert read_list_version(db) == version
+
+    # A feed change updates the enriched row in place and keeps its ISSN
+    stats = _replay(db, feed, "url,name,abbr\nhttp://a.example/new,Journal A,JA\nhttp://b.example,Journal B,JB\n")
+    assert (stats.added, stats.changed, stats.removed) == (0, 1, 0)
+    db.expire_all()
+    journal_a = db.execute(select(PredatoryJournal).where(PredatoryJournal.name == "Journal A")).scalar_one()
+    assert (journal_a.url, journal_a.issn) == ("http://a.example/new", "2049-7318")
+    assert db.execute(select(JournalISSN.issn).where(JournalISSN.journal_id == journal_a.id)).scalars().all() == ["20497318"]
+
+    stats = _replay(db, feed, "url,name,abbr\nhttp://a.example/new,Journal A,JA\nhttp://b.example,Journal B,JB\n")
+    assert (stats.added, stats.changed, stats.removed, stats.unchanged) == (0, 0, 0, 2)
+    db.close()
+
+def test_sync_of_a_feed_with_folded_records_is_stable(tmp_path):
+    db = _session(tmp_path)
+    feed = tmp_path / "feed"
+    # The row without URL is the same journal as the one with a host: both write one row
+    csv_text = "url,name,abbr\nhttp://a.example,Journal A,JA\n,Journal A,JA\nhttp://b.example,Journal B,JB\n"
+    stats = _replay(db, feed, csv_text)
+    assert stats.list_version == 1
+    assert db.execute(select(PredatoryJournal.url).where(PredatoryJournal.name == "Journal A")).scalars().all() == ["http://a.example"]
+
+    stats = _replay(db, feed, csv_text)
+    assert (stats.added, stats.changed, stats.removed, stats.unchanged) == (0, 0, 0, 2)
+    assert read_list_version(db) == 1
+    db.close()
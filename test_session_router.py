@@ -0,0 +1,102 @@
+import asyncio
+import os
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from backend.api.api_v1.endpoints import data
+from backend.database.session import (
+    Base, PredatoryBase, async_session_router, get_async_predatory_read_db, session_router
+)
+from backend.database.models import JournalISSN, PredatoryJournal, User
+from backend.database.sqlite import create_async_sqlite_engine, create_sqlite_engine
+from backend.engine.journal_export import begin_snapshot, export_version, iter_export
+from backend.engine.predatory_ingest import JournalRecord, PredatoryIngestor
+from backend.scripts.migrate_journal_search import STATEMENTS
+
+def make_databases(tmp_path):
+    ria = create_sqlite_engine(f"sqlite:///{os.path.join(tmp_path, 'ria.db')}")
+    predatory_uri = f"sqlite:///{os.path.join(tmp_path, 'predatory.db')}"
+    predatory = create_sqlite_engine(predatory_uri)
+    Base.metadata.create_all(bind=ria)
+    PredatoryBase.metadata.create_all(bind=predatory)
+    with predatory.begin() as conn:
+        for statement in STATEMENTS:
+            conn.execute(text(statement))
+    with sessionmaker(bind=predatory)() as db:
+        writer = PredatoryIngestor(db)
+        writer.extend([
+            JournalRecord(name="Journal of Routed Queries", source="test", issn="2049-3630"),
+            JournalRecord(name="International Journal of Tests", source="test"),
+        ])
+        writer.apply()
+    return ria, predatory, create_sqlite_engine(predatory_uri, read_only=True)
+
+def test_router_sends_each_model_to_its_database(tmp_path):
+    ria, predatory, predatory_read = make_databases(tmp_path)
+    Session = session_router(ria, predatory_read)
+    with Session() as db:
+        db.add(User(email="reader@example.com", hashed_password="x"))
+        db.commit()
+        assert db.query(PredatoryJournal).count() == 2
+        assert [issn for (issn,) in db.execute(JournalISSN.__table__.select().with_only_columns(JournalISSN.issn))] == ["20493630"]
+        assert db.get_bind(PredatoryJournal) is predatory_read
+
+    # Nothing leaked across files: ria.db has no list, predatory.db has no users
+    assert "predatory_journals" not in inspect(ria).get_table_names()
+    with predatory.connect() as conn:
+        assert "users" not in inspect(conn).get_table_names()
+    with ria.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM users")).scalar() == 1
+    for engine in (ria, predatory, predatory_read):
+        engine.dispose()
+
+def test_data_endpoints_read_the_predatory_database(tmp_path):
+    ria, predatory, predatory_read = make_databases(tmp_path)
+    async_ria = create_async_sqlite_engine(str(ria.url))
+    async_predatory_read = create_async_sqlite_engine(f"sqlite:///{os.path.join(tmp_path, 'predatory.db')}", read_only=True)
+    Session = async_session_router(async_ria, async_predatory_read)
+
+    async def routed_db():
+        async with Session() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(data.router, prefix="/api/data")
+    app.dependency_overrides[get_async_predatory_read_db] = routed_db
+    with TestClient(app) as client:
+        listing = client.get("/api/data/predatory-journals").json()
+        assert listing["total"] == 2
+        found = client.get("/api/data/predatory-journals", params={"search": "routed"}).json()
+        assert [item["name"] for item in found["items"]] == ["Journal of Routed Queries"]
+        export = client.get("/api/data/download/predatory-journals", headers={"Accept-Encoding": "identity"})
+        assert export.status_code == 200
+        assert "International Journal of Tests" in export.text
+    for engine in (ria, predatory, predatory_read):
+        engine.dispose()
+    for async_engine in (async_ria, async_predatory_read):
+        asyncio.run(async_engine.dispose())
+
+def test_export_rows_come_from_the_snapshot_its_version_was_read_in(tmp_path):
+    ria, predatory, predatory_read = make_databases(tmp_path)
+    async_predatory_read = create_async_sqlite_engine(f"sqlite:///{os.path.join(tmp_path, 'predatory.db')}", read_only=True)
+
+    async def export_during_a_sync():
+        async with AsyncSession(bind=async_predatory_read) as db:
+            snapshot = await begin_snapshot(db)
+            version = await export_version(snapshot)
+            # A sync commits between the ETag and the body
+            with sessionmaker(bind=predatory)() as writer_db:
+                writer = PredatoryIngestor(writer_db)
+                writer.add(JournalRecord(name="Journal Added Mid-Export", source="test"))
+                writer.apply()
+            body = b"".join([chunk async for chunk in iter_export("csv", snapshot)]).decode("utf-8")
+            return version, await export_version(snapshot), body
+
+    version, version_after, body = asyncio.run(export_during_a_sync())
+    assert version == version_after
+    assert "International Journal of Tests" in body and "Mid-Export" not in body
+    for engine in (ria, predatory, predatory_read):
+        engine.dispose()
+    asyncio.run(async_predatory_read.dispose())
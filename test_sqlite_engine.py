@@ -0,0 +1,30 @@
+import os
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from backend.database.sqlite import create_sqlite_engine
+
+def test_tuned_engine_and_read_only_replica(tmp_path):
+    uri = f"sqlite:///{os.path.join(tmp_path, 'list.db')}"
+    writer = create_sqlite_engine(uri)
+    reader = create_sqlite_engine(uri, read_only=True)
+    try:
+        with writer.begin() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            conn.execute(text("CREATE TABLE journals (name TEXT)"))
+            conn.execute(text("INSERT INTO journals VALUES ('Journal of Tests')"))
+
+        with reader.connect() as conn:
+            # An open read transaction does not keep the writer from committing (WAL)
+            conn.execute(text("BEGIN"))
+            assert conn.execute(text("SELECT count(*) FROM journals")).scalar() == 1
+            with writer.begin() as write:
+                write.execute(text("INSERT INTO journals VALUES ('Another Journal')"))
+            conn.execute(text("COMMIT"))
+            assert conn.execute(text("SELECT count(*) FROM journals")).scalar() == 2
+            with pytest.raises(OperationalError):
+                conn.execute(text("DELETE FROM journals"))
+    finally:
+        reader.dispose()
+        writer.dispose()
@@ -0,0 +1,30 @@
+import hashlib
+import io
+import os
+import pytest
+from backend.engine.uploads import UploadTooLarge, stage_stream
+
+def test_small_upload_stays_in_memory():
+    data = b"%PDF-1.4 small"
+    upload = stage_stream(io.BytesIO(data), "small.pdf", max_bytes=1024, spool_bytes=1024)
+    assert upload.path is None
+    assert upload.source == data
+    assert upload.sha256 == hashlib.sha256(data).hexdigest()
+
+def test_large_upload_spills_to_unique_temp_file():
+    data = os.urandom(200 * 1024)
+    first = stage_stream(io.BytesIO(data), "paper.pdf", max_bytes=0, spool_bytes=64 * 1024)
+    second = stage_stream(io.BytesIO(data), "paper.pdf", max_bytes=0, spool_bytes=64 * 1024)
+    try:
+        assert first.path != second.path
+        with open(first.path, "rb") as f:
+            assert f.read() == data
+        assert first.sha256 == hashlib.sha256(data).hexdigest()
+    finally:
+        first.cleanup()
+        second.cleanup()
+    assert not os.path.exists(first.path)
+
+def test_upload_size_limit():
+    with pytest.raises(UploadTooLarge):
+        stage_stream(io.BytesIO(b"x" * 5000), "big.pdf", max_bytes=4096, spool_bytes=1024)
@@ -0,0 +1,40 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.api.deps import get_current_user
+from backend.core import security
+from backend.core.user_cache import user_cache
+from backend.database.session import Base
+from backend.database.models import User
+
+def make_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+def test_token_subject_is_cached_until_the_user_changes():
+    user_cache.clear()
+    db = make_session()
+    user = User(email="a@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+
+    token = security.create_access_token(data=security.user_token_data(user))
+    legacy_token = security.create_access_token(data={"sub": "a@example.com"})
+    current = get_current_user(token, db)
+    assert (current.id, current.email) == (user.id, "a@example.com")
+    assert get_current_user(legacy_token, db) == current
+
+    # Served from the cache: no session is needed at all
+    assert get_current_user(token, None) == current
+
+    user.email = "b@example.com"
+    db.commit()
+    for stale in (token, legacy_token):
+        with pytest.raises(HTTPException) as error:
+            get_current_user(stale, db)
+        assert error.value.status_code == 401
+    renewed = security.create_access_token(data=security.user_token_data(user))
+    assert get_current_user(renewed, db).email == "b@example.com"
+    db.close()